@@ -1,17 +1,24 @@
 """Equipo de observabilidad que orquesta el flujo de análisis."""
 
 import json
-from typing import Any, Dict, List
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List
 
-from agno.models.openai import OpenAIChat
 from agno.team import Team
 from agno.db.sqlite import AsyncSqliteDb
 
-from agent.agents.report_agent import report_agent
+from agent.agents.report_agent import report_agent, REPORT_PROMPT_VERSION
 from agent.agents.triage_agent import triage_agent
 from agent.agents.watchdog_agent import watchdog_agent
+from agent import metrics, tracing
 from agent.tools import alert_tools
 from agent.config import AdminAgentConfig
+from agent.llm_metrics import llm_metrics_hook
+from agent.model_router import model_router
+from agent.storage.report_cache import build_cache_key, report_cache
+from agent.tracing import tool_span_hook
 
 _config = AdminAgentConfig()
 
@@ -27,16 +34,68 @@ def _normalize_alert(alert: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _current_datetime_utc() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+@contextmanager
+def _stage(name: str) -> Iterator[None]:
+    """Mide la duración de una etapa del pipeline (`agent_pipeline_stage_seconds`) y la traza como span."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with tracing.span(f"pipeline.{name}"):
+            yield
+        outcome = "ok"
+    finally:
+        metrics.PIPELINE_STAGE_SECONDS.labels(stage=name, outcome=outcome).observe(time.perf_counter() - start)
+
+
 async def analyze_alert(alert: Dict[str, Any]) -> Dict[str, Any]:
     """Ejecuta clasificación, triage y reporte para una alerta."""
     alert_norm = _normalize_alert(alert)
+    labels = alert_norm["labels"]
+    attributes = {
+        "alert.fingerprint": alert_norm["fingerprint"],
+        "alert.name": labels.get("alertname"),
+        "alert.service": labels.get("service"),
+        "alert.status": alert_norm["status"],
+    }
 
-    # Usar helpers internos en vez de tools directamente
-    severity = alert_tools._classify_alert_severity_raw(
-        alert_norm["labels"], alert_norm["annotations"]
-    )
-    is_duplicate = await alert_tools._deduplicate_alerts_raw(alert_norm["fingerprint"])
-    context = alert_tools._enrich_alert_context_raw(alert_norm)
+    with tracing.span("alert.analyze", attributes) as alert_span:
+        # Si la clasificación falla la alerta se cuenta con severidad "unknown"
+        severity = "unknown"
+        with metrics.ALERTS_IN_FLIGHT.track_inprogress():
+            try:
+                try:
+                    # Usar helpers internos en vez de tools directamente
+                    with _stage("classify"):
+                        severity = alert_tools._classify_alert_severity_raw(
+                            alert_norm["labels"], alert_norm["annotations"]
+                        )
+                finally:
+                    metrics.ALERTS_PROCESSED.labels(result="received", severity=severity).inc()
+                alert_span.set_attribute("alert.severity", severity)
+                result = await _analyze_classified(alert_norm, severity)
+            except Exception:
+                metrics.ALERTS_PROCESSED.labels(result="failed", severity=severity).inc()
+                raise
+        alert_span.set_attributes({
+            "alert.id": result["alert_id"],
+            "alert.duplicate": result["watchdog"]["is_duplicate"],
+            "cache.report": "hit" if result["report_cached"] else "miss",
+        })
+    metrics.ALERTS_PROCESSED.labels(result="analyzed", severity=severity).inc()
+    return result
+
+
+async def _analyze_classified(alert_norm: Dict[str, Any], severity: str) -> Dict[str, Any]:
+    with _stage("dedup"):
+        is_duplicate = await alert_tools._deduplicate_alerts_raw(alert_norm["fingerprint"])
+    if is_duplicate:
+        metrics.ALERTS_PROCESSED.labels(result="deduplicated", severity=severity).inc()
+    with _stage("enrich"):
+        context = alert_tools._enrich_alert_context_raw(alert_norm)
 
     watchdog_summary = {
         "severity": severity,
@@ -46,48 +105,73 @@ async def analyze_alert(alert: Dict[str, Any]) -> Dict[str, Any]:
 
     triage_result = "Alerta marcada como duplicada; triage omitido."
     if not is_duplicate:
-        triage_response = await triage_agent.arun(
-            input=(
-                "Correlacioná métricas, logs y traces de esta alerta. "
-                "Devolvé JSON con metrics, logs, traces y findings.\n\n"
-                f"{json.dumps(alert_norm)}"
+        with _stage("triage"):
+            triage_response = await model_router.arun(
+                triage_agent,
+                "triage",
+                severity=severity,
+                input=(
+                    "Correlacioná métricas, logs y traces de esta alerta. "
+                    "Devolvé JSON con metrics, logs, traces y findings.\n\n"
+                    f"{json.dumps(alert_norm)}"
+                )
             )
-        )
         # Extraer solo el contenido del mensaje
         triage_result = triage_response.content if hasattr(triage_response, 'content') else str(triage_response)
 
-    report_response = await report_agent.arun(
-        input=(
-            "Generá un reporte markdown claro con timeline, evidencia y próximos pasos. "
-            "Usá el triage como evidencia.\n\n"
-            f"Alert: {json.dumps({**alert_norm, **watchdog_summary})}\n\n"
-            f"Triage: {triage_result}"
+    # Reutilizar reporte si ya se generó uno con los mismos inputs (re-entregas de webhook).
+    # El lookup es su propia etapa: "report" mide solo reportes generados por el modelo
+    with _stage("report_cache"):
+        report_model = model_router.model_for(model_router.resolve_tier("report", severity, is_duplicate))
+        cache_key = build_cache_key(
+            {**alert_norm, **watchdog_summary}, triage_result, report_model, REPORT_PROMPT_VERSION
         )
-    )
-    # Extraer solo el contenido del mensaje
-    report_result = report_response.content if hasattr(report_response, 'content') else str(report_response)
+        report_result = await report_cache.get(cache_key)
+    report_cached = report_result is not None
+    if not report_cached:
+        with _stage("report"):
+            report_response = await model_router.arun(
+                report_agent,
+                "report",
+                severity=severity,
+                is_duplicate=is_duplicate,
+                input=(
+                    "Generá un reporte markdown claro con timeline, evidencia y próximos pasos. "
+                    "Usá el triage como evidencia.\n\n"
+                    f"Alert: {json.dumps({**alert_norm, **watchdog_summary})}\n\n"
+                    f"Triage: {triage_result}"
+                )
+            )
+            # Extraer solo el contenido del mensaje
+            report_result = report_response.content if hasattr(report_response, 'content') else str(report_response)
+            await report_cache.set(cache_key, str(report_result))
 
-    alert_id = await alert_tools.persist_alert(
-        {**alert_norm, **watchdog_summary},
-        analysis_report=str(report_result),
-        is_duplicate=is_duplicate,
-    )
+    with _stage("persist"):
+        alert_id = await alert_tools.persist_alert(
+            {**alert_norm, **watchdog_summary},
+            analysis_report=str(report_result),
+            is_duplicate=is_duplicate,
+        )
 
     return {
         "alert_id": alert_id,
         "watchdog": watchdog_summary,
         "triage": triage_result,
         "report": report_result,
+        "report_cached": report_cached,
     }
 
 
 async def analyze_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Procesa un payload completo de Grafana Alertmanager."""
     alerts: List[Dict[str, Any]] = payload.get("alerts") or []
-    results = []
-    for alert in alerts:
-        result = await analyze_alert(alert)
-        results.append(result)
+    metrics.WEBHOOK_PAYLOAD_ALERTS.observe(len(alerts))
+    attributes = {"alert.count": len(alerts), "alert.group_key": payload.get("groupKey")}
+    with tracing.span("alert.analyze_payload", attributes):
+        results = []
+        for alert in alerts:
+            result = await analyze_alert(alert)
+            results.append(result)
     return {"alerts": results}
 
 
@@ -101,7 +185,9 @@ observability_team = Team(
         "y Report (síntesis y generación de reportes). El equipo sigue un flujo secuencial "
         "donde cada agente depende del output del anterior para generar análisis completos de incidentes."
     ),
-    model=OpenAIChat(id=_config.agno_model),
+    model=model_router.default_model("team"),
+    post_hooks=[llm_metrics_hook("team")],
+    tool_hooks=[tool_span_hook],
     db=AsyncSqliteDb(db_file=_config.agno_db_path),
     instructions=[
         "Coordinás el análisis de alertas de Grafana en tres fases secuenciales:",
@@ -183,8 +269,13 @@ Implicación: Para análisis históricos >3 días, solo métricas y logs disponi
 """,
     add_history_to_context=True,
     num_history_runs=2,
-    max_tool_calls_from_history=10,
-    add_datetime_to_context=True,
+    max_tool_calls_from_history=_config.history_max_tool_calls,
+    add_session_summary_to_context=True,
+    # La fecha va en el mensaje del usuario (dependencies) y no en el system
+    # message: así el bloque estático queda idéntico entre llamadas y el
+    # provider puede reutilizar el prefijo cacheado.
+    dependencies={"current_datetime_utc": _current_datetime_utc},
+    add_dependencies_to_context=True,
     show_members_responses=True,
     markdown=True,
     debug_mode=True,
@@ -1,11 +1,13 @@
 """QueryAgent: Agente especializado en comandos rápidos de observabilidad."""
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from agno.db.sqlite import AsyncSqliteDb
 
 from agent.config import AdminAgentConfig
+from agent.llm_metrics import llm_metrics_hook
+from agent.model_router import model_router
 from agent.tools import quick_commands
+from agent.tracing import tool_span_hook
 
 _config = AdminAgentConfig()
 
@@ -17,7 +19,9 @@ query_agent = Agent(
         "Ejecuta comandos rápidos para obtener incidencias recientes, health checks, monitoreo "
         "post-deployment, análisis de tendencias y resúmenes periódicos."
     ),
-    model=OpenAIChat(id=_config.agno_model),
+    model=model_router.default_model("query"),
+    post_hooks=[llm_metrics_hook("query")],
+    tool_hooks=[tool_span_hook],
     db=AsyncSqliteDb(db_file=_config.agno_db_path),
     tools=[
         quick_commands.get_recent_incidents,
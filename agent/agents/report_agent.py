@@ -1,12 +1,16 @@
 """Agente Report: genera reportes legibles."""
 
+import hashlib
+
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from agno.models.message import Message
 from agno.db.sqlite import AsyncSqliteDb
 
 from agent.config import AdminAgentConfig
+from agent.llm_metrics import llm_metrics_hook
+from agent.model_router import model_router
 from agent.tools import report_tools
+from agent.tracing import tool_span_hook
 
 _config = AdminAgentConfig()
 
@@ -116,11 +120,15 @@ report_agent = Agent(
         "evidencia correlacionada de múltiples fuentes, análisis de causa raíz y sugerencias "
         "de próximos pasos para el equipo de DevOps."
     ),
-    model=OpenAIChat(id=_config.agno_model),
-    db=AsyncSqliteDb(db_file="./agno.db"),
+    model=model_router.default_model("report"),
+    post_hooks=[llm_metrics_hook("report")],
+    tool_hooks=[tool_span_hook],
+    db=AsyncSqliteDb(db_file=_config.agno_db_path),
     debug_mode=True,
     add_history_to_context=True,
     num_history_runs=1,
+    max_tool_calls_from_history=_config.history_max_tool_calls,
+    add_session_summary_to_context=True,
     additional_input=report_examples,
     tools=[
         report_tools.generate_markdown_report,
@@ -146,3 +154,10 @@ report_agent = Agent(
 )
 
 
+def _prompt_version() -> str:
+    """Hash de instrucciones, formato y ejemplos: invalida el cache de reportes si cambia el prompt."""
+    parts = [*report_agent.instructions, report_agent.expected_output, *(m.content for m in report_examples)]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+REPORT_PROMPT_VERSION = _prompt_version()
@@ -1,11 +1,13 @@
 """Agente Triage: correlaciona métricas, logs y traces."""
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from agno.db.sqlite import AsyncSqliteDb
 
 from agent.config import AdminAgentConfig
+from agent.llm_metrics import llm_metrics_hook
+from agent.model_router import model_router
 from agent.tools import observability_tools
+from agent.tracing import tool_span_hook
 
 _config = AdminAgentConfig()
 
@@ -17,11 +19,15 @@ triage_agent = Agent(
         "logs de Loki, traces de Tempo) para identificar la causa raíz de alertas. Realiza análisis "
         "temporal, busca patrones comunes y correlaciona eventos para determinar el origen del problema."
     ),
-    model=OpenAIChat(id=_config.agno_model),
-    db=AsyncSqliteDb(db_file="./agno.db"),
+    model=model_router.default_model("triage"),
+    post_hooks=[llm_metrics_hook("triage")],
+    tool_hooks=[tool_span_hook],
+    db=AsyncSqliteDb(db_file=_config.agno_db_path),
     debug_mode=True,
     add_history_to_context=True,
     num_history_runs=2,
+    max_tool_calls_from_history=_config.history_max_tool_calls,
+    add_session_summary_to_context=True,
     dependencies={
         "latency_threshold_ms": _config.latency_threshold_ms,
         "error_rate_threshold": _config.error_rate_threshold,
@@ -38,14 +44,15 @@ triage_agent = Agent(
         observability_tools.query_loki_by_trace,
         observability_tools.query_tempo_traces,
         observability_tools.get_tempo_trace,
+        observability_tools.get_tempo_traces,
     ],
     instructions=[
         "Sos el agente de correlación técnica. Tu objetivo es encontrar la causa raíz de la alerta usando métricas, logs y traces.",
-        "PASO 0: Descubrimiento - Si no conoces el servicio, ejecutá get_monitored_services() para ver qué servicios están activos.",
+        "PASO 0: Descubrimiento - Si no conoces el servicio, ejecutá get_monitored_services() para ver qué servicios están activos (se sirve desde memoria, no tiene costo).",
         "PASO 1: Determinar timeframe - usá startsAt de la alerta y analizá los últimos 15 minutos (ajustable según severidad: critical=30m, major=15m, minor=10m)",
         "PASO 2: Consultar métricas - obtené error_rate (5xx), latency P95, status del servicio con Prometheus",
         "PASO 3: Buscar logs - filtrá logs de error del servicio en Loki con query '{service=\"X\"} |= \"ERROR\" or \"FATAL\"'",
-        "PASO 4: Analizar traces - buscá traces lentos (>1s) o con errores en Tempo",
+        "PASO 4: Analizar traces - buscá traces lentos (>1s) o con errores en Tempo; para inspeccionar varios traces usá get_tempo_traces con la lista de IDs en una sola llamada. Los traces vienen resumidos (critical_path, self_time_top, errors, n_plus_one); pedí raw=True solo si el resumen no alcanza",
         "PASO 5: Correlacionar - identificá patrones temporales (¿el error_rate subió antes que la latencia?), stacktraces comunes, requests fallidos",
         "FORMATO DE SALIDA: JSON con {metrics: {error_rate, latency_p95, status}, logs: {sample_errors[], error_patterns[]}, traces: {slow_traces[], failed_requests[]}, findings: {root_cause, evidence[], confidence}}",
     ],
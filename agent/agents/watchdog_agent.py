@@ -1,11 +1,13 @@
 """Agente Watchdog: clasifica y deduplica alertas."""
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from agno.db.sqlite import AsyncSqliteDb
 
 from agent.config import AdminAgentConfig
+from agent.llm_metrics import llm_metrics_hook
+from agent.model_router import model_router
 from agent.tools import alert_tools
+from agent.tracing import tool_span_hook
 
 _config = AdminAgentConfig()
 
@@ -17,11 +19,15 @@ watchdog_agent = Agent(
         "Enriquece el contexto extrayendo información clave, clasifica la severidad basándose en "
         "labels y annotations, y detecta alertas duplicadas usando fingerprints para evitar análisis redundantes."
     ),
-    model=OpenAIChat(id=_config.agno_model),
-    db=AsyncSqliteDb(db_file="./agno.db"),
+    model=model_router.default_model("watchdog"),
+    post_hooks=[llm_metrics_hook("watchdog")],
+    tool_hooks=[tool_span_hook],
+    db=AsyncSqliteDb(db_file=_config.agno_db_path),
     debug_mode=True,
     add_history_to_context=True,
     num_history_runs=3,
+    max_tool_calls_from_history=_config.history_max_tool_calls,
+    add_session_summary_to_context=True,
     tools=[
         alert_tools.classify_alert_severity,
         alert_tools.check_alert_history,
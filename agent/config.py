@@ -1,7 +1,7 @@
 import json
 import os
 import yaml
-from typing import List, Any
+from typing import Any, Dict, List
 
 def load_yaml_config(path: str = "config.yaml") -> dict:
     if os.path.exists(path):
@@ -41,11 +41,24 @@ class AdminAgentConfig:
     # LLM
     openai_model: str = str(_get_conf("llm", "openai_model", "gpt-5-mini"))
     agno_model: str = str(_get_conf("llm", "agno_model", "gpt-5-mini"))
+    llm_provider: str = str(_get_conf("llm", "provider", "openai"))  # openai | fake
+    fake_llm_latency_ms: float = float(_get_conf("llm", "fake_latency_ms", 200))
+    fake_llm_output_tokens: int = int(_get_conf("llm", "fake_output_tokens", 0))
+    # Precios USD por millón de tokens por modelo: {input, cached_input, output}
+    llm_pricing: Dict[str, Dict[str, float]] = _get_conf("llm", "pricing", {}) or {}
+
+    # Ruteo de modelos por agente/severidad (ver agent/model_router.py)
+    model_tiers: Dict[str, str] = _get_conf("model_routing", "tiers", {}) or {}
+    model_fallback: Dict[str, List[str]] = _get_conf("model_routing", "fallback", {}) or {}
+    model_severity_tiers: Dict[str, str] = _get_conf("model_routing", "severity", {}) or {}
+    model_agent_tiers: Dict[str, Dict[str, str]] = _get_conf("model_routing", "agents", {}) or {}
+    model_timeout_seconds: float = float(_get_conf("model_routing", "timeout_seconds", 120))
 
     # Observability endpoints
     prometheus_url: str = str(_get_conf("observability", "prometheus_url", "http://prometheus:9090"))
     loki_url: str = str(_get_conf("observability", "loki_url", "http://loki:3100"))
     tempo_url: str = str(_get_conf("observability", "tempo_url", "http://tempo:3200"))
+    service_discovery_interval_seconds: int = int(_get_conf("observability", "service_discovery_interval_seconds", 60))
 
     # Database
     postgres_host: str = str(_get_conf("database", "postgres_host", "postgres"))
@@ -54,7 +67,19 @@ class AdminAgentConfig:
     postgres_password: str = str(_get_conf("database", "postgres_password", os.getenv("POSTGRES_PASSWORD", "")))
     postgres_db: str = str(_get_conf("database", "postgres_db", "somed"))
     agno_db_path: str = str(_get_conf("database", "agno_db_path", "./agno.db"))
+    # URL SQLAlchemy async del storage de alertas; vacío = Postgres de arriba (ej: sqlite+aiosqlite:///./alerts.db)
+    alerts_db_url: str = str(_get_conf("database", "alerts_db_url", ""))
     redis_url: str = str(_get_conf("database", "redis_url", os.getenv("REDIS_URL", "redis://redis:6379/0")))
+    redis_max_connections: int = int(_get_conf("database", "redis_max_connections", 20))
+    redis_timeout_seconds: float = float(_get_conf("database", "redis_timeout_seconds", 0.5))
+    redis_retry_seconds: float = float(_get_conf("database", "redis_retry_seconds", 30))
+
+    # Historial de sesiones de agentes (agno.db)
+    history_max_runs_per_session: int = int(_get_conf("history", "max_runs_per_session", 20))
+    history_max_tool_calls: int = int(_get_conf("history", "max_tool_calls_from_history", 0))
+    history_summary_max_chars: int = int(_get_conf("history", "summary_max_chars", 2000))
+    history_retention_days: int = int(_get_conf("history", "retention_days", 30))
+    history_maintenance_interval_seconds: int = int(_get_conf("history", "maintenance_interval_seconds", 3600))
 
     # Docker
     docker_socket: str = str(_get_conf("docker", "socket", "/var/run/docker.sock"))
@@ -70,6 +95,14 @@ class AdminAgentConfig:
     # Telemetry
     agno_telemetry: bool = bool(_get_conf("telemetry", "agno_enabled", True))
 
+    # Tracing OpenTelemetry (ver agent/tracing.py)
+    tracing_enabled: bool = bool(_get_conf("tracing", "enabled", False))
+    tracing_exporter: str = str(_get_conf("tracing", "exporter", "otlp"))  # otlp | otlp_http | console | file | none
+    tracing_endpoint: str = str(_get_conf("tracing", "endpoint", "http://tempo:4317"))
+    tracing_file_path: str = str(_get_conf("tracing", "file_path", "./traces.jsonl"))
+    tracing_service_name: str = str(_get_conf("tracing", "service_name", "observability-agent"))
+    tracing_sample_ratio: float = float(_get_conf("tracing", "sample_ratio", 1.0))
+
     # Control Plane Agno (opcional)
     control_plane_url: str = os.getenv("AGNO_CP_URL", "")
     control_plane_api_key: str = os.getenv("AGNO_CP_API_KEY", "")
@@ -83,3 +116,31 @@ class AdminAgentConfig:
     quick_commands_enabled: bool = bool(_get_conf("quick_commands", "enabled", True))
     quick_commands_default_ai_analysis: bool = bool(_get_conf("quick_commands", "ai_analysis", False))
     daily_digest_time: str = str(_get_conf("quick_commands", "daily_digest_time", "09:00"))
+    # Digest de ayer precomputado a daily_digest_time (UTC)
+    daily_digest_precompute: bool = bool(_get_conf("quick_commands", "daily_digest_precompute", True))
+    daily_digest_ai_summary: bool = bool(_get_conf("quick_commands", "daily_digest_ai_summary", False))
+    daily_digest_retention_days: int = int(_get_conf("quick_commands", "daily_digest_retention_days", 30))
+    # Cache de resultados de /quick/command (clave: comando + params normalizados + ventana)
+    quick_commands_cache_enabled: bool = bool(_get_conf("quick_commands", "cache_enabled", True))
+    quick_commands_cache_bucket_seconds: int = int(_get_conf("quick_commands", "cache_bucket_seconds", 300))
+    quick_commands_cache_max_entries: int = int(_get_conf("quick_commands", "cache_max_entries", 200))
+    quick_commands_stale_while_revalidate: bool = bool(_get_conf("quick_commands", "stale_while_revalidate", False))
+    # Timeout por check de evidencia (los checks corren en paralelo)
+    quick_commands_evidence_timeout_seconds: float = float(_get_conf("quick_commands", "evidence_timeout_seconds", 5))
+    quick_commands_batch_max_commands: int = int(_get_conf("quick_commands", "batch_max_commands", 10))
+
+    # Cache de reportes del ReportAgent
+    report_cache_backend: str = str(_get_conf("report_cache", "backend", "redis"))  # redis | disk | none
+    report_cache_ttl_seconds: int = int(_get_conf("report_cache", "ttl_seconds", 24 * 3600))
+    report_cache_max_entries: int = int(_get_conf("report_cache", "max_entries", 500))
+    report_cache_dir: str = str(_get_conf("report_cache", "dir", "./.report_cache"))
+
+    # Compactación de outputs de tools (presupuesto en tokens por llamada)
+    tool_output_token_budget: int = int(_get_conf("compaction", "default_token_budget", 2000))
+    tool_output_token_budgets: Dict[str, int] = _get_conf("compaction", "per_tool", {}) or {}
+
+    # Streaming (tail de logs en vivo)
+    tail_max_lines_per_second: float = float(_get_conf("streaming", "tail_max_lines_per_second", 20))
+    tail_summary_interval_seconds: int = int(_get_conf("streaming", "tail_summary_interval_seconds", 10))
+    # Watch de salud: una evaluación por intervalo compartida entre suscriptores
+    health_watch_interval_seconds: float = float(_get_conf("streaming", "health_watch_interval_seconds", 15))
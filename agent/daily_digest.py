@@ -0,0 +1,193 @@
+"""
+Precomputación programada del daily digest.
+
+`DailyDigestScheduler` genera y guarda el digest de ayer todos los días a
+`quick_commands.daily_digest_time` (UTC), opcionalmente con un resumen
+ejecutivo del QueryAgent. Al iniciar, si el digest de ayer no existe y ya pasó
+el horario, se genera en el momento. `/digest` y `/api/quick/daily-digest`
+sirven el artefacto guardado; solo se genera on-demand para fechas que no
+fueron materializadas (el día en curso, incompleto, nunca se guarda).
+
+Los artefactos (el `DailyDigestResult` serializado) se guardan en Redis
+(`daily_digest:<fecha>`) con retención de
+`quick_commands.daily_digest_retention_days`, con fallback al LRU local.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from agent import metrics
+from agent.config import AdminAgentConfig
+from agent.models.quick_results import DailyDigestResult, QuickResult
+from agent.storage import query_helpers
+from agent.storage.redis import RedisStore, redis_store
+from agent.tools.quick_render import render_markdown
+
+_config = AdminAgentConfig()
+
+_REDIS_PREFIX = "daily_digest:"
+_LOCAL_MAX_ENTRIES = 60
+
+
+def _parse_time(value: str) -> Tuple[int, int]:
+    hour, minute = value.split(":")
+    return int(hour), int(minute)
+
+
+def resolve_digest_date(date: Optional[str], now: Optional[datetime] = None) -> Optional[str]:
+    """Fecha YYYY-MM-DD del digest (default: ayer UTC); None si el formato es inválido."""
+    if not date:
+        return ((now or datetime.now(timezone.utc)) - timedelta(days=1)).strftime("%Y-%m-%d")
+    try:
+        return datetime.fromisoformat(date).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+class DailyDigestScheduler:
+    """Materializa el digest diario y lo sirve desde el storage."""
+
+    def __init__(
+        self,
+        digest_time: str,
+        ai_summary: bool,
+        retention_days: int,
+        enabled: bool = True,
+        store: RedisStore = redis_store,
+    ):
+        self.digest_time = _parse_time(digest_time)
+        self.ai_summary = ai_summary
+        self.ttl_seconds = retention_days * 86400
+        self.enabled = enabled
+        self._store = store.namespace(_REDIS_PREFIX, _LOCAL_MAX_ENTRIES)
+        self._task: Optional[asyncio.Task] = None
+
+    def next_run(self, now: datetime) -> datetime:
+        """Próximo horario de generación posterior a `now`."""
+        hour, minute = self.digest_time
+        run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return run_at if run_at > now else run_at + timedelta(days=1)
+
+    async def get(self, date: str) -> Optional[Dict[str, Any]]:
+        value = await self._store.get(date)
+        artifact = json.loads(value) if value else None
+        # Artefactos previos al resultado tipado (solo markdown) se regeneran
+        return artifact if artifact and "result" in artifact else None
+
+    async def _summarize(self, result: DailyDigestResult) -> Optional[str]:
+        from agent.agents.query_agent import query_agent
+        from agent.model_router import model_router
+
+        prompt = (
+            "Escribí un resumen ejecutivo (máximo 5 líneas) del siguiente daily digest, "
+            "sin consultar tools: qué pasó, qué servicios fueron los más afectados y si hay "
+            f"algo accionable.\n\n{render_markdown(result)}"
+        )
+        try:
+            result = await model_router.arun(query_agent, "query", input=prompt)
+        except Exception as e:
+            print(f"Error generating daily digest AI summary: {e}")
+            return None
+        return result.content if hasattr(result, "content") else str(result)
+
+    async def materialize(self, date: str, ai_summary: Optional[bool] = None) -> DailyDigestResult:
+        """Genera el digest de `date` (día completo) y lo guarda."""
+        from agent.tools import quick_commands
+
+        with query_helpers.data_context_scope():
+            result = await asyncio.to_thread(
+                quick_commands._build_daily_digest,
+                date=date,
+                include_all_services=True,
+                analyze_with_ai=False,
+            )
+        if self.ai_summary if ai_summary is None else ai_summary:
+            result.ai_summary = await self._summarize(result)
+        artifact = {
+            "date": date,
+            "result": result.model_dump(mode="json"),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        await self._store.setex(date, self.ttl_seconds, json.dumps(artifact))
+        return result
+
+    async def get_result(self, date: Optional[str] = None, include_all_services: bool = True) -> Tuple[QuickResult, str]:
+        """
+        Digest tipado: artefacto guardado si existe, sino se genera.
+
+        Args:
+            date: Fecha YYYY-MM-DD (default: ayer)
+            include_all_services: El artefacto guardado incluye todos los servicios;
+                con False se genera on-demand
+
+        Returns:
+            Tupla (resultado, origen) con origen materialized | generated; el
+            resultado es `QuickCommandError` si la fecha es inválida
+        """
+        from agent.tools import quick_commands
+
+        resolved = resolve_digest_date(date, query_helpers.utc_now())
+        if resolved and include_all_services:
+            artifact = await self.get(resolved)
+            if artifact:
+                metrics.DAILY_DIGEST_REQUESTS.labels(source="materialized").inc()
+                return DailyDigestResult.model_validate(artifact["result"]), "materialized"
+
+        metrics.DAILY_DIGEST_REQUESTS.labels(source="generated").inc()
+        today = query_helpers.utc_now().strftime("%Y-%m-%d")
+        # Días completos se guardan para los próximos requests
+        if resolved and include_all_services and resolved < today:
+            return await self.materialize(resolved, ai_summary=False), "generated"
+        result = await asyncio.to_thread(
+            quick_commands._build_daily_digest,
+            date=date,
+            include_all_services=include_all_services,
+            analyze_with_ai=False,
+        )
+        return result, "generated"
+
+    async def run_once(self, now: Optional[datetime] = None) -> None:
+        """Materializa el digest de ayer (respecto de `now`) si no existe o no tiene resumen IA."""
+        date = resolve_digest_date(None, now)
+        try:
+            existing = await self.get(date)
+            if existing and (existing["result"].get("ai_summary") or not self.ai_summary):
+                return
+            await self.materialize(date)
+            print(f"Daily digest materialized for {date}")
+        except Exception as e:
+            print(f"Error materializing daily digest for {date}: {e}")
+
+    async def _schedule_loop(self) -> None:
+        now = datetime.now(timezone.utc)
+        # Catch-up: si ya pasó el horario de hoy y el digest de ayer no está
+        if self.next_run(now).date() > now.date():
+            await self.run_once(now)
+        while True:
+            now = datetime.now(timezone.utc)
+            await asyncio.sleep((self.next_run(now) - now).total_seconds())
+            await self.run_once()
+
+    def start(self) -> None:
+        """Inicia la generación programada en el event loop actual."""
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._schedule_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+digest_scheduler = DailyDigestScheduler(
+    digest_time=_config.daily_digest_time,
+    ai_summary=_config.daily_digest_ai_summary,
+    retention_days=_config.daily_digest_retention_days,
+    enabled=_config.quick_commands_enabled and _config.daily_digest_precompute,
+)
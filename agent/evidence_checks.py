@@ -0,0 +1,231 @@
+"""
+Checks de evidencia del workflow de verificación de slash commands.
+
+Cada check es una unidad independiente registrada con `@evidence_check` y
+referenciada por nombre en `CANONICAL_PROMPTS[intent]["evidence_checks"]`
+(agent/slash_commands.py). `run_evidence_checks` los ejecuta en paralelo, cada
+uno con su timeout: la latencia de la verificación es la del check más lento,
+y la recomendación se arma con los checks que terminan a tiempo.
+
+Un check devuelve `(evidencia, recomendación)`; la recomendación es None si el
+check solo aporta contexto. Devuelve None si no aplica a los args del comando.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agent import metrics
+from agent.config import AdminAgentConfig
+from agent.storage import query_helpers
+
+_config = AdminAgentConfig()
+
+CheckResult = Tuple[Dict[str, Any], Optional[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class EvidenceCheck:
+    """Check registrado: función bloqueante (corre en un thread) + metadata para la evidencia."""
+
+    name: str
+    source: str
+    query: str
+    func: Callable[[Dict[str, str]], Optional[CheckResult]]
+
+
+EVIDENCE_CHECKS: Dict[str, EvidenceCheck] = {}
+
+
+def evidence_check(name: str, source: str, query: str) -> Callable:
+    """Registra un check de evidencia bajo `name`."""
+
+    def register(func: Callable[[Dict[str, str]], Optional[CheckResult]]) -> Callable[[Dict[str, str]], Optional[CheckResult]]:
+        EVIDENCE_CHECKS[name] = EvidenceCheck(name=name, source=source, query=query, func=func)
+        return func
+
+    return register
+
+
+def _evidence(source: str, query: str, summary: str, passed: bool) -> Dict[str, Any]:
+    return {
+        "source": source,
+        "query": query,
+        "result_summary": summary,
+        "pass": passed,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _count_severity(alerts: List[Dict[str, Any]], severity: str) -> int:
+    return sum(1 for a in alerts if a["labels"].get("severity") == severity)
+
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+
+@evidence_check("active-alerts", source="health_check", query="get_active_alerts()")
+def check_active_alerts(args: Dict[str, str]) -> CheckResult:
+    """Salud actual: notify si hay alertas critical o major activas."""
+    active_alerts = query_helpers.get_active_alerts()
+    critical_count = _count_severity(active_alerts, "critical")
+    major_count = _count_severity(active_alerts, "major")
+
+    health_pass = critical_count == 0 and major_count == 0
+    evidence = _evidence(
+        "health_check",
+        "get_active_alerts()",
+        f"{len(active_alerts)} alertas activas ({critical_count} critical, {major_count} major)",
+        health_pass,
+    )
+    if health_pass:
+        return evidence, None
+    return evidence, {
+        "level": "notify",
+        "reason": f"Sistema degradado: {critical_count} critical, {major_count} major activas",
+        "confidence": 0.9,
+    }
+
+
+@evidence_check("active-criticals", source="health_check", query="get_active_alerts()")
+def check_active_criticals(args: Dict[str, str]) -> CheckResult:
+    """Salud actual como contexto (no cambia la recomendación)."""
+    active_alerts = query_helpers.get_active_alerts()
+    critical_count = _count_severity(active_alerts, "critical")
+    return _evidence(
+        "health_check",
+        "get_active_alerts()",
+        f"{len(active_alerts)} alertas activas ({critical_count} critical)",
+        critical_count == 0,
+    ), None
+
+
+@evidence_check("alert-trend", source="trends_check", query="compare_periods()")
+def check_alert_trend(args: Dict[str, str]) -> CheckResult:
+    """Período actual vs anterior: notify si las incidencias crecen más de 50%."""
+    hours = int(args.get("hours", "24"))
+    end_time = query_helpers.utc_now()
+    start_time = end_time - timedelta(hours=hours)
+
+    alerts_current = query_helpers.get_alerts_in_timerange(start_time, end_time)
+    prev_start = start_time - timedelta(hours=hours)
+    alerts_prev = query_helpers.get_alerts_in_timerange(prev_start, start_time)
+
+    change_pct = ((len(alerts_current) - len(alerts_prev)) / len(alerts_prev) * 100) if len(alerts_prev) > 0 else 0
+    evidence = _evidence(
+        "trends_check",
+        f"compare_periods(hours={hours})",
+        f"Período actual: {len(alerts_current)}, anterior: {len(alerts_prev)}, cambio: {change_pct:+.1f}%",
+        abs(change_pct) < 50,
+    )
+    if change_pct <= 50:
+        return evidence, None
+    return evidence, {
+        "level": "notify",
+        "reason": f"Aumento significativo de incidencias: {change_pct:+.1f}%",
+        "confidence": 0.85,
+    }
+
+
+@evidence_check("recent-criticals", source="recent_incidents_check", query="get_alerts_in_timerange(hours=24)")
+def check_recent_criticals(args: Dict[str, str]) -> CheckResult:
+    """Incidencias de las últimas 24h: notify si hubo alertas critical."""
+    end_time = query_helpers.utc_now()
+    alerts = query_helpers.get_alerts_in_timerange(end_time - timedelta(hours=24), end_time)
+    critical_count = _count_severity(alerts, "critical")
+
+    evidence = _evidence(
+        "recent_incidents_check",
+        "get_alerts_in_timerange(hours=24)",
+        f"{len(alerts)} alertas en 24h ({critical_count} critical)",
+        critical_count == 0,
+    )
+    if critical_count == 0:
+        return evidence, None
+    return evidence, {
+        "level": "notify",
+        "reason": f"Alertas críticas recientes: {critical_count} en últimas 24h",
+        "confidence": 0.9,
+    }
+
+
+@evidence_check("deploy-trend", source="post_deployment_trends", query="compare_pre_post_deploy")
+def check_deploy_trend(args: Dict[str, str]) -> Optional[CheckResult]:
+    """Alertas post-deploy vs las 2h previas del servicio."""
+    if not args.get("deployment_time"):
+        return None
+    service = args.get("service", "")
+    window_hours = int(args.get("monitoring_window_hours", "2"))
+    deploy_time = datetime.fromisoformat(args["deployment_time"].replace("Z", "+00:00"))
+
+    post_end = min(deploy_time + timedelta(hours=window_hours), query_helpers.utc_now())
+    alerts_post = query_helpers.get_alerts_in_timerange(deploy_time, post_end, service=service)
+    alerts_pre = query_helpers.get_alerts_in_timerange(deploy_time - timedelta(hours=2), deploy_time, service=service)
+
+    ratio = len(alerts_post) / len(alerts_pre) if len(alerts_pre) > 0 else (1 if len(alerts_post) == 0 else float('inf'))
+    evidence = _evidence(
+        "post_deployment_trends",
+        f"compare_pre_post_deploy(service={service})",
+        f"Pre: {len(alerts_pre)}, Post: {len(alerts_post)}, ratio: {ratio:.2f}x",
+        ratio <= 2,
+    )
+    critical_post = _count_severity(alerts_post, "critical")
+    if critical_post > 0:
+        return evidence, {
+            "level": "notify",
+            "reason": f"Alertas críticas post-deploy: {critical_post}",
+            "confidence": 0.95,
+        }
+    if ratio > 2:
+        return evidence, {
+            "level": "notify",
+            "reason": f"Aumento significativo de alertas post-deploy: {ratio:.1f}x",
+            "confidence": 0.8,
+        }
+    return evidence, None
+
+
+# ============================================================================
+# EJECUCIÓN
+# ============================================================================
+
+async def run_evidence_check(name: str, args: Dict[str, str], timeout_seconds: float) -> Optional[CheckResult]:
+    """Ejecuta un check con timeout; errores y timeouts se reportan como evidencia fallida."""
+    check = EVIDENCE_CHECKS[name]
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(asyncio.to_thread(check.func, args), timeout=timeout_seconds)
+        outcome = "ok"
+    except asyncio.TimeoutError:
+        result = (_evidence(check.source, check.query, f"Timeout: sin respuesta en {timeout_seconds:g}s", False), None)
+        outcome = "timeout"
+    except Exception as e:
+        result = (_evidence(check.source, check.query, f"Error: {str(e)}", False), None)
+        outcome = "error"
+    metrics.EVIDENCE_CHECK_SECONDS.labels(check=name, outcome=outcome).observe(time.perf_counter() - start)
+    return result
+
+
+async def run_evidence_checks(
+    names: List[str],
+    args: Dict[str, str],
+    timeout_seconds: Optional[float] = None,
+) -> List[CheckResult]:
+    """Ejecuta los checks en paralelo; los resultados respetan el orden de `names` (sin los que no aplican)."""
+    timeout = timeout_seconds if timeout_seconds is not None else _config.quick_commands_evidence_timeout_seconds
+    results = await asyncio.gather(*[run_evidence_check(name, args, timeout) for name in names])
+    return [result for result in results if result is not None]
+
+
+def combine_recommendations(
+    recommendations: List[Optional[Dict[str, Any]]],
+    default: Dict[str, Any],
+) -> Dict[str, Any]:
+    """El notify de mayor confianza gana (el primero ante empates); sin notify, `default`."""
+    notify = [r for r in recommendations if r and r["level"] == "notify"]
+    if not notify:
+        return dict(default)
+    return dict(max(notify, key=lambda r: r["confidence"]))
@@ -0,0 +1,203 @@
+"""
+Modelo LLM falso, determinístico y offline.
+
+Implementa la interfaz de modelos de agno con respuestas basadas en reglas
+(regex sobre el último mensaje del usuario), incluyendo tool calls reales que
+agno ejecuta. Latencia y conteo de tokens son configurables. Se habilita con
+`llm.provider: fake` para benchmarks y pruebas de carga sin red ni costo.
+"""
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+from agent.config import AdminAgentConfig
+from agent.utils.compaction import estimate_tokens
+
+try:
+    from agno.metrics import MessageMetrics as _UsageMetrics
+except ImportError:  # agno 2.x
+    from agno.models.metrics import Metrics as _UsageMetrics
+
+_config = AdminAgentConfig()
+
+# Variables extraídas del prompt para completar plantillas de args y contenido
+_VARIABLE_PATTERNS = {
+    "service": re.compile(r'"service"\s*:\s*"([^"]+)"|servicio\s+([\w.-]+)|\bde\s+([\w.-]+-service)\b'),
+    "alertname": re.compile(r'"alertname"\s*:\s*"([^"]+)"'),
+    "severity": re.compile(r'"severity"\s*:\s*"([^"]+)"'),
+    "hours": re.compile(r"(\d+)\s*horas"),
+}
+_DEFAULTS = {"service": "unknown-service", "alertname": "UnknownAlert", "severity": "info", "hours": "24"}
+
+
+@dataclass
+class FakeRule:
+    """Si `match` aplica al último mensaje del usuario: tool calls y/o contenido final."""
+
+    match: str
+    tool_calls: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+    content: Optional[str] = None
+
+
+_FAKE_REPORT = """# Alert Analysis Report
+
+## Alert Summary
+- **Service**: {service}
+- **Alert**: {alertname}
+- **Severity**: {severity}
+
+## Timeline
+- Alerta recibida y correlacionada (respuesta simulada)
+
+## Evidence
+{tool_results}
+
+## Root Cause Analysis
+Análisis simulado por el modelo offline.
+
+**Confidence**: Low (modelo fake)
+
+## Next Steps
+1. Revisar métricas de {service}
+"""
+
+DEFAULT_RULES: List[FakeRule] = [
+    # TriageAgent
+    FakeRule(
+        match=r"Correlacioná métricas",
+        tool_calls=[
+            ("get_http_error_rate", {"service": "{service}"}),
+            ("get_http_latency_p95", {"service": "{service}"}),
+            ("query_loki_logs", {"service": "{service}", "keyword": "error"}),
+        ],
+        content='{{"service": "{service}", "findings": "triage simulado", "evidence": {tool_results_json}}}',
+    ),
+    # ReportAgent
+    FakeRule(match=r"Generá un reporte markdown", content=_FAKE_REPORT),
+    # QueryAgent
+    FakeRule(match=r"incidencias recientes", tool_calls=[("get_recent_incidents", {"hours": "{hours}"})]),
+    FakeRule(match=r"health summary", tool_calls=[("get_service_health_summary", {})]),
+    FakeRule(match=r"[Aa]nalizar tendencias", tool_calls=[("analyze_trends", {"period_hours": "{hours}"})]),
+    FakeRule(match=r"resumen diario", tool_calls=[("generate_daily_digest", {})]),
+]
+
+
+def _message_text(message: Message) -> str:
+    content = message.content
+    return content if isinstance(content, str) else json.dumps(content, ensure_ascii=False, default=str)
+
+
+def _extract_variables(text: str) -> Dict[str, str]:
+    variables = dict(_DEFAULTS)
+    for name, pattern in _VARIABLE_PATTERNS.items():
+        match = pattern.search(text)
+        if match:
+            variables[name] = next(group for group in match.groups() if group)
+    return variables
+
+
+def _fill(template: Any, variables: Dict[str, str]) -> Any:
+    if isinstance(template, str):
+        value = template.format_map(variables)
+        return int(value) if value.isdigit() and template.startswith("{") else value
+    if isinstance(template, dict):
+        return {k: _fill(v, variables) for k, v in template.items()}
+    return template
+
+
+@dataclass
+class FakeModel(Model):
+    """Modelo determinístico para benchmarks; no hace llamadas de red."""
+
+    id: str = "fake-model"
+    name: str = "FakeModel"
+    provider: str = "Fake"
+
+    latency_ms: float = 0
+    output_tokens: int = 0  # 0 = estimado a partir del contenido
+    rules: List[FakeRule] = field(default_factory=lambda: list(DEFAULT_RULES))
+
+    def _respond(self, messages: List[Message], tools: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Decide la respuesta: tool calls en el primer turno, contenido final después."""
+        user_index = max((i for i, m in enumerate(messages) if m.role == "user"), default=-1)
+        user_text = _message_text(messages[user_index]) if user_index >= 0 else ""
+        tool_results = [_message_text(m) for m in messages[user_index + 1:] if m.role == "tool"]
+        variables = _extract_variables(user_text)
+        variables["tool_results"] = "\n\n".join(tool_results) or "- Sin evidencia de tools"
+        variables["tool_results_json"] = json.dumps(tool_results, ensure_ascii=False)
+
+        rule = next((r for r in self.rules if re.search(r.match, user_text)), None)
+        available = {t.get("function", {}).get("name") for t in tools or []}
+        if rule and not tool_results:
+            calls = [(name, args) for name, args in rule.tool_calls if name in available]
+            if calls:
+                return {
+                    "tool_calls": [
+                        {
+                            "id": f"call_fake_{index}",
+                            "type": "function",
+                            "function": {"name": name, "arguments": json.dumps(_fill(args, variables))},
+                        }
+                        for index, (name, args) in enumerate(calls)
+                    ],
+                    "input_text": "\n".join(_message_text(m) for m in messages),
+                }
+
+        if rule and rule.content:
+            content = rule.content.format_map(variables)
+        elif tool_results:
+            content = variables["tool_results"]
+        else:
+            content = f"Respuesta simulada ({self.id}): {user_text[:200]}"
+        return {"content": content, "input_text": "\n".join(_message_text(m) for m in messages)}
+
+    def _usage(self, response: Dict[str, Any]) -> Any:
+        usage = _UsageMetrics()
+        usage.input_tokens = estimate_tokens(response["input_text"])
+        usage.output_tokens = self.output_tokens or estimate_tokens(response.get("content") or response.get("tool_calls"))
+        usage.total_tokens = usage.input_tokens + usage.output_tokens
+        return usage
+
+    def invoke(self, messages: List[Message], assistant_message: Message, tools=None, **kwargs) -> ModelResponse:
+        time.sleep(self.latency_ms / 1000)
+        return self._parse_provider_response(self._respond(messages, tools))
+
+    async def ainvoke(self, messages: List[Message], assistant_message: Message, tools=None, **kwargs) -> ModelResponse:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._parse_provider_response(self._respond(messages, tools))
+
+    def invoke_stream(self, messages: List[Message], assistant_message: Message, tools=None, **kwargs) -> Iterator[ModelResponse]:
+        yield self.invoke(messages, assistant_message, tools=tools)
+
+    async def ainvoke_stream(
+        self, messages: List[Message], assistant_message: Message, tools=None, **kwargs
+    ) -> AsyncIterator[ModelResponse]:
+        yield await self.ainvoke(messages, assistant_message, tools=tools)
+
+    def _parse_provider_response(self, response: Dict[str, Any], **kwargs) -> ModelResponse:
+        return ModelResponse(
+            role="assistant",
+            content=response.get("content"),
+            tool_calls=response.get("tool_calls") or [],
+            response_usage=self._usage(response),
+        )
+
+    def _parse_provider_response_delta(self, response: Dict[str, Any]) -> ModelResponse:
+        return self._parse_provider_response(response)
+
+
+def build_fake_model(model_id: str) -> FakeModel:
+    """FakeModel con la latencia/tokens de config; conserva el id del tier para métricas."""
+    return FakeModel(
+        id=model_id,
+        latency_ms=_config.fake_llm_latency_ms,
+        output_tokens=_config.fake_llm_output_tokens,
+    )
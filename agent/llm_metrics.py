@@ -0,0 +1,104 @@
+"""
+Instrumentación de runs de agentes para /metrics.
+
+`llm_metrics_hook(agent_name)` devuelve un post-hook de agno que se registra
+en cada agente y en el team, así que cubre tanto los runs lanzados desde el
+pipeline como los que dispara AgentOS. Por run registra latencia,
+time-to-first-token, tokens (prompt/completion/cached), tool calls y costo
+estimado, etiquetados por agente, modelo y severidad (`metadata.severity`).
+Los tokens llevan además el tier de modelo (`metadata.tier`, lo setea
+agent/model_router.py; `none` en runs que no pasan por el router).
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+from agent import metrics, tracing
+from agent.config import AdminAgentConfig
+from agent.storage.history import record_history_tokens
+
+_config = AdminAgentConfig()
+
+_TOKENS_PER_PRICE_UNIT = 1_000_000
+
+
+def estimate_cost(model: str, input_tokens: int, cached_tokens: int, output_tokens: int) -> Optional[float]:
+    """
+    Costo en USD según `llm.pricing` (precios por millón de tokens).
+
+    Returns:
+        None si el modelo no tiene precios configurados
+    """
+    pricing = _config.llm_pricing.get(model)
+    if not pricing:
+        return None
+    uncached = max(input_tokens - cached_tokens, 0)
+    return (
+        uncached * float(pricing.get("input", 0))
+        + cached_tokens * float(pricing.get("cached_input", pricing.get("input", 0)))
+        + output_tokens * float(pricing.get("output", 0))
+    ) / _TOKENS_PER_PRICE_UNIT
+
+
+def record_run(agent_name: str, run_output: Any, metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Registra las métricas de un run terminado."""
+    run_metrics = getattr(run_output, "metrics", None)
+    model = str(getattr(run_output, "model", None) or "unknown")
+    metadata = metadata or getattr(run_output, "metadata", None) or {}
+    severity = str(metadata.get("severity") or "none")
+    tier = str(metadata.get("tier") or "none")
+    labels = {"agent": agent_name, "model": model, "severity": severity}
+
+    duration = getattr(run_metrics, "duration", None)
+    if duration is not None:
+        metrics.AGENT_RUN_SECONDS.labels(**labels).observe(duration)
+    ttft = getattr(run_metrics, "time_to_first_token", None)
+    if ttft is not None:
+        metrics.AGENT_TIME_TO_FIRST_TOKEN_SECONDS.labels(**labels).observe(ttft)
+
+    input_tokens = getattr(run_metrics, "input_tokens", 0) or 0
+    output_tokens = getattr(run_metrics, "output_tokens", 0) or 0
+    # Tokens de prompt servidos desde el cache de prefijos del provider
+    cached_tokens = min(getattr(run_metrics, "cache_read_tokens", 0) or 0, input_tokens)
+    for kind, tokens in (
+        ("prompt", input_tokens),
+        ("prompt_cached", cached_tokens),
+        ("prompt_uncached", input_tokens - cached_tokens),
+        ("completion", output_tokens),
+    ):
+        metrics.AGENT_RUN_TOKENS.labels(tier=tier, kind=kind, **labels).observe(tokens)
+    if input_tokens:
+        metrics.PROMPT_CACHE_HIT_RATIO.labels(agent=agent_name).observe(cached_tokens / input_tokens)
+
+    tool_calls = len(getattr(run_output, "tools", None) or [])
+    metrics.AGENT_RUN_TOOL_CALLS.labels(**labels).observe(tool_calls)
+
+    cost = getattr(run_metrics, "cost", None)
+    if cost is None:
+        cost = estimate_cost(model, input_tokens, cached_tokens, output_tokens)
+    if cost is not None:
+        metrics.AGENT_RUN_COST_USD.labels(**labels).observe(cost)
+
+    # El post-hook corre dentro del run: los atributos quedan en su span
+    tracing.set_attributes({
+        "gen_ai.response.model": model,
+        "gen_ai.usage.input_tokens": input_tokens,
+        "gen_ai.usage.output_tokens": output_tokens,
+        "gen_ai.usage.cache_read_tokens": cached_tokens,
+        "agent.tool_calls": tool_calls,
+        "agent.cost_usd": cost,
+    })
+
+    record_history_tokens(agent_name, run_output)
+
+
+def llm_metrics_hook(agent_name: str) -> Callable[..., None]:
+    """Post-hook de agno que registra las métricas del run para `agent_name`."""
+
+    def _hook(run_output: Any, metadata: Optional[Dict[str, Any]] = None) -> None:
+        try:
+            record_run(agent_name, run_output, metadata)
+        except Exception as e:
+            print(f"Error recording LLM metrics for {agent_name}: {e}")
+
+    _hook.__name__ = f"llm_metrics_{agent_name}"
+    return _hook
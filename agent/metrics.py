@@ -0,0 +1,168 @@
+"""
+Métricas Prometheus propias de la aplicación.
+
+Se registran una sola vez al importar el módulo y se exponen en el mount
+`/metrics` de main.py (registry default de prometheus_client).
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Compactación de outputs de tools devueltos a los agentes
+TOOL_OUTPUT_TOKENS = Histogram(
+    "agent_tool_output_tokens",
+    "Tokens estimados del output de un tool después de compactar",
+    ["tool"],
+    buckets=(100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+TOOL_OUTPUT_TOKENS_SAVED = Counter(
+    "agent_tool_output_tokens_saved_total",
+    "Tokens estimados ahorrados por la compactación de outputs de tools",
+    ["tool"],
+)
+
+# Cache de reportes del ReportAgent
+REPORT_CACHE_REQUESTS = Counter(
+    "agent_report_cache_requests_total",
+    "Lookups en el cache de reportes del ReportAgent",
+    ["result"],
+)
+
+COMMAND_CACHE_REQUESTS = Counter(
+    "agent_quick_command_cache_requests_total",
+    "Resolución de /quick/command frente al cache de resultados",
+    ["command", "result"],  # hit | stale | coalesced | miss
+)
+DAILY_DIGEST_REQUESTS = Counter(
+    "agent_daily_digest_requests_total",
+    "Requests de daily digest por origen del reporte",
+    ["source"],  # materialized | generated
+)
+EVIDENCE_CHECK_SECONDS = Histogram(
+    "agent_evidence_check_seconds",
+    "Duración de cada check de evidencia del workflow de verificación",
+    ["check", "outcome"],  # ok | timeout | error
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+# Ruteo de modelos por tier
+MODEL_REQUEST_SECONDS = Histogram(
+    "agent_model_request_seconds",
+    "Duración de runs de agentes por tier de modelo",
+    ["agent", "tier", "outcome"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300),
+)
+PROMPT_CACHE_HIT_RATIO = Histogram(
+    "agent_prompt_cache_hit_ratio",
+    "Fracción de tokens de prompt servidos desde el cache de prefijos del provider por run",
+    ["agent"],
+    buckets=(0, 0.1, 0.25, 0.5, 0.75, 0.9, 1),
+)
+MODEL_FALLBACKS = Counter(
+    "agent_model_fallbacks_total",
+    "Runs reintentados con el siguiente tier de la cadena de fallback",
+    ["agent", "from_tier", "to_tier"],
+)
+
+# Historial de sesiones de agentes
+AGENT_HISTORY_TOKENS = Histogram(
+    "agent_history_tokens",
+    "Tokens estimados de historial inyectados en el contexto por run",
+    ["agent"],
+    buckets=(0, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+)
+AGENT_HISTORY_RUNS_COMPACTED = Counter(
+    "agent_history_runs_compacted_total",
+    "Runs viejos compactados en el resumen de su sesión",
+)
+AGNO_DB_SIZE_BYTES = Gauge(
+    "agent_agno_db_size_bytes",
+    "Tamaño de agno.db después del último VACUUM",
+)
+
+# Runs de agentes (post-hook en cada agente y en el team)
+_AGENT_RUN_LABELS = ["agent", "model", "severity"]
+AGENT_RUN_SECONDS = Histogram(
+    "agent_run_seconds",
+    "Duración total de un run de agente (modelo + tools)",
+    _AGENT_RUN_LABELS,
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300),
+)
+AGENT_TIME_TO_FIRST_TOKEN_SECONDS = Histogram(
+    "agent_time_to_first_token_seconds",
+    "Time-to-first-token del modelo por run",
+    _AGENT_RUN_LABELS,
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+AGENT_RUN_TOKENS = Histogram(
+    "agent_run_tokens",
+    "Tokens por run y tier de modelo (kind: prompt, prompt_cached, prompt_uncached, completion)",
+    _AGENT_RUN_LABELS + ["tier", "kind"],
+    buckets=(0, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000),
+)
+AGENT_RUN_TOOL_CALLS = Histogram(
+    "agent_run_tool_calls",
+    "Tool calls ejecutados por run",
+    _AGENT_RUN_LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21),
+)
+AGENT_RUN_COST_USD = Histogram(
+    "agent_run_cost_usd",
+    "Costo estimado por run en USD (provider o llm.pricing)",
+    _AGENT_RUN_LABELS,
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1),
+)
+
+# Memo de tool calls por run
+TOOL_MEMO_HITS = Counter(
+    "agent_tool_memo_hits_total",
+    "Tool calls evitados por repetir tool y args dentro del mismo run",
+    ["tool"],
+)
+
+# Redis (agent/storage/redis.py)
+REDIS_COMMAND_SECONDS = Histogram(
+    "agent_redis_command_seconds",
+    "Latencia de round-trip a Redis (un pipeline por operación)",
+    ["op", "outcome"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+REDIS_FALLBACKS = Counter(
+    "agent_redis_fallbacks_total",
+    "Operaciones resueltas con el LRU local porque Redis no estaba disponible",
+    ["op"],
+)
+
+# Contexto de datos por slash command (agent/storage/query_helpers.py)
+DATA_CONTEXT_LOOKUPS = Counter(
+    "agent_data_context_lookups_total",
+    "Lecturas de storage/Prometheus dentro de un slash command (fetch = consulta real)",
+    ["dataset", "result"],
+)
+
+# Pipeline de análisis de alertas (agent/agents/observability_team.py)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "agent_pipeline_stage_seconds",
+    "Duración de cada etapa de analyze_alert",
+    # classify | dedup | enrich | triage | report_cache | report (solo generación) | persist; ok | error
+    ["stage", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+ALERTS_PROCESSED = Counter(
+    "agent_alerts_total",
+    "Alertas procesadas por el pipeline por resultado y severidad clasificada",
+    ["result", "severity"],  # received | analyzed | deduplicated | failed
+)
+ALERTS_IN_FLIGHT = Gauge(
+    "agent_alerts_in_flight",
+    "Alertas en análisis en este momento",
+)
+WEBHOOK_PAYLOAD_BYTES = Histogram(
+    "agent_webhook_payload_bytes",
+    "Tamaño del body de los webhooks de Alertmanager",
+    buckets=(512, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072, 262144, 1048576),
+)
+WEBHOOK_PAYLOAD_ALERTS = Histogram(
+    "agent_webhook_payload_alerts",
+    "Alertas por webhook de Alertmanager (tamaño del grupo)",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250),
+)
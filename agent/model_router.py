@@ -0,0 +1,181 @@
+"""
+Ruteo de modelos por agente y severidad.
+
+Cada agente corre sobre un "tier" de modelo (p.ej. small/medium/large) que se
+elige según la severidad de la alerta: modelos chicos y rápidos para
+info/minor y duplicados, modelos grandes para critical. Si una ejecución
+supera el timeout (o falla) se reintenta con el siguiente tier de la cadena
+de fallback. Latencia por tier y fallbacks se registran en /metrics (tokens
+y costo por run en agent/llm_metrics.py).
+
+Sin sección `model_routing` en config.yaml todos los agentes usan
+`llm.agno_model` (un único tier `default`). Con `llm.provider: fake` cada
+tier usa el modelo offline de `agent/fake_model.py`.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from agno.agent import Agent
+from agno.models.base import Model
+from agno.models.openai import OpenAIChat
+
+from agent import metrics, tracing
+from agent.config import AdminAgentConfig
+from agent.fake_model import build_fake_model
+from agent.utils.run_memo import tool_memo_scope
+
+_config = AdminAgentConfig()
+
+DEFAULT_TIER = "default"
+DUPLICATE_SEVERITY = "duplicate"
+
+
+def build_model(model_id: str) -> Model:
+    """Instancia el modelo del provider configurado (`llm.provider`)."""
+    if _config.llm_provider == "fake":
+        return build_fake_model(model_id)
+    return OpenAIChat(id=model_id)
+
+
+class ModelRouter:
+    """Resuelve tier/modelo por (agente, severidad) y ejecuta con fallback."""
+
+    def __init__(
+        self,
+        tiers: Dict[str, str],
+        fallback: Dict[str, List[str]],
+        severity_tiers: Dict[str, str],
+        agent_tiers: Dict[str, Dict[str, str]],
+        timeout_seconds: float,
+    ):
+        self.tiers = dict(tiers) or {DEFAULT_TIER: _config.agno_model}
+        self.fallback = fallback
+        self.severity_tiers = severity_tiers
+        self.agent_tiers = agent_tiers
+        self.timeout_seconds = timeout_seconds
+        # Copias de agentes por (nombre, tier); comparten tools/db/instrucciones
+        self._agents: Dict[Tuple[str, str], Agent] = {}
+
+    def _default_tier(self) -> str:
+        return DEFAULT_TIER if DEFAULT_TIER in self.tiers else next(iter(self.tiers))
+
+    def resolve_tier(self, agent_name: str, severity: Optional[str] = None, is_duplicate: bool = False) -> str:
+        """
+        Tier para un agente dada la severidad de la alerta.
+
+        Prioridad: agents.<agente>.<severidad> > severity.<severidad> >
+        agents.<agente>.default > tier default. Los duplicados usan la
+        severidad `duplicate`.
+        """
+        per_agent = self.agent_tiers.get(agent_name) or {}
+        key = DUPLICATE_SEVERITY if is_duplicate else (severity or "").lower()
+        tier = per_agent.get(key) or self.severity_tiers.get(key) or per_agent.get("default")
+        if tier not in self.tiers:
+            return self._default_tier()
+        return tier
+
+    def model_for(self, tier: str) -> str:
+        return self.tiers.get(tier) or self.tiers[self._default_tier()]
+
+    def chain(self, tier: str) -> List[str]:
+        """Tier inicial seguido de sus fallbacks (sin repetidos ni tiers desconocidos)."""
+        ordered = [tier]
+        for candidate in self.fallback.get(tier) or []:
+            if candidate in self.tiers and candidate not in ordered:
+                ordered.append(candidate)
+        return ordered
+
+    def default_model(self, agent_name: str) -> Model:
+        """Modelo con el que se construye un agente (tier sin severidad)."""
+        return build_model(self.model_for(self.resolve_tier(agent_name)))
+
+    def _agent_for(self, agent: Agent, agent_name: str, tier: str) -> Agent:
+        model_id = self.model_for(tier)
+        if getattr(agent.model, "id", None) == model_id:
+            return agent
+        key = (agent_name, tier)
+        if key not in self._agents:
+            self._agents[key] = agent.deep_copy(update={"model": build_model(model_id)})
+        return self._agents[key]
+
+    async def arun(
+        self,
+        agent: Agent,
+        agent_name: str,
+        input: Any,
+        severity: Optional[str] = None,
+        is_duplicate: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Ejecuta `agent.arun` con el modelo del tier resuelto y fallback por timeout.
+
+        Args:
+            agent: Agente base (su configuración se reutiliza en todos los tiers)
+            agent_name: Nombre para ruteo y métricas (watchdog, triage, report, query)
+            input: Input del run
+            severity: Severidad de la alerta (critical, major, minor, info)
+            is_duplicate: Si la alerta es duplicada
+
+        Returns:
+            Respuesta del primer tier que completa; si todos fallan se propaga el último error
+        """
+        tiers = self.chain(self.resolve_tier(agent_name, severity, is_duplicate))
+        # Severidad y tier viajan en metadata del run para las métricas de agent/llm_metrics.py
+        metadata = {**(kwargs.pop("metadata", None) or {}), "severity": severity or "none"}
+        last_error: Optional[BaseException] = None
+        run_attributes = {
+            "agent.name": agent_name,
+            "alert.severity": severity or "none",
+            "alert.duplicate": is_duplicate,
+            "agent.tier_chain": tiers,
+        }
+        # Memo de tool calls compartido por todos los intentos de este run
+        with tracing.span(f"agent.run {agent_name}", run_attributes) as run_span, tool_memo_scope():
+            for index, tier in enumerate(tiers):
+                runner = self._agent_for(agent, agent_name, tier)
+                attempt_attributes = {"agent.tier": tier, "agent.attempt": index + 1, "gen_ai.request.model": self.model_for(tier)}
+                start = time.perf_counter()
+                try:
+                    with tracing.span(f"agent.attempt {agent_name}", attempt_attributes):
+                        response = await asyncio.wait_for(
+                            runner.arun(input=input, metadata={**metadata, "tier": tier}, **kwargs), timeout=self.timeout_seconds
+                        )
+                except Exception as e:
+                    outcome = "timeout" if isinstance(e, asyncio.TimeoutError) else "error"
+                    self._observe(agent_name, tier, outcome, time.perf_counter() - start)
+                    last_error = e
+                    run_span.set_attribute("agent.fallbacks", index + 1)
+                    if index + 1 < len(tiers):
+                        metrics.MODEL_FALLBACKS.labels(agent=agent_name, from_tier=tier, to_tier=tiers[index + 1]).inc()
+                        print(f"Model tier {tier} failed for {agent_name} ({outcome}: {e}); falling back to {tiers[index + 1]}")
+                    continue
+                self._observe(agent_name, tier, "ok", time.perf_counter() - start)
+                run_span.set_attributes({"agent.tier": tier, "agent.fallbacks": index})
+                return response
+            tracing.set_error(f"Todos los tiers fallaron: {last_error}", run_span)
+        raise last_error
+
+    @staticmethod
+    def _observe(agent_name: str, tier: str, outcome: str, seconds: float) -> None:
+        metrics.MODEL_REQUEST_SECONDS.labels(agent=agent_name, tier=tier, outcome=outcome).observe(seconds)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "tiers": dict(self.tiers),
+            "fallback": dict(self.fallback),
+            "severity": dict(self.severity_tiers),
+            "agents": dict(self.agent_tiers),
+            "timeout_seconds": self.timeout_seconds,
+        }
+
+
+model_router = ModelRouter(
+    tiers=_config.model_tiers,
+    fallback=_config.model_fallback,
+    severity_tiers=_config.model_severity_tiers,
+    agent_tiers=_config.model_agent_tiers,
+    timeout_seconds=_config.model_timeout_seconds,
+)
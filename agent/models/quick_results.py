@@ -0,0 +1,156 @@
+"""
+Resultados tipados de los quick commands.
+
+Las funciones de `agent/tools/quick_commands.py` arman primero uno de estos
+objetos; `agent/tools/quick_render.py` los convierte a markdown, JSON o texto
+compacto para el chat, y la verificación lee los campos directamente.
+"""
+
+from datetime import datetime
+from typing import Annotated, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, TypeAdapter
+
+SEVERITY_ORDER = ["critical", "major", "minor", "info"]
+
+
+class AlertItem(BaseModel):
+    received_at: datetime
+    service: str
+    alertname: str
+    severity: str
+    status: str
+    summary: str = ""
+    is_duplicate: bool = False
+
+
+class ServiceCount(BaseModel):
+    service: str
+    count: int
+
+
+class RecentIncidentsResult(BaseModel):
+    command: Literal["recent-incidents"] = "recent-incidents"
+    hours: int
+    start: datetime
+    end: datetime
+    total: int
+    severity_counts: Dict[str, int] = Field(default_factory=dict)
+    top_services: List[ServiceCount] = Field(default_factory=list)
+    # Máximo 10 alertas por severidad, en SEVERITY_ORDER
+    alerts_by_severity: Dict[str, List[AlertItem]] = Field(default_factory=dict)
+    ai_requested: bool = False
+
+
+class ServiceMetrics(BaseModel):
+    error_rate: Optional[float] = None
+    latency_p95: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ServiceHealth(BaseModel):
+    service: str
+    status: Literal["CRITICAL", "DEGRADED", "WARNING", "HEALTHY"]
+    active_alerts: int
+    severities: List[str] = Field(default_factory=list)
+    metrics: Optional[ServiceMetrics] = None
+
+
+class HealthResult(BaseModel):
+    command: Literal["health"] = "health"
+    timestamp: datetime
+    overall_status: Literal["CRITICAL", "DEGRADED", "HEALTHY"]
+    active_alerts: int
+    critical: int
+    major: int
+    services: List[ServiceHealth] = Field(default_factory=list)
+    error_rate_threshold: float
+    latency_threshold_ms: float
+    ai_requested: bool = False
+
+
+class PostDeployAlert(BaseModel):
+    minutes_after_deploy: int
+    alertname: str
+    severity: str
+    summary: str = ""
+
+
+class PostDeploymentResult(BaseModel):
+    command: Literal["post-deployment"] = "post-deployment"
+    service: str
+    deploy_time: datetime
+    current_time: datetime
+    window_hours: float
+    alerts_post: int
+    alerts_pre: int
+    critical_post: int
+    # Máximo 5 alertas post-deploy
+    post_alerts: List[PostDeployAlert] = Field(default_factory=list)
+    verdict: Literal["success", "rollback", "intensive", "continuous"]
+    ai_requested: bool = False
+
+
+class PeriodComparison(BaseModel):
+    current: Union[int, float]
+    previous: Union[int, float]
+    change_pct: float
+
+
+class TrendsResult(BaseModel):
+    command: Literal["trends"] = "trends"
+    metric: str
+    service: Optional[str] = None
+    period_hours: int
+    start: datetime
+    end: datetime
+    supported: bool = True
+    comparison: Optional[PeriodComparison] = None
+    severity_breakdown: Dict[str, int] = Field(default_factory=dict)
+    ai_requested: bool = False
+
+
+class DailyDigestResult(BaseModel):
+    command: Literal["daily-digest"] = "daily-digest"
+    date: str
+    total: int
+    severity_counts: Dict[str, int] = Field(default_factory=dict)
+    # Top 3 alertas critical y top 5 servicios
+    highlights: List[AlertItem] = Field(default_factory=list)
+    top_services: List[ServiceCount] = Field(default_factory=list)
+    change_pct_vs_previous: Optional[float] = None
+    # Resumen ejecutivo del QueryAgent (digest precomputado)
+    ai_summary: Optional[str] = None
+    ai_requested: bool = False
+
+    @property
+    def critical_count(self) -> int:
+        return self.severity_counts.get("critical", 0)
+
+    @property
+    def major_count(self) -> int:
+        return self.severity_counts.get("major", 0)
+
+
+class QuickCommandError(BaseModel):
+    """Parámetros inválidos (fecha, deployment_time): se informa en el reporte."""
+
+    command: Literal["error"] = "error"
+    message: str
+
+
+QuickResult = Union[
+    RecentIncidentsResult,
+    HealthResult,
+    PostDeploymentResult,
+    TrendsResult,
+    DailyDigestResult,
+    QuickCommandError,
+]
+
+_QUICK_RESULT_ADAPTER: TypeAdapter = TypeAdapter(Annotated[QuickResult, Field(discriminator="command")])
+
+
+def parse_quick_result(data: Dict) -> QuickResult:
+    """Reconstruye un resultado desde su JSON (cache, artefactos guardados)."""
+    return _QUICK_RESULT_ADAPTER.validate_python(data)
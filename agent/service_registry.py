@@ -0,0 +1,129 @@
+"""
+Registro de servicios monitoreados con refresco en background.
+
+El descubrimiento (`count(up) by (service)` en Prometheus) corre en una tarea
+periódica; las lecturas se sirven desde memoria sin llamadas upstream. El
+servidor hace el primer descubrimiento en el startup (en un thread), antes de
+atender requests.
+Emite eventos `added` / `removed` cuando cambia el conjunto de servicios.
+"""
+
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from agent.config import AdminAgentConfig
+from tools import prometheus_tool
+
+_config = AdminAgentConfig()
+
+# Cantidad de eventos recientes que se conservan para inspección
+_MAX_RECENT_EVENTS = 100
+
+ServiceListener = Callable[[str, str], None]
+
+
+class ServiceRegistry:
+    """Cache en memoria de servicios descubiertos dinámicamente."""
+
+    def __init__(self, interval_seconds: int):
+        self.interval_seconds = interval_seconds
+        self._services: List[str] = []
+        self._last_refresh: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+        self._listeners: List[ServiceListener] = []
+        self._recent_events: Deque[Dict[str, Any]] = deque(maxlen=_MAX_RECENT_EVENTS)
+        self._task: Optional[asyncio.Task] = None
+
+    def get_services(self) -> List[str]:
+        """
+        Servicios conocidos (desde memoria).
+
+        Si el registro nunca se refrescó (p.ej. uso fuera del servidor),
+        hace un único descubrimiento sincrónico.
+        """
+        if self._last_refresh is None:
+            self.refresh()
+        return list(self._services)
+
+    def subscribe(self, listener: ServiceListener) -> None:
+        """Registra un callback `listener(event, service)` con event en {added, removed}."""
+        self._listeners.append(listener)
+
+    def refresh(self) -> bool:
+        """
+        Ejecuta un descubrimiento y actualiza el registro.
+
+        Si Prometheus falla se conserva la última lista conocida.
+
+        Returns:
+            True si el descubrimiento fue exitoso
+        """
+        try:
+            discovered = prometheus_tool._discover_services_raw()
+        except Exception as e:
+            self._last_error = str(e)
+            print(f"Error refreshing service registry: {e}")
+            if self._last_refresh is None:
+                # Evita reintentar en cada lectura hasta el próximo ciclo
+                self._last_refresh = datetime.now(timezone.utc)
+            return False
+
+        previous = set(self._services)
+        current = set(discovered)
+        self._services = sorted(current)
+        self._last_refresh = datetime.now(timezone.utc)
+        self._last_error = None
+
+        for service in sorted(current - previous):
+            self._emit("added", service)
+        for service in sorted(previous - current):
+            self._emit("removed", service)
+        return True
+
+    def _emit(self, event: str, service: str) -> None:
+        self._recent_events.append({
+            "event": event,
+            "service": service,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        })
+        for listener in self._listeners:
+            try:
+                listener(event, service)
+            except Exception as e:
+                print(f"Error in service registry listener: {e}")
+
+    async def _refresh_loop(self) -> None:
+        if self._last_refresh is not None:
+            # Ya precalentado en el startup
+            await asyncio.sleep(self.interval_seconds)
+        while True:
+            await asyncio.to_thread(self.refresh)
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Inicia el refresco periódico en el event loop actual."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "services": list(self._services),
+            "last_refresh": self._last_refresh.isoformat() if self._last_refresh else None,
+            "last_error": self._last_error,
+            "interval_seconds": self.interval_seconds,
+            "recent_events": list(self._recent_events),
+        }
+
+
+service_registry = ServiceRegistry(_config.service_discovery_interval_seconds)
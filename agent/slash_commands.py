@@ -9,11 +9,19 @@ y ejecuta workflows de verificación con evidencia para reducir ruido.
 
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta, timezone
+import asyncio
 import re
 import hashlib
+import inspect
 import json
+import time
 from collections import OrderedDict
 
+from agent.config import AdminAgentConfig
+from agent.models.quick_results import DailyDigestResult, QuickResult
+
+_config = AdminAgentConfig()
+
 
 # Mapa de aliases a comandos canónicos
 COMMAND_ALIASES = {
@@ -279,6 +287,24 @@ def build_query_agent_prompt(canonical_command: str, params: Dict[str, str], ori
         elif "ayer" in original_text.lower():
             base_prompt += " de ayer"
     
+    remaining_text = extract_remaining_text(params, original_text)
+    if remaining_text:
+        base_prompt += f" {remaining_text}"
+    
+    return base_prompt
+
+
+def extract_remaining_text(params: Dict[str, str], original_text: str) -> str:
+    """
+    Devuelve el texto libre del comando que no fue convertido en params.
+    
+    Args:
+        params: Parámetros parseados
+        original_text: Texto original del argumento
+        
+    Returns:
+        Texto restante (vacío si no queda nada significativo)
+    """
     # Detectar si el texto original contiene atajos o params que ya fueron procesados
     # Lista de tokens que no deben agregarse porque ya fueron procesados
     processed_tokens = set()
@@ -306,7 +332,6 @@ def build_query_agent_prompt(canonical_command: str, params: Dict[str, str], ori
             if match:
                 processed_tokens.add(match.group(0))
     
-    # Si había texto adicional que NO fue procesado, agregarlo
     # Tokenizar el texto original y filtrar los tokens procesados
     remaining_text = original_text
     for token in processed_tokens:
@@ -315,11 +340,242 @@ def build_query_agent_prompt(canonical_command: str, params: Dict[str, str], ori
     # Limpiar espacios múltiples y trim
     remaining_text = " ".join(remaining_text.split()).strip()
     
-    # Solo agregar si queda algo significativo (más de 2 caracteres)
-    if remaining_text and len(remaining_text) > 2:
-        base_prompt += f" {remaining_text}"
+    # Solo es significativo si queda algo de más de 2 caracteres
+    if len(remaining_text) > 2:
+        return remaining_text
+    return ""
+
+
+# ============================================================================
+# EJECUCIÓN DIRECTA (SIN LLM)
+# ============================================================================
+
+# Tipos de los params aceptados por cada comando en ejecución directa.
+# Un param fuera de este mapa implica fallback a QueryAgent.
+DIRECT_PARAM_TYPES: Dict[str, Dict[str, str]] = {
+    "recent-incidents": {
+        "hours": "int",
+        "severity": "str",
+        "service": "str",
+        "include_duplicates": "bool",
+        "analyze_with_ai": "bool",
+    },
+    "health": {
+        "services": "list",
+        "include_metrics": "bool",
+        "analyze_with_ai": "bool",
+    },
+    "post-deployment": {
+        "service": "str",
+        "deployment_time": "str",
+        "monitoring_window_hours": "int",
+        "analyze_with_ai": "bool",
+    },
+    "trends": {
+        "metric": "str",
+        "service": "str",
+        "period_hours": "int",
+        "compare_with_previous": "bool",
+        "analyze_with_ai": "bool",
+    },
+    "daily-digest": {
+        "date": "str",
+        "include_all_services": "bool",
+        "analyze_with_ai": "bool",
+    },
+}
+
+_TRUE_VALUES = {"true", "1", "yes", "si", "sí"}
+_FALSE_VALUES = {"false", "0", "no"}
+
+
+def _coerce_param(value: str, param_type: str) -> Any:
+    """Convierte un valor string al tipo esperado; ValueError si no es válido."""
+    if param_type == "int":
+        return int(value)
+    if param_type == "bool":
+        lowered = value.lower()
+        if lowered in _TRUE_VALUES:
+            return True
+        if lowered in _FALSE_VALUES:
+            return False
+        raise ValueError(f"Valor booleano inválido: {value}")
+    if param_type == "list":
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return value
+
+
+def get_direct_function(canonical_command: str):
+    """Función determinística (resultado tipado, sin LLM) asociada a un comando canónico."""
+    from agent.tools import quick_commands
     
-    return base_prompt
+    return {
+        "recent-incidents": quick_commands._build_recent_incidents,
+        "health": quick_commands._build_service_health_summary,
+        "post-deployment": quick_commands._build_post_deployment,
+        "trends": quick_commands._build_trends,
+        "daily-digest": quick_commands._build_daily_digest,
+    }.get(canonical_command)
+
+
+def build_direct_call(
+    canonical_command: str,
+    params: Dict[str, str],
+    original_text: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Resuelve los kwargs para ejecutar un comando sin pasar por el QueryAgent.
+    
+    Args:
+        canonical_command: Comando canónico
+        params: Parámetros parseados (strings)
+        original_text: Texto original del argumento
+        
+    Returns:
+        kwargs tipados para la función de `get_direct_function`, o None si el
+        comando necesita el LLM (analyze_with_ai, params desconocidos o
+        inválidos, o texto libre sin procesar).
+    """
+    param_types = DIRECT_PARAM_TYPES.get(canonical_command)
+    if param_types is None or not can_execute_via_rest(canonical_command, params):
+        return None
+    
+    kwargs: Dict[str, Any] = {}
+    for key, value in params.items():
+        if key not in param_types:
+            return None
+        try:
+            kwargs[key] = _coerce_param(value, param_types[key])
+        except ValueError:
+            return None
+    
+    if kwargs.get("analyze_with_ai", _config.quick_commands_default_ai_analysis):
+        return None
+    if extract_remaining_text(params, original_text):
+        return None
+    
+    kwargs["analyze_with_ai"] = False
+    return kwargs
+
+
+def normalize_command_params(
+    canonical_command: str,
+    params: Dict[str, str],
+    original_text: str,
+) -> Dict[str, Any]:
+    """
+    Forma canónica de los parámetros de un comando, para usar como clave de cache.
+    
+    Tipa los valores según `DIRECT_PARAM_TYPES`, completa los defaults de la
+    función directa y resuelve `analyze_with_ai`, así `/novedades`,
+    `/novedades hoy` y `/inc hours=24` producen lo mismo. El texto libre que
+    queda (va al QueryAgent) se incluye normalizado.
+    """
+    param_types = DIRECT_PARAM_TYPES.get(canonical_command, {})
+    normalized: Dict[str, Any] = {}
+    
+    direct_function = get_direct_function(canonical_command)
+    if direct_function is not None:
+        for name, parameter in inspect.signature(direct_function).parameters.items():
+            if parameter.default is not inspect.Parameter.empty:
+                normalized[name] = parameter.default
+    normalized["analyze_with_ai"] = _config.quick_commands_default_ai_analysis
+    
+    for key, value in params.items():
+        try:
+            coerced = _coerce_param(value, param_types[key]) if key in param_types else value
+        except ValueError:
+            coerced = value
+        normalized[key] = sorted(coerced) if isinstance(coerced, list) else coerced
+    
+    remaining = " ".join(extract_remaining_text(params, original_text).lower().split())
+    if remaining:
+        normalized["_text"] = remaining
+    return normalized
+
+
+def command_time_bucket(bucket_seconds: int, now: Optional[float] = None) -> int:
+    """Índice de la ventana de tiempo actual (resultados se reutilizan dentro de la ventana)."""
+    return int((time.time() if now is None else now) // max(bucket_seconds, 1))
+
+
+def build_command_cache_key(
+    canonical_command: str,
+    params: Dict[str, str],
+    original_text: str,
+    bucket: int,
+) -> str:
+    """Clave de cache de resultados: (intención canónica, params normalizados, ventana)."""
+    payload = json.dumps(
+        {
+            "intent": canonical_command,
+            "params": normalize_command_params(canonical_command, params, original_text),
+            "bucket": bucket,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _int_param(params: Dict[str, Any], key: str, default: int) -> int:
+    try:
+        return int(params.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def plan_command_data(
+    commands: List[Tuple[str, Dict[str, str], str]],
+    now: datetime,
+):
+    """
+    Datasets que leen un grupo de comandos (reporte base + checks de evidencia).
+
+    Args:
+        commands: Comandos parseados (canonical, params, texto original)
+        now: Hora de referencia del contexto de datos
+
+    Returns:
+        `DataPlan` con el rango de alertas, alertas activas y servicios a precargar
+    """
+    from agent.service_registry import service_registry
+    from agent.storage.query_helpers import DataPlan
+
+    plan = DataPlan()
+    for canonical, params, original_text in commands:
+        args = normalize_command_params(canonical, params, original_text)
+
+        if canonical == "recent-incidents":
+            plan.add_alert_range(now - timedelta(hours=_int_param(args, "hours", 24)), now)
+        elif canonical == "health":
+            plan.active_alerts = True
+            if args.get("include_metrics") is True:
+                services = args.get("services")
+                plan.services.update(services if isinstance(services, list) and services else service_registry.get_services())
+        elif canonical == "trends" and args.get("metric") == "alert_count":
+            period_hours = _int_param(args, "period_hours", 24)
+            periods = 2 if args.get("compare_with_previous") is not False else 1
+            plan.add_alert_range(now - timedelta(hours=period_hours * periods), now)
+        elif canonical == "post-deployment" and args.get("deployment_time"):
+            try:
+                deploy_time = datetime.fromisoformat(str(args["deployment_time"]).replace("Z", "+00:00"))
+            except ValueError:
+                deploy_time = None
+            if deploy_time is not None and deploy_time.tzinfo is not None:
+                window_hours = _int_param(args, "monitoring_window_hours", 2)
+                plan.add_alert_range(deploy_time - timedelta(hours=2), min(deploy_time + timedelta(hours=window_hours), now))
+        # daily-digest se sirve del artefacto materializado (agent/daily_digest.py)
+
+        checks = CANONICAL_PROMPTS.get(canonical, {}).get("evidence_checks", [])
+        if "active-alerts" in checks or "active-criticals" in checks:
+            plan.active_alerts = True
+        if "alert-trend" in checks:
+            plan.add_alert_range(now - timedelta(hours=2 * _int_param(params, "hours", 24)), now)
+        if "recent-criticals" in checks:
+            plan.add_alert_range(now - timedelta(hours=24), now)
+    return plan
 
 
 # ============================================================================
@@ -355,7 +611,7 @@ CRITERIOS PARA FYI:
 - Problema ya conocido/duplicado
 - Tendencia descendente (mejorando)
 """,
-        "evidence_checks": ["health", "trends"],
+        "evidence_checks": ["active-alerts", "alert-trend"],
         "output_format": "markdown con secciones: Resumen Ejecutivo, Incidencias Destacadas, Evidencia, Recomendación"
     },
     
@@ -381,7 +637,7 @@ CRITERIOS PARA FYI:
 - Métricas dentro de umbrales
 - Sin alertas críticas activas
 """,
-        "evidence_checks": ["recent-incidents"],
+        "evidence_checks": ["recent-criticals"],
         "output_format": "markdown con secciones: Estado General, Servicios, Alertas Activas, Recomendación"
     },
     
@@ -411,7 +667,7 @@ CRITERIOS PARA FYI:
 - Métricas estables o mejorando
 - Deployment limpio
 """,
-        "evidence_checks": ["trends", "recent-incidents"],
+        "evidence_checks": ["deploy-trend"],
         "output_format": "markdown con secciones: Deployment Info, Comparación Pre/Post, Análisis de Anomalías, Recomendación"
     },
     
@@ -436,7 +692,7 @@ CRITERIOS PARA FYI:
 - Tendencia estable o descendente
 - Sin correlación con degradación
 """,
-        "evidence_checks": ["health"],
+        "evidence_checks": ["active-criticals"],
         "output_format": "markdown con secciones: Período Analizado, Comparación, Tendencia, Recomendación"
     },
     
@@ -513,18 +769,23 @@ def build_canonical_prompt(intent: str, args: Dict[str, str], locale: str = "es-
 # WORKFLOW DE VERIFICACIÓN CON EVIDENCIA
 # ============================================================================
 
-def run_verification_workflow(
+async def arun_verification_workflow(
     intent: str,
     args: Dict[str, str],
-    base_report: str
+    base_report: str,
+    result: Optional[QuickResult] = None,
 ) -> Dict[str, Any]:
     """
     Ejecuta workflow de verificación para un comando, obteniendo evidencia adicional.
     
+    Los checks de `CANONICAL_PROMPTS[intent]["evidence_checks"]` corren en
+    paralelo con timeout por check (ver agent/evidence_checks.py).
+    
     Args:
         intent: Comando canónico
         args: Argumentos parseados
         base_report: Reporte base generado por el comando
+        result: Resultado tipado del comando (None si lo generó el QueryAgent)
         
     Returns:
         Dict con {
@@ -533,208 +794,25 @@ def run_verification_workflow(
             "recommendation": Dict  # {level: notify|fyi, reason: str, confidence: float}
         }
     """
-    from agent.storage import query_helpers
-    
-    evidence = []
-    recommendation = {
-        "level": "fyi",
-        "reason": "Análisis completado sin situaciones críticas.",
-        "confidence": 0.5
-    }
+    from agent.evidence_checks import combine_recommendations, run_evidence_checks
     
     template = CANONICAL_PROMPTS.get(intent, {})
-    evidence_checks = template.get("evidence_checks", [])
-    
-    # Ejecutar checks de evidencia según el comando
-    if intent == "recent-incidents":
-        # Check 1: Health actual
-        if "health" in evidence_checks:
-            try:
-                active_alerts = query_helpers.get_active_alerts()
-                critical_count = sum(1 for a in active_alerts if a["labels"].get("severity") == "critical")
-                major_count = sum(1 for a in active_alerts if a["labels"].get("severity") == "major")
-                
-                health_pass = critical_count == 0 and major_count == 0
-                evidence.append({
-                    "source": "health_check",
-                    "query": "get_active_alerts()",
-                    "result_summary": f"{len(active_alerts)} alertas activas ({critical_count} critical, {major_count} major)",
-                    "pass": health_pass,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-                
-                # Influencia en recomendación
-                if not health_pass:
-                    recommendation["level"] = "notify"
-                    recommendation["reason"] = f"Sistema degradado: {critical_count} critical, {major_count} major activas"
-                    recommendation["confidence"] = 0.9
-            except Exception as e:
-                evidence.append({
-                    "source": "health_check",
-                    "query": "get_active_alerts()",
-                    "result_summary": f"Error: {str(e)}",
-                    "pass": False,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-        
-        # Check 2: Trends (comparar con período anterior)
-        if "trends" in evidence_checks:
-            try:
-                hours = int(args.get("hours", "24"))
-                end_time = datetime.now(timezone.utc)
-                start_time = end_time - timedelta(hours=hours)
-                
-                # Período actual
-                alerts_current = query_helpers.get_alerts_in_timerange(start_time, end_time)
-                
-                # Período anterior
-                prev_end = start_time
-                prev_start = prev_end - timedelta(hours=hours)
-                alerts_prev = query_helpers.get_alerts_in_timerange(prev_start, prev_end)
-                
-                change_pct = ((len(alerts_current) - len(alerts_prev)) / len(alerts_prev) * 100) if len(alerts_prev) > 0 else 0
-                trends_pass = abs(change_pct) < 50
-                
-                evidence.append({
-                    "source": "trends_check",
-                    "query": f"compare_periods(hours={hours})",
-                    "result_summary": f"Período actual: {len(alerts_current)}, anterior: {len(alerts_prev)}, cambio: {change_pct:+.1f}%",
-                    "pass": trends_pass,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-                
-                # Influencia en recomendación
-                if change_pct > 50:
-                    recommendation["level"] = "notify"
-                    recommendation["reason"] = f"Aumento significativo de incidencias: {change_pct:+.1f}%"
-                    recommendation["confidence"] = 0.85
-            except Exception as e:
-                evidence.append({
-                    "source": "trends_check",
-                    "query": f"compare_periods(hours={hours})",
-                    "result_summary": f"Error: {str(e)}",
-                    "pass": False,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-    
-    elif intent == "health":
-        # Check: Incidencias recientes (24h) para contexto
-        if "recent-incidents" in evidence_checks:
-            try:
-                end_time = datetime.now(timezone.utc)
-                start_time = end_time - timedelta(hours=24)
-                alerts = query_helpers.get_alerts_in_timerange(start_time, end_time)
-                
-                critical_count = sum(1 for a in alerts if a["labels"].get("severity") == "critical")
-                incidents_pass = critical_count == 0
-                
-                evidence.append({
-                    "source": "recent_incidents_check",
-                    "query": "get_alerts_in_timerange(hours=24)",
-                    "result_summary": f"{len(alerts)} alertas en 24h ({critical_count} critical)",
-                    "pass": incidents_pass,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-                
-                # Influencia en recomendación
-                if critical_count > 0:
-                    recommendation["level"] = "notify"
-                    recommendation["reason"] = f"Alertas críticas recientes: {critical_count} en últimas 24h"
-                    recommendation["confidence"] = 0.9
-            except Exception as e:
-                evidence.append({
-                    "source": "recent_incidents_check",
-                    "query": "get_alerts_in_timerange(hours=24)",
-                    "result_summary": f"Error: {str(e)}",
-                    "pass": False,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-    
-    elif intent == "post-deployment":
-        # Check 1: Trends alrededor del deployment
-        if "trends" in evidence_checks:
-            try:
-                service = args.get("service", "")
-                deployment_time_str = args.get("deployment_time", "")
-                window_hours = int(args.get("monitoring_window_hours", "2"))
-                
-                if deployment_time_str:
-                    deploy_time = datetime.fromisoformat(deployment_time_str.replace("Z", "+00:00"))
-                    post_end = min(deploy_time + timedelta(hours=window_hours), datetime.now(timezone.utc))
-                    alerts_post = query_helpers.get_alerts_in_timerange(deploy_time, post_end, service=service)
-                    
-                    # Pre-deploy
-                    pre_start = deploy_time - timedelta(hours=2)
-                    alerts_pre = query_helpers.get_alerts_in_timerange(pre_start, deploy_time, service=service)
-                    
-                    ratio = len(alerts_post) / len(alerts_pre) if len(alerts_pre) > 0 else (1 if len(alerts_post) == 0 else float('inf'))
-                    trends_pass = ratio <= 2
-                    
-                    evidence.append({
-                        "source": "post_deployment_trends",
-                        "query": f"compare_pre_post_deploy(service={service})",
-                        "result_summary": f"Pre: {len(alerts_pre)}, Post: {len(alerts_post)}, ratio: {ratio:.2f}x",
-                        "pass": trends_pass,
-                        "timestamp": datetime.now(timezone.utc).isoformat()
-                    })
-                    
-                    # Influencia en recomendación
-                    critical_post = sum(1 for a in alerts_post if a["labels"].get("severity") == "critical")
-                    if critical_post > 0:
-                        recommendation["level"] = "notify"
-                        recommendation["reason"] = f"Alertas críticas post-deploy: {critical_post}"
-                        recommendation["confidence"] = 0.95
-                    elif ratio > 2:
-                        recommendation["level"] = "notify"
-                        recommendation["reason"] = f"Aumento significativo de alertas post-deploy: {ratio:.1f}x"
-                        recommendation["confidence"] = 0.8
-            except Exception as e:
-                evidence.append({
-                    "source": "post_deployment_trends",
-                    "query": "compare_pre_post_deploy",
-                    "result_summary": f"Error: {str(e)}",
-                    "pass": False,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-    
-    elif intent == "trends":
-        # Check: Health actual para contexto
-        if "health" in evidence_checks:
-            try:
-                active_alerts = query_helpers.get_active_alerts()
-                critical_count = sum(1 for a in active_alerts if a["labels"].get("severity") == "critical")
-                
-                health_pass = critical_count == 0
-                evidence.append({
-                    "source": "health_check",
-                    "query": "get_active_alerts()",
-                    "result_summary": f"{len(active_alerts)} alertas activas ({critical_count} critical)",
-                    "pass": health_pass,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-                
-                # Si hay tendencia ascendente Y sistema degradado → notify
-                # (esto lo detectamos en el reporte base, aquí solo agregamos contexto)
-            except Exception as e:
-                evidence.append({
-                    "source": "health_check",
-                    "query": "get_active_alerts()",
-                    "result_summary": f"Error: {str(e)}",
-                    "pass": False,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                })
-    
-    elif intent == "daily-digest":
+    results = await run_evidence_checks(template.get("evidence_checks", []), args)
+    evidence = [check_evidence for check_evidence, _ in results]
+    recommendation = combine_recommendations(
+        [check_recommendation for _, check_recommendation in results],
+        default={
+            "level": "fyi",
+            "reason": "Análisis completado sin situaciones críticas.",
+            "confidence": 0.5
+        },
+    )
+    
+    if isinstance(result, DailyDigestResult) and result.critical_count > 0:
         # Daily digest generalmente es FYI, pero notify si hubo incidentes críticos
-        # Analizar el base_report para detectar keywords
-        if "crítico" in base_report.lower() or "critical" in base_report.lower():
-            critical_match = re.search(r'(\d+)\s+incidentes?\s+críticos?', base_report.lower())
-            if critical_match:
-                count = int(critical_match.group(1))
-                if count > 0:
-                    recommendation["level"] = "notify"
-                    recommendation["reason"] = f"Día con {count} incidentes críticos"
-                    recommendation["confidence"] = 0.9
+        recommendation["level"] = "notify"
+        recommendation["reason"] = f"Día con {result.critical_count} incidentes críticos"
+        recommendation["confidence"] = 0.9
     
     # Agregar evidencia al reporte
     evidence_section = "\n\n---\n\n## Evidencia de Verificación\n\n"
@@ -765,15 +843,70 @@ def run_verification_workflow(
     }
 
 
+def run_verification_workflow(
+    intent: str,
+    args: Dict[str, str],
+    base_report: str,
+    result: Optional[QuickResult] = None,
+) -> Dict[str, Any]:
+    """Versión sync de `arun_verification_workflow` (para callers sin event loop)."""
+    return asyncio.run(arun_verification_workflow(intent, args, base_report, result))
+
+
 # ============================================================================
 # DEDUPLICACIÓN / AGRUPADO (COOLDOWN)
 # ============================================================================
 
-from agent.storage.redis import get_redis
+from agent.storage.redis import redis_store
 
 _DEDUPE_TTL_SECONDS = 30 * 60  # 30 minutos
+_DEDUPE_LOCAL_MAX_ENTRIES = 500
+
+_dedupe_store = redis_store.namespace("dedupe:", _DEDUPE_LOCAL_MAX_ENTRIES)
+# LRU local de las entradas de dedupe (fallback si Redis no está disponible)
+_dedupe_cache = _dedupe_store.local
+
+# Keywords que caracterizan el contenido de un reporte para el fingerprint
+_REPORT_KEYWORDS = {
+    "critical": r"\bcritical\b|cr[ií]tic[oa]s?",
+    "major": r"\bmajor\b",
+    "degraded": r"degradad[oa]|\bdegraded\b|\bdown\b|ca[ií]d[oa]",
+    "trend_up": r"aumento|increase|ascendente|⬆|↑",
+    "trend_down": r"disminuci[oó]n|decrease|descendente|⬇|↓",
+    "no_incidents": r"sin incidencias|no se encontraron|no hay alertas",
+}
 
-def check_dedupe(intent: str, args: Dict[str, str], report: str) -> Tuple[bool, Optional[str]]:
+
+def _extract_keywords_from_report(report: str) -> List[str]:
+    """Extrae keywords normalizadas (critical, trend_up, ...) del reporte."""
+    report_lower = report.lower()
+    return sorted(
+        keyword for keyword, pattern in _REPORT_KEYWORDS.items()
+        if re.search(pattern, report_lower)
+    )
+
+
+def _compute_fingerprint(intent: str, args: Dict[str, Any], keywords: List[str]) -> str:
+    """Fingerprint estable de (comando, args, keywords del resultado)."""
+    payload = json.dumps(
+        {"intent": intent, "args": {k: str(v) for k, v in args.items()}, "keywords": sorted(keywords)},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+async def dedupe_age_seconds(intent: str, args: Dict[str, str], report: str) -> Optional[float]:
+    """Segundos desde la ejecución original de un resultado duplicado (si se conoce)."""
+    fingerprint = _compute_fingerprint(intent, args, _extract_keywords_from_report(report))
+    value = await _dedupe_store.get(fingerprint)
+    try:
+        timestamp = datetime.fromisoformat(json.loads(value)["timestamp"])
+    except (TypeError, KeyError, ValueError):
+        return None
+    return (datetime.now(timezone.utc) - timestamp).total_seconds()
+
+
+async def check_dedupe(intent: str, args: Dict[str, str], report: str) -> Tuple[bool, Optional[str]]:
     """
     Verifica si un comando/resultado ya fue ejecutado recientemente (dedupe).
     
@@ -785,33 +918,24 @@ def check_dedupe(intent: str, args: Dict[str, str], report: str) -> Tuple[bool,
     Returns:
         Tupla de (is_duplicate, cached_report_if_duplicate)
     """
-    redis = get_redis()
-    
     # Calcular fingerprint
     keywords = _extract_keywords_from_report(report)
     fingerprint = _compute_fingerprint(intent, args, keywords)
-    key = f"dedupe:{fingerprint}"
-    
-    # Buscar en redis
-    cached_data = redis.get(key)
-    if cached_data:
-        try:
-            cached_entry = json.loads(cached_data)
-            return (True, cached_entry.get("report"))
-        except json.JSONDecodeError:
-            pass
-    
-    # No es duplicado, agregar al cache
-    now = datetime.now(timezone.utc)
     entry = {
         "intent": intent,
         "args": args,
         "report": report,
-        "timestamp": now.isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
-    redis.setex(key, _DEDUPE_TTL_SECONDS, json.dumps(entry))
     
-    return (False, None)
+    # Registrar si no existe; si ya existía es duplicado (un solo round-trip)
+    created, existing = await _dedupe_store.set_if_absent(fingerprint, json.dumps(entry), _DEDUPE_TTL_SECONDS)
+    if created:
+        return (False, None)
+    try:
+        return (True, json.loads(existing).get("report"))
+    except json.JSONDecodeError:
+        return (True, existing)
 
 
 def apply_dedupe_recommendation(
@@ -830,10 +954,11 @@ def apply_dedupe_recommendation(
     Returns:
         Resultado modificado con recomendación ajustada
     """
-    if not is_duplicate:
+    if not is_duplicate or result.get("deduplicated"):
         return result
     
     # Es duplicado, cambiar a FYI
+    result["deduplicated"] = True
     result["recommendation"]["level"] = "fyi"
     
     if time_since_seconds:
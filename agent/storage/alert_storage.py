@@ -2,9 +2,10 @@ import datetime
 import json
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Column, String, Text, Integer, DateTime, select, desc
+from sqlalchemy import JSON, Column, String, Text, Integer, DateTime, select, desc
 from sqlalchemy.dialects.postgresql import JSONB
 
+from agent import tracing
 from agent.storage.db import Base, engine, AsyncSessionLocal
 
 class AlertModel(Base):
@@ -12,19 +13,26 @@ class AlertModel(Base):
     id = Column(String, primary_key=True)
     fingerprint = Column(String, index=True)
     status = Column(String)
-    labels = Column(JSONB)
-    annotations = Column(JSONB)
+    # JSONB en Postgres; JSON en SQLite (database.alerts_db_url)
+    labels = Column(JSONB().with_variant(JSON(), "sqlite"))
+    annotations = Column(JSONB().with_variant(JSON(), "sqlite"))
     received_at = Column(DateTime)
     analysis_report = Column(Text)
     is_duplicate = Column(Integer, default=0)
 
 
+def _db_span(operation: str) -> Dict[str, str]:
+    """Atributos del span de una operación sobre la tabla alerts."""
+    return {"db.system.name": "postgresql", "db.collection.name": "alerts", "db.operation.name": operation}
+
+
 async def init_db() -> None:
     """Crea la tabla si no existe."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
+@tracing.traced("postgres save_alert", _db_span("merge"), client=True)
 async def save_alert(
     alert_id: str,
     fingerprint: str,
@@ -53,6 +61,7 @@ async def save_alert(
             await session.merge(alert)
 
 
+@tracing.traced("postgres get_recent_by_fingerprint", _db_span("select"), client=True)
 async def get_recent_by_fingerprint(fingerprint: str, window_minutes: int) -> List[Dict[str, Any]]:
     """Devuelve alertas recientes con el mismo fingerprint."""
     cutoff = datetime.datetime.utcnow() - datetime.timedelta(minutes=window_minutes)
@@ -66,6 +75,7 @@ async def get_recent_by_fingerprint(fingerprint: str, window_minutes: int) -> Li
         return [_model_to_dict(r) for r in rows]
 
 
+@tracing.traced("postgres get_alert", _db_span("select"), client=True)
 async def get_alert(alert_id: str) -> Optional[Dict[str, Any]]:
     """Obtiene una alerta por ID."""
     async with AsyncSessionLocal() as session:
@@ -74,6 +84,7 @@ async def get_alert(alert_id: str) -> Optional[Dict[str, Any]]:
         return _model_to_dict(row) if row else None
 
 
+@tracing.traced("postgres list_alerts", _db_span("select"), client=True)
 async def list_alerts(limit: int = 50) -> List[Dict[str, Any]]:
     """Lista alertas recientes."""
     async with AsyncSessionLocal() as session:
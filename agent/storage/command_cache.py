@@ -0,0 +1,129 @@
+"""
+Cache de resultados de slash commands (/quick/command).
+
+Se consulta ANTES de ejecutar: la clave es (intención canónica, params
+normalizados, ventana de tiempo), ver `build_command_cache_key`. Además:
+
+- Comandos idénticos concurrentes se coalescen sobre una única ejecución en
+  curso (el resto espera el mismo resultado).
+- Con stale-while-revalidate, si la ventana actual aún no tiene resultado pero
+  la anterior sí, se sirve ese resultado y se recalcula en background.
+
+Redis es el backend compartido entre workers (ventana actual y anterior se leen
+en un solo round-trip); si no responde se usa el LRU local de
+`agent/storage/redis.py`.
+"""
+
+import asyncio
+import copy
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from agent import metrics, tracing
+from agent.config import AdminAgentConfig
+from agent.storage.redis import RedisStore, redis_store
+
+_config = AdminAgentConfig()
+
+_REDIS_PREFIX = "quick_cmd:"
+
+Producer = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class CommandResultCache:
+    """Cache async con coalescing de ejecuciones en curso y stale-while-revalidate."""
+
+    def __init__(self, bucket_seconds: int, max_local_entries: int, enabled: bool = True, store: RedisStore = redis_store):
+        self.bucket_seconds = bucket_seconds
+        self.enabled = enabled
+        # Una ventana actual + la anterior (para stale-while-revalidate)
+        self.ttl_seconds = 2 * bucket_seconds
+        self._store = store.namespace(_REDIS_PREFIX, max_local_entries)
+        self._inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        values = await self._store.mget(keys)
+        return [json.loads(value) if value else None for value in values]
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        await self._store.setex(key, self.ttl_seconds, json.dumps(value, default=str))
+
+    # -- ejecución ---------------------------------------------------------
+
+    async def _execute(self, key: str, producer: Producer) -> Dict[str, Any]:
+        try:
+            result = await producer()
+            await self.set(key, {**result, "cached_at": time.time()})
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def _start(self, key: str, producer: Producer) -> "asyncio.Task[Dict[str, Any]]":
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._execute(key, producer))
+            task.add_done_callback(_log_task_error)
+            self._inflight[key] = task
+        return task
+
+    async def get_or_execute(
+        self,
+        command: str,
+        key: str,
+        producer: Producer,
+        stale_key: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Devuelve el resultado de un comando, ejecutándolo solo si hace falta.
+
+        Args:
+            command: Comando canónico (label de métricas)
+            key: Clave de la ventana actual
+            producer: Corrutina que ejecuta el comando y devuelve el resultado
+            stale_key: Clave de la ventana anterior; si se pasa, se habilita
+                stale-while-revalidate
+
+        Returns:
+            Tupla (resultado, estado) con estado hit | stale | coalesced | miss.
+            En hit/stale el resultado incluye `cached_at` (epoch).
+        """
+        if not self.enabled:
+            return await producer(), "miss"
+
+        # Ventana actual y anterior en un solo round-trip
+        cached, stale = (await self.get_many([key, stale_key] if stale_key else [key]) + [None])[:2]
+        if cached:
+            status = "hit"
+        elif key in self._inflight:
+            status = "coalesced"
+        elif stale:
+            cached = stale
+            # Refrescar en background; el request actual no espera
+            self._start(key, producer)
+            status = "stale"
+        else:
+            status = "miss"
+        metrics.COMMAND_CACHE_REQUESTS.labels(command=command, result=status).inc()
+        # En batch varios comandos comparten el span del request: el evento conserva cada uno
+        tracing.set_attributes({"cache.quick_command": status})
+        tracing.add_event("cache.quick_command", {"command": command, "cache.result": status})
+
+        if cached:
+            return cached, status
+        # shield: si el cliente que disparó la ejecución se desconecta, los demás la siguen esperando
+        result = await asyncio.shield(self._start(key, producer))
+        # Copia: los waiters coalescidos comparten el mismo resultado
+        return copy.deepcopy(result), status
+
+
+def _log_task_error(task: "asyncio.Task[Any]") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Error executing quick command: {task.exception()}")
+
+
+command_cache = CommandResultCache(
+    bucket_seconds=_config.quick_commands_cache_bucket_seconds,
+    max_local_entries=_config.quick_commands_cache_max_entries,
+    enabled=_config.quick_commands_cache_enabled,
+)
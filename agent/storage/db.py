@@ -9,6 +9,8 @@ _config = AdminAgentConfig()
 # postgres_password puede ser vacío
 auth = f"{_config.postgres_user}:{_config.postgres_password}" if _config.postgres_password else _config.postgres_user
 db_url = f"postgresql+asyncpg://{auth}@{_config.postgres_host}:{_config.postgres_port}/{_config.postgres_db}"
+# Override para correr sin Postgres (benchmarks, desarrollo local)
+db_url = _config.alerts_db_url or db_url
 
 engine = create_async_engine(db_url, echo=False)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
@@ -0,0 +1,203 @@
+"""
+Mantenimiento del historial de sesiones de los agentes en `agno.db`.
+
+Los agentes corren con `add_history_to_context=True`, así que cada run
+anterior (incluyendo outputs de tools) vuelve a inyectarse en el prompt y la
+base SQLite crece sin límite. Este módulo:
+
+- Acota los runs guardados por sesión y compacta los más viejos en el
+  resumen de la sesión (que se inyecta vía `add_session_summary_to_context`).
+- Elimina sesiones sin actividad más allá de la retención y ejecuta VACUUM.
+- Mide los tokens de historial inyectados en cada run.
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+
+from agno.db.base import SessionType
+from agno.db.sqlite import AsyncSqliteDb
+from agno.session.summary import SessionSummary
+
+from agent import metrics
+from agent.config import AdminAgentConfig
+from agent.utils.compaction import estimate_tokens
+
+_config = AdminAgentConfig()
+
+_SUMMARY_INPUT_CHARS = 120
+_SUMMARY_OUTPUT_CHARS = 200
+
+
+def _shorten(text: Any, limit: int) -> str:
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else f"{text[:limit]}…"
+
+
+def _run_line(run: Any) -> str:
+    """Resume un run en una línea: fecha, input y comienzo de la respuesta."""
+    run_input = getattr(run, "input", None)
+    if hasattr(run_input, "input_content_string"):
+        input_text = run_input.input_content_string()
+    else:
+        input_text = getattr(run_input, "input_content", run_input)
+    created_at = getattr(run, "created_at", None)
+    when = datetime.fromtimestamp(created_at, timezone.utc).strftime("%Y-%m-%d %H:%M") if created_at else "?"
+    return (
+        f"- {when} UTC · {_shorten(input_text, _SUMMARY_INPUT_CHARS)} "
+        f"→ {_shorten(getattr(run, 'content', ''), _SUMMARY_OUTPUT_CHARS)}"
+    )
+
+
+def compact_runs(
+    runs: List[Any],
+    max_runs: int,
+    previous_summary: Optional[str] = None,
+    max_summary_chars: int = 2000,
+) -> Tuple[List[Any], Optional[str], int]:
+    """
+    Conserva los últimos `max_runs` runs de primer nivel y resume el resto.
+
+    Los runs de miembros (con `parent_run_id`) siguen a su run padre.
+
+    Returns:
+        Tupla (runs_conservados, resumen_nuevo, cantidad_compactada). El resumen
+        es None si no hubo nada que compactar.
+    """
+    top_level = [r for r in runs if not getattr(r, "parent_run_id", None)]
+    if len(top_level) <= max_runs:
+        return runs, None, 0
+
+    keep_ids = {getattr(r, "run_id", None) for r in top_level[len(top_level) - max_runs:]} if max_runs else set()
+    kept = [
+        r for r in runs
+        if getattr(r, "run_id", None) in keep_ids or getattr(r, "parent_run_id", None) in keep_ids
+    ]
+    compacted = [r for r in top_level if getattr(r, "run_id", None) not in keep_ids]
+
+    lines = [previous_summary] if previous_summary else []
+    lines += [_run_line(r) for r in compacted]
+    summary = "\n".join(lines)
+    if len(summary) > max_summary_chars:
+        # Se conserva lo más reciente
+        summary = "…" + summary[len(summary) - max_summary_chars + 1:]
+    return kept, summary, len(compacted)
+
+
+def history_tokens(response: Any) -> int:
+    """Tokens estimados de los mensajes de historial inyectados en un run."""
+    messages = getattr(response, "messages", None) or []
+    history = [m.content for m in messages if getattr(m, "from_history", False) and m.content]
+    return estimate_tokens(history) if history else 0
+
+
+def record_history_tokens(agent_name: str, response: Any) -> None:
+    metrics.AGENT_HISTORY_TOKENS.labels(agent=agent_name).observe(history_tokens(response))
+
+
+class HistoryManager:
+    """Compactación periódica de sesiones + retención y VACUUM de agno.db."""
+
+    def __init__(self, db_file: str, interval_seconds: int):
+        self.db_file = db_file
+        self.interval_seconds = interval_seconds
+        self._db = AsyncSqliteDb(db_file=db_file)
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _compact(session: Any) -> int:
+        """Compacta los runs de `session` en memoria; devuelve la cantidad compactada."""
+        previous = session.summary.summary if session.summary else None
+        kept, summary, count = compact_runs(
+            session.runs or [],
+            _config.history_max_runs_per_session,
+            previous,
+            _config.history_summary_max_chars,
+        )
+        if count:
+            session.runs = kept
+            session.summary = SessionSummary(summary=summary, updated_at=datetime.now(timezone.utc))
+        return count
+
+    async def compact_sessions(self) -> int:
+        """Acota los runs de cada sesión; devuelve la cantidad de runs compactados."""
+        total = 0
+        for session_type in (SessionType.AGENT, SessionType.TEAM):
+            sessions = await self._db.get_sessions(session_type=session_type)
+            for session in sessions or []:
+                updated_at = session.updated_at
+                if not self._compact(session):
+                    continue
+                # Se relee justo antes de escribir: un run agregado desde
+                # get_sessions se perdería con el upsert. Si la sesión cambió
+                # se deja para el próximo ciclo.
+                current = await self._db.get_session(session.session_id, session_type=session_type)
+                if current is None or current.updated_at != updated_at:
+                    continue
+                count = self._compact(current)
+                if count:
+                    await self._db.upsert_session(current)
+                    total += count
+        if total:
+            metrics.AGENT_HISTORY_RUNS_COMPACTED.inc(total)
+        return total
+
+    async def prune_sessions(self) -> int:
+        """Elimina sesiones sin actividad desde hace más de `retention_days`."""
+        cutoff = int(time.time()) - _config.history_retention_days * 86400
+        stale: List[str] = []
+        for session_type in (SessionType.AGENT, SessionType.TEAM):
+            sessions = await self._db.get_sessions(session_type=session_type)
+            stale += [
+                s.session_id for s in sessions or []
+                if (s.updated_at or s.created_at or 0) < cutoff
+            ]
+        if stale:
+            await self._db.delete_sessions(stale)
+        return len(stale)
+
+    def vacuum(self) -> None:
+        """Recupera el espacio liberado y actualiza el gauge de tamaño."""
+        if not os.path.exists(self.db_file):
+            return
+        conn = sqlite3.connect(self.db_file)
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        metrics.AGNO_DB_SIZE_BYTES.set(os.path.getsize(self.db_file))
+
+    async def run_maintenance(self) -> None:
+        try:
+            compacted = await self.compact_sessions()
+            pruned = await self.prune_sessions()
+            await asyncio.to_thread(self.vacuum)
+            if compacted or pruned:
+                print(f"History maintenance: {compacted} runs compacted, {pruned} sessions pruned")
+        except Exception as e:
+            print(f"Error in history maintenance: {e}")
+
+    async def _maintenance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.run_maintenance()
+
+    def start(self) -> None:
+        """Inicia el mantenimiento periódico en el event loop actual."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._maintenance_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+history_manager = HistoryManager(_config.agno_db_path, _config.history_maintenance_interval_seconds)
@@ -1,20 +1,181 @@
-"""Helper functions para queries optimizadas de alertas y métricas."""
+"""Helper functions para queries optimizadas de alertas y métricas.
 
+Dentro de un `data_context_scope()` (un slash command) las lecturas pasan por
+un `DataContext` compartido: `utc_now()` queda fijo para todo el comando, las
+alertas se leen una vez por rango (los rangos ya cubiertos se filtran en
+memoria) y las alertas activas y métricas de Prometheus se memorizan. Sin
+scope activo cada llamada consulta directo.
+
+Para un batch de comandos (`POST /api/quick/commands`) el scope es uno solo y
+un `DataPlan` con la unión de los datasets se precarga antes de ejecutarlos.
+"""
+
+import asyncio
+import json
 import sqlite3
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
+from agent import metrics
 from agent.config import AdminAgentConfig
 from tools import prometheus_tool
 
 _config = AdminAgentConfig()
 
+_ALERT_COLUMNS = """
+    SELECT id, fingerprint, status, labels, annotations, 
+           received_at, analysis_report, is_duplicate
+    FROM alerts
+"""
+
+
+class DataContext:
+    """Datos compartidos por todas las lecturas de un slash command (base + evidencia)."""
+
+    def __init__(self, now: Optional[datetime] = None):
+        self.now = now or datetime.now(timezone.utc)
+        # Los checks de evidencia pueden correr en threads en paralelo; un lock
+        # por dataset para que lecturas independientes no se serialicen
+        self._lock = threading.Lock()
+        self._dataset_locks: Dict[Any, threading.RLock] = {}
+        self._alerts: Dict[Any, Dict[str, Any]] = {}
+        self._coverage: Optional[Tuple[str, str]] = None
+        self._memo: Dict[Any, Any] = {}
+
+    def _dataset_lock(self, key: Any) -> threading.RLock:
+        with self._lock:
+            return self._dataset_locks.setdefault(key, threading.RLock())
+
+    def alerts_in_range(self, start: str, end: str) -> List[Dict[str, Any]]:
+        """Alertas (incluyendo duplicadas) en [start, end]; solo consulta lo no cubierto."""
+        with self._dataset_lock("alerts"):
+            if self._coverage is None:
+                missing = [(start, end)]
+            else:
+                covered_start, covered_end = self._coverage
+                missing = [
+                    (lo, hi) for lo, hi in ((start, covered_start), (covered_end, end)) if lo < hi
+                ]
+            for lo, hi in missing:
+                for alert in _fetch_alerts(lo, hi, include_duplicates=True):
+                    self._alerts[alert["id"]] = alert
+            metrics.DATA_CONTEXT_LOOKUPS.labels(dataset="alerts", result="fetch" if missing else "hit").inc()
+            if missing:
+                bounds = [start, end] + list(self._coverage or ())
+                self._coverage = (min(bounds), max(bounds))
+            return sorted(
+                (a for a in self._alerts.values() if start <= a["received_at"] <= end),
+                key=lambda a: a["received_at"],
+                reverse=True,
+            )
+
+    def memoize(self, dataset: str, key: Any, fetch: Callable[[], Any]) -> Any:
+        with self._dataset_lock((dataset, key)):
+            if (dataset, key) in self._memo:
+                metrics.DATA_CONTEXT_LOOKUPS.labels(dataset=dataset, result="hit").inc()
+                return self._memo[(dataset, key)]
+            metrics.DATA_CONTEXT_LOOKUPS.labels(dataset=dataset, result="fetch").inc()
+            value = self._memo[(dataset, key)] = fetch()
+            return value
+
+
+_data_context: ContextVar[Optional[DataContext]] = ContextVar("query_data_context", default=None)
+
+
+@contextmanager
+def data_context_scope() -> Iterator[DataContext]:
+    """Abre un contexto de datos para un comando; reutiliza el activo si ya hay uno."""
+    current = _data_context.get()
+    if current is not None:
+        yield current
+        return
+    context = DataContext()
+    token = _data_context.set(context)
+    try:
+        yield context
+    finally:
+        _data_context.reset(token)
+
+
+@dataclass
+class DataPlan:
+    """Unión de los datasets que leen varios comandos, para leerlos una sola vez."""
+
+    alert_window: Optional[Tuple[datetime, datetime]] = None
+    active_alerts: bool = False
+    services: Set[str] = field(default_factory=set)
+
+    def add_alert_range(self, start: datetime, end: datetime) -> None:
+        # El contexto cubre un único intervalo: la unión es el rango envolvente
+        if self.alert_window is not None:
+            start, end = min(start, self.alert_window[0]), max(end, self.alert_window[1])
+        self.alert_window = (start, end)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "alert_window": [t.isoformat() for t in self.alert_window] if self.alert_window else None,
+            "active_alerts": self.active_alerts,
+            "service_metrics": sorted(self.services),
+        }
+
+
+async def prefetch(plan: DataPlan) -> None:
+    """Precarga en paralelo los datasets del plan en el contexto de datos activo."""
+    reads = []
+    if plan.alert_window is not None:
+        reads.append(asyncio.to_thread(get_alerts_in_timerange, *plan.alert_window))
+    if plan.active_alerts:
+        reads.append(asyncio.to_thread(get_active_alerts))
+    reads.extend(asyncio.to_thread(get_current_service_metrics, service) for service in sorted(plan.services))
+    # Un error de precarga no aborta el batch: cada comando vuelve a intentar su lectura
+    for result in await asyncio.gather(*reads, return_exceptions=True):
+        if isinstance(result, Exception):
+            print(f"Error prefetching command data: {result}")
+
+
+def utc_now() -> datetime:
+    """Hora actual; fija dentro de un contexto de datos para que los rangos coincidan."""
+    context = _data_context.get()
+    return context.now if context else datetime.now(timezone.utc)
+
 
 def _connect():
     """Conecta a la base de datos SQLite."""
     return sqlite3.connect(_config.agno_db_path, check_same_thread=False)
 
 
+def _fetch_alerts(start: str, end: str, include_duplicates: bool) -> List[Dict[str, Any]]:
+    """Lee alertas con received_at en [start, end] (ISO strings), más nuevas primero."""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        
+        query = _ALERT_COLUMNS + " WHERE received_at >= ? AND received_at <= ?"
+        
+        # Filtro de duplicados
+        if not include_duplicates:
+            query += " AND is_duplicate = 0"
+        query += " ORDER BY received_at DESC"
+        
+        cursor.execute(query, [start, end])
+        return _rows_to_alerts(cursor)
+
+
+def _rows_to_alerts(cursor) -> List[Dict[str, Any]]:
+    columns = [desc[0] for desc in cursor.description]
+    alerts = []
+    for row in cursor.fetchall():
+        alert = dict(zip(columns, row))
+        # Parsear JSON de labels y annotations
+        alert["labels"] = json.loads(alert["labels"]) if alert["labels"] else {}
+        alert["annotations"] = json.loads(alert["annotations"]) if alert["annotations"] else {}
+        alerts.append(alert)
+    return alerts
+
+
 def get_alerts_in_timerange(
     start_time: datetime,
     end_time: datetime,
@@ -35,48 +196,30 @@ def get_alerts_in_timerange(
     Returns:
         Lista de alertas en el rango especificado
     """
+    context = _data_context.get()
+    if context is not None:
+        alerts = context.alerts_in_range(start_time.isoformat(), end_time.isoformat())
+    else:
+        alerts = _fetch_alerts(start_time.isoformat(), end_time.isoformat(), include_duplicates)
+    
+    # Filtros post-query (porque labels está en JSON)
+    return [
+        alert for alert in alerts
+        if (include_duplicates or not alert["is_duplicate"])
+        and not (severity and alert["labels"].get("severity", "").lower() != severity.lower())
+        and not (service and alert["labels"].get("service") != service)
+    ]
+
+
+def _fetch_active_alerts() -> List[Dict[str, Any]]:
     with _connect() as conn:
         cursor = conn.cursor()
-        
-        # Base query
-        query = """
-            SELECT id, fingerprint, status, labels, annotations, 
-                   received_at, analysis_report, is_duplicate
-            FROM alerts
-            WHERE received_at >= ? AND received_at <= ?
-        """
-        params = [start_time.isoformat(), end_time.isoformat()]
-        
-        # Filtro de duplicados
-        if not include_duplicates:
-            query += " AND is_duplicate = 0"
-        
-        # Filtros adicionales por labels (severity y service)
-        # Nota: labels está en JSON, necesitamos parsearlo
-        query += " ORDER BY received_at DESC"
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        
-        alerts = []
-        for row in rows:
-            alert = dict(zip(columns, row))
-            
-            # Parsear JSON de labels y annotations
-            import json
-            alert["labels"] = json.loads(alert["labels"]) if alert["labels"] else {}
-            alert["annotations"] = json.loads(alert["annotations"]) if alert["annotations"] else {}
-            
-            # Filtros post-query (porque labels está en JSON)
-            if severity and alert["labels"].get("severity", "").lower() != severity.lower():
-                continue
-            if service and alert["labels"].get("service") != service:
-                continue
-                
-            alerts.append(alert)
-        
-        return alerts
+        cursor.execute(_ALERT_COLUMNS + """
+            WHERE status = 'firing'
+            AND is_duplicate = 0
+            ORDER BY received_at DESC
+        """)
+        return _rows_to_alerts(cursor)
 
 
 def get_active_alerts() -> List[Dict[str, Any]]:
@@ -86,31 +229,17 @@ def get_active_alerts() -> List[Dict[str, Any]]:
     Returns:
         Lista de alertas activas
     """
-    with _connect() as conn:
-        cursor = conn.cursor()
-        
-        query = """
-            SELECT id, fingerprint, status, labels, annotations, 
-                   received_at, analysis_report, is_duplicate
-            FROM alerts
-            WHERE status = 'firing'
-            AND is_duplicate = 0
-            ORDER BY received_at DESC
-        """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        
-        alerts = []
-        import json
-        for row in rows:
-            alert = dict(zip(columns, row))
-            alert["labels"] = json.loads(alert["labels"]) if alert["labels"] else {}
-            alert["annotations"] = json.loads(alert["annotations"]) if alert["annotations"] else {}
-            alerts.append(alert)
-        
-        return alerts
+    context = _data_context.get()
+    if context is not None:
+        return context.memoize("active_alerts", None, _fetch_active_alerts)
+    return _fetch_active_alerts()
+
+
+def _service_health() -> List[Dict[str, Any]]:
+    context = _data_context.get()
+    if context is not None:
+        return context.memoize("service_health", None, prometheus_tool.get_service_health)
+    return prometheus_tool.get_service_health()
 
 
 def get_current_service_metrics(service: str) -> Dict[str, Any]:
@@ -123,6 +252,13 @@ def get_current_service_metrics(service: str) -> Dict[str, Any]:
     Returns:
         Diccionario con métricas actuales (error_rate, latency_p95, etc.)
     """
+    context = _data_context.get()
+    if context is not None:
+        return context.memoize("service_metrics", service, lambda: _fetch_service_metrics(service))
+    return _fetch_service_metrics(service)
+
+
+def _fetch_service_metrics(service: str) -> Dict[str, Any]:
     try:
         # Error rate
         error_rate = prometheus_tool.get_http_error_rate(service)
@@ -131,7 +267,7 @@ def get_current_service_metrics(service: str) -> Dict[str, Any]:
         latency_p95 = prometheus_tool.get_http_latency_p95(service)
         
         # Service health (up/down)
-        health = prometheus_tool.get_service_health()
+        health = _service_health()
         service_health = next((h for h in health if h.get("service") == service), None)
         
         return {
@@ -139,13 +275,13 @@ def get_current_service_metrics(service: str) -> Dict[str, Any]:
             "error_rate": error_rate,
             "latency_p95": latency_p95,
             "health": service_health,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_now().isoformat(),
         }
     except Exception as e:
         return {
             "service": service,
             "error": str(e),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_now().isoformat(),
         }
 
 
@@ -215,7 +351,7 @@ def get_alerts_summary_by_severity(hours: int = 24) -> Dict[str, int]:
     Returns:
         Diccionario con conteo por severidad
     """
-    end_time = datetime.now(timezone.utc)
+    end_time = utc_now()
     start_time = end_time - timedelta(hours=hours)
     
     alerts = get_alerts_in_timerange(start_time, end_time)
@@ -242,7 +378,7 @@ def get_alerts_summary_by_service(hours: int = 24) -> Dict[str, int]:
     Returns:
         Diccionario con conteo por servicio
     """
-    end_time = datetime.now(timezone.utc)
+    end_time = utc_now()
     start_time = end_time - timedelta(hours=hours)
     
     alerts = get_alerts_in_timerange(start_time, end_time)
@@ -1,18 +1,179 @@
-from redis import Redis
+"""
+Acceso compartido a Redis (dedupe, cache de slash commands y de reportes).
+
+Cliente async (`redis.asyncio`) con pool de conexiones y timeouts, para no
+bloquear el event loop. Las operaciones multi-key se encolan en un único
+pipeline (un round-trip). Si Redis no responde, cada namespace degrada a un
+LRU en memoria del proceso y Redis no se reintenta hasta pasados
+`database.redis_retry_seconds`. La latencia de cada round-trip se expone en
+/metrics. Con `database.redis_url` vacío se usa solo el LRU local.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+
+from agent import metrics, tracing
 from agent.config import AdminAgentConfig
 
 _config = AdminAgentConfig()
 
-# Redis Synchoronous (simplest for slash commands if generic, but usually async is better for FastAPI)
-# However, Redis-py has sync client by default.
-# slash_commands.py functions seem to be referenced via QuickCommands API?
-# QuickCommands API calls `run_slash_command` which might be async.
 
-# Let's provide both or standard Sync for now if acceptable, or Sync for simplicity in tools.
-# But `agent/slash_commands.py` calls are used in `api/quick_commands_api.py`.
-# Let's use standard Redis client.
+class LocalLRU(OrderedDict):
+    """Fallback en memoria: key → (expira_en, valor), acotado a `max_entries`."""
+
+    def __init__(self, max_entries: int):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def get_value(self, key: str) -> Optional[str]:
+        entry = self.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self[key]
+            return None
+        self.move_to_end(key)
+        return value
+
+    def set_value(self, key: str, value: str, ttl_seconds: int) -> None:
+        self[key] = (time.time() + ttl_seconds, value)
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+
+class RedisStore:
+    """Cliente async con pool; `execute` corre un pipeline y devuelve None si Redis no está disponible."""
+
+    def __init__(self, url: str, max_connections: int, timeout_seconds: float, retry_seconds: float):
+        self.url = url
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self.retry_seconds = retry_seconds
+        self._client: Optional[Redis] = None
+        self._unavailable_until = 0.0
+
+    @property
+    def client(self) -> Redis:
+        if self._client is None:
+            pool = ConnectionPool.from_url(
+                self.url,
+                max_connections=self.max_connections,
+                socket_timeout=self.timeout_seconds,
+                socket_connect_timeout=self.timeout_seconds,
+                decode_responses=True,
+            )
+            self._client = Redis(connection_pool=pool)
+        return self._client
+
+    @property
+    def available(self) -> bool:
+        return bool(self.url) and time.monotonic() >= self._unavailable_until
+
+    async def execute(self, op: str, build: Callable[[Pipeline], Any]) -> Optional[List[Any]]:
+        """
+        Ejecuta en un único round-trip los comandos que `build` encola en el pipeline.
+
+        Args:
+            op: Nombre de la operación (label de métricas)
+            build: Función que recibe el pipeline y encola los comandos
+
+        Returns:
+            Resultados en orden de los comandos, o None si Redis no está disponible
+        """
+        if not self.available:
+            metrics.REDIS_FALLBACKS.labels(op=op).inc()
+            tracing.add_event("redis.fallback", {"redis.op": op})
+            return None
+        start = time.perf_counter()
+        with tracing.span(f"redis {op}", {"db.system.name": "redis", "db.operation.name": op}, client=True) as current:
+            try:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    build(pipe)
+                    current.set_attribute("db.operation.batch.size", len(pipe.command_stack))
+                    result = await asyncio.wait_for(pipe.execute(), timeout=self.timeout_seconds)
+            except Exception as e:
+                metrics.REDIS_COMMAND_SECONDS.labels(op=op, outcome="error").observe(time.perf_counter() - start)
+                metrics.REDIS_FALLBACKS.labels(op=op).inc()
+                current.set_attribute("redis.fallback", True)
+                tracing.set_error(str(e), current)
+                self._unavailable_until = time.monotonic() + self.retry_seconds
+                print(f"Redis unavailable ({op}: {e}); using local cache for {self.retry_seconds}s")
+                return None
+        metrics.REDIS_COMMAND_SECONDS.labels(op=op, outcome="ok").observe(time.perf_counter() - start)
+        return result
+
+    def namespace(self, prefix: str, max_local_entries: int) -> "RedisNamespace":
+        return RedisNamespace(self, prefix, max_local_entries)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class RedisNamespace:
+    """Keys con prefijo sobre un `RedisStore`, con write-through a un LRU local de fallback."""
+
+    def __init__(self, store: RedisStore, prefix: str, max_local_entries: int):
+        self.store = store
+        self.prefix = prefix
+        self.local = LocalLRU(max_local_entries)
+
+    def key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        return (await self.mget([key]))[0]
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[str]]:
+        result = await self.store.execute("mget", lambda pipe: pipe.mget([self.key(k) for k in keys]))
+        if result is None:
+            return [self.local.get_value(k) for k in keys]
+        return result[0]
+
+    async def setex(self, key: str, ttl_seconds: int, value: str) -> None:
+        await self.set_many({key: value}, ttl_seconds)
+
+    async def set_many(self, items: Dict[str, str], ttl_seconds: int) -> None:
+        def build(pipe: Pipeline) -> None:
+            for key, value in items.items():
+                pipe.setex(self.key(key), ttl_seconds, value)
+
+        for key, value in items.items():
+            self.local.set_value(key, value, ttl_seconds)
+        await self.store.execute("setex", build)
+
+    async def set_if_absent(self, key: str, value: str, ttl_seconds: int) -> Tuple[bool, Optional[str]]:
+        """
+        SET NX + GET en un round-trip.
+
+        Returns:
+            (True, None) si se guardó `value`; (False, valor_existente) si la key ya existía
+        """
+        result = await self.store.execute(
+            "set_nx",
+            lambda pipe: (pipe.set(self.key(key), value, nx=True, ex=ttl_seconds), pipe.get(self.key(key))),
+        )
+        if result is None:
+            existing = self.local.get_value(key)
+        else:
+            existing = None if result[0] else result[1]
+        if existing is not None:
+            return (False, existing)
+        self.local.set_value(key, value, ttl_seconds)
+        return (True, None)
 
-redis_client = Redis.from_url(_config.redis_url, decode_responses=True)
 
-def get_redis():
-    return redis_client
+redis_store = RedisStore(
+    url=_config.redis_url,
+    max_connections=_config.redis_max_connections,
+    timeout_seconds=_config.redis_timeout_seconds,
+    retry_seconds=_config.redis_retry_seconds,
+)
@@ -0,0 +1,177 @@
+"""
+Cache de reportes generados por el ReportAgent.
+
+La clave es un hash estable de la alerta normalizada (sin campos volátiles
+como timestamps), el resumen del watchdog, el triage y la versión de
+modelo/prompt. Webhooks re-entregados o reportes regenerados con los mismos
+inputs reutilizan el markdown almacenado en vez de pagar otra generación.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from agent import metrics, tracing
+from agent.config import AdminAgentConfig
+from agent.storage.redis import redis_store
+
+_config = AdminAgentConfig()
+
+# Campos que cambian entre re-entregas de la misma alerta y no afectan el análisis
+_VOLATILE_FIELDS = {"startsAt", "endsAt", "starts_at", "ends_at", "timestamp", "received_at"}
+
+_REDIS_PREFIX = "report_cache:"
+_REDIS_INDEX_KEY = "report_cache:index"
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in _VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def build_cache_key(alert: Dict[str, Any], triage: Any, model: str, prompt_version: str) -> str:
+    """
+    Calcula la clave de cache para un reporte.
+
+    Args:
+        alert: Alerta normalizada (incluyendo resumen del watchdog)
+        triage: Resultado del triage (texto o estructura)
+        model: ID del modelo que genera el reporte
+        prompt_version: Versión de las instrucciones/ejemplos del ReportAgent
+    """
+    payload = {
+        "alert": _strip_volatile(alert),
+        "triage": triage,
+        "model": model,
+        "prompt_version": prompt_version,
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _RedisBackend:
+    """Entradas con TTL en Redis + índice ordenado por fecha para acotar tamaño."""
+
+    def __init__(self):
+        self._store = redis_store.namespace(_REDIS_PREFIX, _config.report_cache_max_entries)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._store.get(key)
+
+    async def set(self, key: str, value: str) -> None:
+        ttl = _config.report_cache_ttl_seconds
+        max_entries = _config.report_cache_max_entries
+        self._store.local.set_value(key, value, ttl)
+        # Escritura + índice + entradas que exceden el máximo en un round-trip
+        result = await redis_store.execute(
+            "report_cache_set",
+            lambda pipe: (
+                pipe.setex(self._store.key(key), ttl, value),
+                pipe.zadd(_REDIS_INDEX_KEY, {key: time.time()}),
+                pipe.zrange(_REDIS_INDEX_KEY, 0, -(max_entries + 1)),
+            ),
+        )
+        evicted = result[2] if result else []
+        if evicted:
+            await redis_store.execute(
+                "report_cache_evict",
+                lambda pipe: (
+                    pipe.delete(*[self._store.key(k) for k in evicted]),
+                    pipe.zrem(_REDIS_INDEX_KEY, *evicted),
+                ),
+            )
+
+
+class _DiskBackend:
+    """Un archivo markdown por entrada; TTL por mtime y eviction por antigüedad."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.md")
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._write, key, value)
+
+    def _read(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > _config.report_cache_ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, value: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, self._path(key))
+        self._evict(keep=self._path(key))
+
+    def _evict(self, keep: str) -> None:
+        entries = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".md")
+        ]
+        overflow = len(entries) - _config.report_cache_max_entries
+        entries = [path for path in entries if path != keep]
+        if overflow > 0:
+            for path in sorted(entries, key=os.path.getmtime)[:overflow]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+class ReportCache:
+    """Fachada async; los errores del backend se tratan como miss (nunca rompen el pipeline)."""
+
+    def __init__(self, backend_name: str):
+        if backend_name == "redis":
+            self._backend = _RedisBackend()
+        elif backend_name == "disk":
+            self._backend = _DiskBackend(_config.report_cache_dir)
+        else:
+            self._backend = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._backend is not None
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self._backend:
+            return None
+        try:
+            value = await self._backend.get(key)
+        except Exception as e:
+            print(f"Error reading report cache: {e}")
+            value = None
+        metrics.REPORT_CACHE_REQUESTS.labels(result="hit" if value else "miss").inc()
+        tracing.set_attributes({"cache.report": "hit" if value else "miss"})
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        if not self._backend or not value:
+            return
+        try:
+            await self._backend.set(key, value)
+        except Exception as e:
+            print(f"Error writing report cache: {e}")
+
+
+report_cache = ReportCache(_config.report_cache_backend)
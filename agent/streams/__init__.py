@@ -0,0 +1,3 @@
+"""Suscripciones en vivo compartidas entre clientes (push vía SSE)."""
+
+
@@ -0,0 +1,214 @@
+"""
+Watch de salud de servicios multiplexado entre suscriptores.
+
+Mantiene UNA evaluación periódica de `/salud` por (servicios, include_metrics)
+sin importar cuántos clientes estén mirando. Al suscribirse el cliente recibe
+el último snapshot completo; después solo se empujan los servicios cuyo
+estado cambió o cuyo error rate / latencia P95 cruzó el threshold desde el
+tick anterior.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from agent.config import AdminAgentConfig
+from agent.models.quick_results import HealthResult, ServiceHealth
+from agent.storage import query_helpers
+
+_config = AdminAgentConfig()
+
+# Eventos pendientes por suscriptor; si un cliente es lento se vacía su cola y se le
+# reenvía el snapshot completo (perder un diff lo dejaría desincronizado)
+_SUBSCRIBER_QUEUE_SIZE = 50
+
+WatchKey = Tuple[Tuple[str, ...], bool]
+
+
+def _above(value: Optional[float], threshold: float) -> bool:
+    return value is not None and value > threshold
+
+
+def _service_changes(previous: ServiceHealth, current: ServiceHealth, result: HealthResult) -> List[str]:
+    """Campos de un servicio que cambiaron de estado o cruzaron su threshold."""
+    changed = []
+    if previous.status != current.status:
+        changed.append("status")
+    prev_metrics, cur_metrics = previous.metrics, current.metrics
+    if prev_metrics is not None and cur_metrics is not None:
+        if _above(prev_metrics.error_rate, result.error_rate_threshold) != _above(cur_metrics.error_rate, result.error_rate_threshold):
+            changed.append("error_rate")
+        if _above(prev_metrics.latency_p95, result.latency_threshold_ms) != _above(cur_metrics.latency_p95, result.latency_threshold_ms):
+            changed.append("latency_p95")
+    return changed
+
+
+def health_changes(previous: HealthResult, current: HealthResult) -> Optional[Dict[str, Any]]:
+    """
+    Diferencias entre dos evaluaciones de salud.
+
+    Returns:
+        Evento `changes` con el estado general y solo los servicios que
+        cambiaron (`changed`: status | error_rate | latency_p95 | added |
+        removed), o None si no hay nada que empujar.
+    """
+    before = {service.service: service for service in previous.services}
+    services: List[Dict[str, Any]] = []
+    for service in current.services:
+        prev = before.pop(service.service, None)
+        changed = ["added"] if prev is None else _service_changes(prev, service, current)
+        if changed:
+            services.append({**service.model_dump(mode="json"), "changed": changed})
+    services.extend({"service": name, "changed": ["removed"]} for name in before)
+
+    if not services and previous.overall_status == current.overall_status:
+        return None
+    return {
+        "type": "changes",
+        "timestamp": current.timestamp.isoformat(),
+        "overall_status": current.overall_status,
+        "previous_overall_status": previous.overall_status,
+        "active_alerts": current.active_alerts,
+        "critical": current.critical,
+        "major": current.major,
+        "services": services,
+    }
+
+
+def _snapshot_event(result: HealthResult) -> Dict[str, Any]:
+    return {"type": "snapshot", **result.model_dump(mode="json")}
+
+
+class _WatchChannel:
+    """Una evaluación periódica de salud compartida por todos los suscriptores de la misma key."""
+
+    def __init__(self, services: Tuple[str, ...], include_metrics: bool, interval_seconds: float):
+        self.services = services
+        self.include_metrics = include_metrics
+        self.interval_seconds = interval_seconds
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.last: Optional[HealthResult] = None
+        self.ticks = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _publish(self, event: Dict[str, Any], queues: Optional[Set[asyncio.Queue]] = None) -> None:
+        for queue in queues or self.subscribers:
+            if queue.full():
+                # Cliente lento: resync con el estado actual en vez de perder eventos
+                while not queue.empty():
+                    queue.get_nowait()
+                if self.last is not None:
+                    queue.put_nowait(_snapshot_event(self.last))
+                    if event["type"] != "error":
+                        continue
+            queue.put_nowait(event)
+
+    def add(self, queue: asyncio.Queue) -> None:
+        self.subscribers.add(queue)
+        if self.last is not None:
+            # Los suscriptores nuevos arrancan del último snapshot, sin evaluar de nuevo
+            self._publish(_snapshot_event(self.last), {queue})
+
+    async def evaluate(self) -> HealthResult:
+        from agent.tools import quick_commands
+
+        with query_helpers.data_context_scope():
+            return await asyncio.to_thread(
+                quick_commands._build_service_health_summary,
+                services=list(self.services) or None,
+                include_metrics=self.include_metrics,
+                analyze_with_ai=False,
+            )
+
+    async def tick(self) -> None:
+        try:
+            current = await self.evaluate()
+        except Exception as exc:
+            self._publish({
+                "type": "error",
+                "message": f"Error evaluando salud: {exc}",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            })
+            return
+        self.ticks += 1
+        previous, self.last = self.last, current
+        # `last` ya es el estado actual: un resync por cola llena lo incluye
+        if previous is None:
+            self._publish(_snapshot_event(current))
+        else:
+            event = health_changes(previous, current)
+            if event is not None:
+                self._publish(event)
+
+    async def _run(self) -> None:
+        while True:
+            await self.tick()
+            await asyncio.sleep(self.interval_seconds)
+
+
+class HealthWatchHub:
+    """Registro de watches de salud; crea y cierra evaluaciones según haya suscriptores."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._channels: Dict[WatchKey, _WatchChannel] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def key(services: Optional[List[str]], include_metrics: bool) -> WatchKey:
+        """Key del canal: mismos servicios (en cualquier orden) comparten evaluación."""
+        return tuple(sorted(set(services or []))), include_metrics
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        services: Optional[List[str]] = None,
+        include_metrics: bool = True,
+    ) -> AsyncIterator[asyncio.Queue]:
+        """
+        Suscribe a un watch y devuelve la cola de eventos.
+
+        Eventos: {"type": "snapshot"|"changes"|"error", ...}
+        """
+        key = self.key(services, include_metrics)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+        async with self._lock:
+            channel = self._channels.get(key)
+            if channel is None:
+                channel = _WatchChannel(key[0], include_metrics, self.interval_seconds)
+                self._channels[key] = channel
+                channel.start()
+            channel.add(queue)
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                channel.subscribers.discard(queue)
+                if not channel.subscribers and self._channels.get(key) is channel:
+                    del self._channels[key]
+                    await channel.stop()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Suscriptores y evaluaciones por watch activo."""
+        return {
+            f"{','.join(services) or '*'}:{'metrics' if include_metrics else 'alerts'}": {
+                "subscribers": len(channel.subscribers),
+                "ticks": channel.ticks,
+            }
+            for (services, include_metrics), channel in self._channels.items()
+        }
+
+
+health_watch_hub = HealthWatchHub(interval_seconds=_config.health_watch_interval_seconds)
@@ -0,0 +1,173 @@
+"""
+Tail de logs de Loki multiplexado entre suscriptores.
+
+Mantiene UN solo websocket upstream por (service, level) sin importar cuántos
+clientes estén mirando. Cada canal aplica rate limiting (token bucket) a las
+líneas reenviadas y agrega todas las líneas en patrones normalizados que se
+emiten periódicamente como resumen.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Set, Tuple
+
+from agent.config import AdminAgentConfig
+from agent.utils.log_patterns import log_pattern
+from tools import loki_tool
+
+_config = AdminAgentConfig()
+
+# Eventos pendientes por suscriptor; si un cliente es lento se descartan los más viejos
+_SUBSCRIBER_QUEUE_SIZE = 500
+# Máximo de patrones distintos por ventana de resumen
+_MAX_PATTERNS = 200
+_MAX_RECONNECT_BACKOFF_SECONDS = 30
+
+
+class _TailChannel:
+    """Un upstream tail compartido por todos los suscriptores de (service, level)."""
+
+    def __init__(self, service: str, level: str):
+        self.service = service
+        self.level = level
+        self.query = loki_tool.build_tail_query(service, level)
+        self.subscribers: Set[asyncio.Queue] = set()
+        self._task: asyncio.Task | None = None
+        self._rate = _config.tail_max_lines_per_second
+        self._tokens = self._rate
+        self._last_refill = time.monotonic()
+        self._patterns: Dict[str, Dict[str, Any]] = {}
+        self._lines_in_window = 0
+        self._suppressed_in_window = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        for queue in self.subscribers:
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(event)
+
+    def _allow_line(self) -> bool:
+        """Token bucket: como máximo `rate` líneas/s reenviadas (con ráfaga de 1s)."""
+        now = time.monotonic()
+        self._tokens = min(self._rate, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def _aggregate(self, line: str) -> None:
+        pattern = log_pattern(line)
+        entry = self._patterns.get(pattern)
+        if entry is None:
+            if len(self._patterns) >= _MAX_PATTERNS:
+                pattern = "<otros>"
+                entry = self._patterns.setdefault(pattern, {"count": 0, "sample": line[:300]})
+            else:
+                entry = self._patterns[pattern] = {"count": 0, "sample": line[:300]}
+        entry["count"] += 1
+
+    def _handle_entry(self, entry: Dict[str, Any]) -> None:
+        if "dropped" in entry:
+            self._suppressed_in_window += entry["dropped"]
+            return
+        self._lines_in_window += 1
+        self._aggregate(entry["line"])
+        if self._allow_line():
+            self._publish({"type": "line", **entry})
+        else:
+            self._suppressed_in_window += 1
+
+    def _flush_summary(self) -> None:
+        if not self._lines_in_window and not self._suppressed_in_window:
+            return
+        top = sorted(self._patterns.items(), key=lambda kv: kv[1]["count"], reverse=True)[:20]
+        self._publish({
+            "type": "summary",
+            "service": self.service,
+            "level": self.level,
+            "window_seconds": _config.tail_summary_interval_seconds,
+            "lines": self._lines_in_window,
+            "suppressed": self._suppressed_in_window,
+            "patterns": [{"pattern": p, **info} for p, info in top],
+        })
+        self._patterns = {}
+        self._lines_in_window = 0
+        self._suppressed_in_window = 0
+
+    async def _consume(self) -> None:
+        backoff = 1
+        while True:
+            try:
+                async for entry in loki_tool.tail_logs(self.query):
+                    backoff = 1
+                    self._handle_entry(entry)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._publish({"type": "error", "message": f"Loki tail desconectado: {exc}", "retry_in": backoff})
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, _MAX_RECONNECT_BACKOFF_SECONDS)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(_config.tail_summary_interval_seconds)
+            self._flush_summary()
+
+    async def _run(self) -> None:
+        await asyncio.gather(self._consume(), self._flush_loop())
+
+
+class LogTailHub:
+    """Registro de canales de tail; crea y cierra upstreams según haya suscriptores."""
+
+    def __init__(self):
+        self._channels: Dict[Tuple[str, str], _TailChannel] = {}
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, service: str, level: str = "error") -> AsyncIterator[asyncio.Queue]:
+        """
+        Suscribe a un canal (service, level) y devuelve la cola de eventos.
+
+        Eventos: {"type": "line"|"summary"|"error", ...}
+        """
+        key = (service, level)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+        async with self._lock:
+            channel = self._channels.get(key)
+            if channel is None:
+                channel = _TailChannel(service, level)
+                self._channels[key] = channel
+                channel.start()
+            channel.subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                channel.subscribers.discard(queue)
+                if not channel.subscribers and self._channels.get(key) is channel:
+                    del self._channels[key]
+                    await channel.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Suscriptores por canal activo."""
+        return {f"{svc}:{lvl}": len(ch.subscribers) for (svc, lvl), ch in self._channels.items()}
+
+
+log_tail_hub = LogTailHub()
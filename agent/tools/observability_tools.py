@@ -5,15 +5,33 @@ from typing import Any, Dict, List, Optional
 
 from agno.tools import tool
 
+from agent import tracing
 from agent.config import AdminAgentConfig
-from tools import loki_tool, prometheus_tool, tempo_tool
+from agent.service_registry import service_registry
+from agent.utils.compaction import compact_output
+from agent.utils.run_memo import memoized
+from tools import loki_tool, prometheus_tool, tempo_tool, trace_analysis
 
 _config = AdminAgentConfig()
 
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), reraise=True)
+def _record_retry(retry_state) -> None:
+    """Reintento de tenacity: queda en el span del tool call actual."""
+    tracing.set_attributes({"retry.count": retry_state.attempt_number})
+    tracing.add_event("retry", {
+        "retry.attempt": retry_state.attempt_number,
+        "exception": str(retry_state.outcome.exception()),
+    })
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    before_sleep=_record_retry,
+    reraise=True,
+)
 def _execute_with_retry(func, *args, **kwargs):
     return func(*args, **kwargs)
 
@@ -21,19 +39,26 @@ def _execute_with_retry(func, *args, **kwargs):
 def _safe_call(func, *args, **kwargs) -> Dict[str, Any]:
     try:
         data = _execute_with_retry(func, *args, **kwargs)
-        return {"data": data}
     except Exception as exc:
         # En caso de fallo tras retries, devolvemos el error
         return {"error": f"Failed after retries: {str(exc)}"}
+    # Compactar al presupuesto de tokens antes de devolver al modelo
+    data, compaction = compact_output(func.__name__.lstrip("_"), data)
+    result = {"data": data}
+    if compaction:
+        result["compaction"] = compaction
+    return result
 
 
 @tool
+@memoized
 def query_prometheus_metrics(query: str) -> Dict[str, Any]:
     """Ejecuta un query instantáneo a Prometheus."""
     return _safe_call(prometheus_tool.query_instant, query)
 
 
 @tool
+@memoized
 def query_prometheus_range(query: str, minutes: int = 15, step: str = "30s") -> Dict[str, Any]:
     """Ejecuta un query de rango tomando ventana relativa en minutos."""
     end = datetime.datetime.utcnow()
@@ -42,6 +67,7 @@ def query_prometheus_range(query: str, minutes: int = 15, step: str = "30s") ->
 
 
 @tool
+@memoized
 def get_service_health() -> Dict[str, Any]:
     """Estado up/down de servicios registrados."""
     return _safe_call(prometheus_tool.get_service_health)
@@ -49,23 +75,26 @@ def get_service_health() -> Dict[str, Any]:
 
 @tool
 def get_monitored_services() -> Dict[str, Any]:
-    """Descubre dinámicamente la lista de servicios monitoreados."""
-    return _safe_call(prometheus_tool.get_monitored_services)
+    """Lista de servicios monitoreados (registro en memoria, refrescado en background)."""
+    return {"data": service_registry.get_services()}
 
 
 @tool
+@memoized
 def get_http_error_rate(service: str) -> Dict[str, Any]:
     """Tasa de errores 5xx en 5m para un servicio."""
     return _safe_call(prometheus_tool.get_http_error_rate, service)
 
 
 @tool
+@memoized
 def get_http_latency_p95(service: str) -> Dict[str, Any]:
     """Latencia P95 en 5m para un servicio."""
     return _safe_call(prometheus_tool.get_http_latency_p95, service)
 
 
 @tool
+@memoized
 def query_loki_logs(service: str, keyword: str | None = None, since: str = "15m") -> Dict[str, Any]:
     """Busca logs de un servicio; opcionalmente filtra por keyword."""
     if keyword:
@@ -74,20 +103,49 @@ def query_loki_logs(service: str, keyword: str | None = None, since: str = "15m"
 
 
 @tool
+@memoized
 def query_loki_by_trace(trace_id: str) -> Dict[str, Any]:
     """Devuelve logs asociados a un trace_id."""
     return _safe_call(loki_tool.get_trace_logs, trace_id)
 
 
 @tool
+@memoized
 def query_tempo_traces(service: str, min_duration_ms: int = 500, limit: int = 20) -> Dict[str, Any]:
     """Busca traces lentos o con errores para un servicio."""
     return _safe_call(tempo_tool.get_slow_traces, service, min_duration_ms, limit)
 
 
+def _get_trace_summary(trace_id: str) -> Dict[str, Any]:
+    return trace_analysis.summarize_trace(tempo_tool.get_trace(trace_id), trace_id)
+
+
+def _get_traces_summary(trace_ids: List[str]) -> Dict[str, Any]:
+    result = tempo_tool.get_traces(trace_ids)
+    result["traces"] = {
+        tid: trace_analysis.summarize_trace(trace, tid) for tid, trace in result["traces"].items()
+    }
+    return result
+
+
 @tool
-def get_tempo_trace(trace_id: str) -> Dict[str, Any]:
-    """Obtiene un trace completo por ID."""
-    return _safe_call(tempo_tool.get_trace, trace_id)
+@memoized
+def get_tempo_trace(trace_id: str, raw: bool = False) -> Dict[str, Any]:
+    """
+    Obtiene un trace por ID.
+
+    Por default devuelve un resumen (critical path, self-time, errores, N+1);
+    usá raw=True solo si necesitás el JSON OTLP completo.
+    """
+    if raw:
+        return _safe_call(tempo_tool.get_trace, trace_id)
+    return _safe_call(_get_trace_summary, trace_id)
 
 
+@tool
+@memoized
+def get_tempo_traces(trace_ids: List[str], raw: bool = False) -> Dict[str, Any]:
+    """Obtiene varios traces por ID en una sola llamada (fetch concurrente, resumidos por default)."""
+    if raw:
+        return _safe_call(tempo_tool.get_traces, trace_ids)
+    return _safe_call(_get_traces_summary, trace_ids)
@@ -0,0 +1,331 @@
+"""
+Renderizado de los resultados de quick commands (agent/models/quick_results.py).
+
+- `markdown`: reporte completo (chat web, tools del QueryAgent, digest guardado)
+- `json`: el resultado tipado serializado, para clientes de la API
+- `chat`: texto compacto de pocas líneas para bots de chatops
+"""
+
+from typing import Any, Dict, List, Literal, Union
+
+from agent.models.quick_results import (
+    DailyDigestResult,
+    HealthResult,
+    PostDeploymentResult,
+    QuickCommandError,
+    QuickResult,
+    RecentIncidentsResult,
+    TrendsResult,
+)
+
+OutputFormat = Literal["markdown", "json", "chat"]
+
+_STATUS_ICONS = {"CRITICAL": "🔴", "DEGRADED": "🟡", "WARNING": "🟠", "HEALTHY": "🟢"}
+
+_VERDICTS = {
+    "success": "✅ **DEPLOYMENT EXITOSO** - No se detectaron anomalías en la ventana de monitoreo.",
+    "rollback": "🔴 **ROLLBACK RECOMENDADO** - Se detectaron alertas críticas post-deploy.",
+    "intensive": "⚠️ **MONITOREO INTENSIVO** - Aumento significativo de alertas. Considerar rollback si persiste.",
+    "continuous": "🟡 **MONITOREO CONTINUO** - Alertas detectadas. Mantener observación.",
+}
+
+
+def render(result: QuickResult, output_format: OutputFormat = "markdown") -> Union[str, Dict[str, Any]]:
+    """Renderiza un resultado en el formato pedido (`json` devuelve un dict)."""
+    if output_format == "json":
+        return result.model_dump(mode="json")
+    if output_format == "chat":
+        return render_chat(result)
+    return render_markdown(result)
+
+
+def _ai_note(note: str) -> str:
+    return f"\n---\n\n_Nota: {note}_\n"
+
+
+# ============================================================================
+# MARKDOWN
+# ============================================================================
+
+def _recent_incidents_markdown(result: RecentIncidentsResult) -> str:
+    report = f"# Incidencias Recientes (Últimas {result.hours} horas)\n\n"
+    report += f"**Período**: {result.start.strftime('%Y-%m-%d %H:%M UTC')} - {result.end.strftime('%Y-%m-%d %H:%M UTC')}\n\n"
+
+    if not result.total:
+        report += "✅ **No se registraron incidencias en este período.**\n"
+        return report
+
+    counts = result.severity_counts
+    report += "## Resumen Ejecutivo\n"
+    report += f"- **Total de alertas**: {result.total}\n"
+    report += f"- **Critical**: {counts.get('critical', 0)} | "
+    report += f"**Major**: {counts.get('major', 0)} | "
+    report += f"**Minor**: {counts.get('minor', 0)} | "
+    report += f"**Info**: {counts.get('info', 0)}\n"
+    if result.top_services:
+        report += f"- **Servicios más afectados**: " + ", ".join([f"{s.service} ({s.count})" for s in result.top_services]) + "\n"
+    report += "\n"
+
+    for severity, alerts in result.alerts_by_severity.items():
+        report += f"## Incidencias {severity.title()}\n\n"
+        for alert in alerts:
+            report += f"### [{alert.received_at.strftime('%Y-%m-%d %H:%M UTC')}] {alert.service} - {alert.alertname}\n"
+            report += f"- **Severidad**: {severity.title()}\n"
+            report += f"- **Estado**: {alert.status}\n"
+            if alert.summary:
+                report += f"- **Resumen**: {alert.summary}\n"
+            if alert.is_duplicate:
+                report += f"- **Duplicada**: Sí\n"
+            report += "\n"
+
+    if result.ai_requested:
+        report += _ai_note("Análisis con IA no implementado aún. Use analyze_with_ai=False para reporte básico.")
+    return report
+
+
+def _health_markdown(result: HealthResult) -> str:
+    report = "# Service Health Summary\n\n"
+    report += f"**Timestamp**: {result.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
+    report += f"## Estado General: {_STATUS_ICONS[result.overall_status]} {result.overall_status}\n\n"
+    report += f"- **Alertas activas**: {result.active_alerts}\n"
+    report += f"- **Critical**: {result.critical} | **Major**: {result.major}\n\n"
+
+    for service in result.services:
+        report += f"### {service.service} {_STATUS_ICONS[service.status]}\n"
+        report += f"- **Status**: {service.status}\n"
+
+        metrics = service.metrics
+        if metrics is not None and metrics.error is None:
+            report += f"- **Error rate**: {metrics.error_rate if metrics.error_rate is not None else 'N/A'}"
+            if metrics.error_rate is not None and metrics.error_rate > result.error_rate_threshold:
+                report += " ⚠️"
+            report += f" (threshold: {result.error_rate_threshold * 100}%)\n"
+
+            report += f"- **Latency P95**: {metrics.latency_p95 if metrics.latency_p95 is not None else 'N/A'}"
+            if metrics.latency_p95 is not None and metrics.latency_p95 > result.latency_threshold_ms:
+                report += " ⚠️"
+            report += f" (threshold: {result.latency_threshold_ms:g}ms)\n"
+        elif metrics is not None:
+            report += f"- **Métricas**: Error obteniendo métricas ({metrics.error})\n"
+
+        report += f"- **Alertas activas**: {service.active_alerts}"
+        if service.severities:
+            report += f" ({', '.join(service.severities)})"
+        report += "\n\n"
+
+    if result.ai_requested:
+        report += _ai_note("Análisis con IA no implementado aún.")
+    return report
+
+
+def _post_deployment_markdown(result: PostDeploymentResult) -> str:
+    report = f"# Post-Deployment Monitoring: {result.service}\n\n"
+
+    report += "## Deployment Info\n"
+    report += f"- **Service**: {result.service}\n"
+    report += f"- **Deploy time**: {result.deploy_time.strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
+    report += f"- **Monitoring window**: {result.window_hours:.1f} hours\n"
+    report += f"- **Current time**: {result.current_time.strftime('%Y-%m-%d %H:%M:%S UTC')}\n\n"
+
+    report += "## Alertas Post-Deploy\n"
+    if not result.alerts_post:
+        report += "✅ **No se detectaron alertas después del deployment.**\n\n"
+    else:
+        report += f"⚠️ **{result.alerts_post} alertas detectadas:**\n\n"
+        for alert in result.post_alerts:
+            report += f"- **{alert.minutes_after_deploy} minutos post-deploy**: {alert.alertname} ({alert.severity})\n"
+            if alert.summary:
+                report += f"  - {alert.summary}\n"
+        report += "\n"
+
+    change = result.alerts_post - result.alerts_pre
+    report += "## Comparación Pre/Post Deploy\n"
+    report += f"- **Alertas pre-deploy** (2h antes): {result.alerts_pre}\n"
+    report += f"- **Alertas post-deploy** ({result.window_hours:.1f}h después): {result.alerts_post}\n"
+    if change > 0:
+        report += f"- **Cambio**: +{change} alertas ⚠️\n"
+    elif change < 0:
+        report += f"- **Cambio**: {change} alertas ✅\n"
+    else:
+        report += "- **Cambio**: Sin cambios\n"
+    report += "\n"
+
+    report += "## Recomendación\n"
+    report += _VERDICTS[result.verdict] + "\n"
+
+    if result.ai_requested:
+        report += _ai_note("Análisis detallado con IA no implementado aún.")
+    return report
+
+
+def _trends_markdown(result: TrendsResult) -> str:
+    report = f"# Trend Analysis: {result.metric}\n\n"
+    report += f"**Período actual**: {result.start.strftime('%Y-%m-%d %H:%M UTC')} - {result.end.strftime('%Y-%m-%d %H:%M UTC')}\n"
+    if result.service:
+        report += f"**Servicio**: {result.service}\n"
+    report += "\n"
+
+    if not result.supported:
+        report += f"⚠️ Análisis de métrica '{result.metric}' no implementado aún. Use 'alert_count'.\n"
+
+    comparison = result.comparison
+    if comparison is not None:
+        report += "## Comparación de Períodos\n"
+        report += f"- **Período actual** (últimas {result.period_hours}h): {comparison.current} alertas\n"
+        report += f"- **Período anterior** ({result.period_hours}h previas): {comparison.previous} alertas\n"
+        report += f"- **Cambio**: {comparison.change_pct:+.1f}%"
+        if abs(comparison.change_pct) > 50:
+            report += " ⚠️ (cambio significativo)"
+        elif comparison.change_pct > 0:
+            report += " ↗️"
+        elif comparison.change_pct < 0:
+            report += " ↘️"
+        report += "\n\n"
+
+    if result.severity_breakdown:
+        report += "### Desglose por Severidad\n"
+        for severity, count in result.severity_breakdown.items():
+            report += f"- **{severity.title()}**: {count}\n"
+        report += "\n"
+
+    if result.ai_requested:
+        report += _ai_note("Insights con IA no implementados aún.")
+    return report
+
+
+def _daily_digest_markdown(result: DailyDigestResult) -> str:
+    report = f"# Daily Digest: {result.date}\n\n"
+
+    if not result.total:
+        report += "✅ **No se registraron incidencias en este día.**\n"
+    else:
+        report += "## Resumen Ejecutivo\n"
+        if result.critical_count == 0 and result.major_count == 0:
+            report += f"El sistema operó sin incidentes críticos. Se registraron {result.total} alertas menores.\n"
+        else:
+            report += f"Se registraron {result.critical_count} incidentes críticos y {result.major_count} mayores en el día. "
+            top = result.top_services[0]
+            report += f"{top.service} tuvo el mayor número de alertas ({top.count}).\n"
+        report += "\n"
+
+        counts = result.severity_counts
+        report += "## Métricas del Día\n"
+        report += f"- **Total alertas**: {result.total}\n"
+        report += f"- **Critical**: {counts.get('critical', 0)} | "
+        report += f"**Major**: {counts.get('major', 0)} | "
+        report += f"**Minor**: {counts.get('minor', 0)} | "
+        report += f"**Info**: {counts.get('info', 0)}\n"
+        report += "\n"
+
+        if result.highlights:
+            report += "## Incidentes Destacados\n\n"
+            for i, alert in enumerate(result.highlights, 1):
+                report += f"{i}. **[{alert.received_at.strftime('%H:%M UTC')}]** {alert.service} - {alert.alertname}\n"
+                if alert.summary:
+                    report += f"   - {alert.summary}\n"
+            report += "\n"
+
+        if result.top_services:
+            report += "## Servicios con Mayor Actividad\n"
+            for service in result.top_services:
+                report += f"- **{service.service}**: {service.count} alertas\n"
+            report += "\n"
+
+        if result.change_pct_vs_previous is not None:
+            report += "## Tendencias vs Día Anterior\n"
+            report += f"- **Alertas**: {result.change_pct_vs_previous:+.0f}%\n"
+
+        if result.ai_requested:
+            report += _ai_note("Resumen ejecutivo con IA no implementado aún.")
+
+    if result.ai_summary:
+        report += f"\n---\n\n## Resumen Ejecutivo (IA)\n\n{result.ai_summary}\n"
+    return report
+
+
+def render_markdown(result: QuickResult) -> str:
+    """Reporte markdown completo de un resultado."""
+    if isinstance(result, QuickCommandError):
+        return f"# Error\n\n{result.message}"
+    return {
+        "recent-incidents": _recent_incidents_markdown,
+        "health": _health_markdown,
+        "post-deployment": _post_deployment_markdown,
+        "trends": _trends_markdown,
+        "daily-digest": _daily_digest_markdown,
+    }[result.command](result)
+
+
+# ============================================================================
+# CHAT (COMPACTO)
+# ============================================================================
+
+def _severity_line(counts: Dict[str, int]) -> str:
+    return f"{counts.get('critical', 0)} critical, {counts.get('major', 0)} major"
+
+
+def _top_services_line(services: List[Any]) -> str:
+    return ", ".join(f"{s.service} ({s.count})" for s in services)
+
+
+def render_chat(result: QuickResult) -> str:
+    """Texto compacto (pocas líneas) de un resultado, para bots de chatops."""
+    if isinstance(result, QuickCommandError):
+        return f"⚠️ {result.message}"
+
+    if isinstance(result, RecentIncidentsResult):
+        if not result.total:
+            return f"✅ Sin incidencias en las últimas {result.hours}h"
+        text = f"📋 {result.total} incidencias en {result.hours}h ({_severity_line(result.severity_counts)})"
+        if result.top_services:
+            text += f"\nMás afectados: {_top_services_line(result.top_services)}"
+        return text
+
+    if isinstance(result, HealthResult):
+        lines = [f"{_STATUS_ICONS[result.overall_status]} {result.overall_status} · "
+                 f"{result.active_alerts} alertas activas ({result.critical} critical, {result.major} major)"]
+        for service in result.services:
+            if service.status == "HEALTHY":
+                continue
+            line = f"{_STATUS_ICONS[service.status]} {service.service}: {service.active_alerts} alertas"
+            if service.metrics is not None and service.metrics.error_rate is not None:
+                line += f", error rate {service.metrics.error_rate:.2%}"
+            if service.metrics is not None and service.metrics.latency_p95 is not None:
+                line += f", p95 {service.metrics.latency_p95:g}ms"
+            lines.append(line)
+        return "\n".join(lines)
+
+    if isinstance(result, PostDeploymentResult):
+        verdict = _VERDICTS[result.verdict].split(" - ")[0]
+        return (
+            f"🚀 {result.service} ({result.window_hours:.1f}h post-deploy): "
+            f"{result.alerts_post} alertas vs {result.alerts_pre} pre-deploy\n{verdict}"
+        )
+
+    if isinstance(result, TrendsResult):
+        if not result.supported:
+            return f"⚠️ Métrica '{result.metric}' no soportada (usar alert_count)"
+        scope = f" {result.service}" if result.service else ""
+        if result.comparison is None:
+            return f"📈 {result.metric}{scope} {result.period_hours}h: {sum(result.severity_breakdown.values())}"
+        comparison = result.comparison
+        return (
+            f"📈 {result.metric}{scope} {result.period_hours}h: "
+            f"{comparison.current} vs {comparison.previous} ({comparison.change_pct:+.1f}%)"
+        )
+
+    # DailyDigestResult
+    if not result.total:
+        return f"🗓️ Digest {result.date}: sin incidencias"
+    text = f"🗓️ Digest {result.date}: {result.total} alertas ({_severity_line(result.severity_counts)})"
+    if result.change_pct_vs_previous is not None:
+        text += f", {result.change_pct_vs_previous:+.0f}% vs día anterior"
+    if result.top_services:
+        text += f"\nMás afectados: {_top_services_line(result.top_services[:3])}"
+    return text
+
+
+def render_recommendation_chat(recommendation: Dict[str, Any]) -> str:
+    """Recomendación de la verificación en una línea."""
+    icon = "🔔 NOTIFY" if recommendation["level"] == "notify" else "ℹ️ FYI"
+    return f"{icon}: {recommendation['reason']} ({recommendation['confidence']:.0%})"
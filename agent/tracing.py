@@ -0,0 +1,246 @@
+"""
+Tracing OpenTelemetry de punta a punta.
+
+`setup_tracing(app)` (main.py) configura el TracerProvider global con el
+exporter de `tracing.exporter` (otlp | otlp_http | console | file | none) e
+instrumenta FastAPI, asyncio y logging. El resto del código abre spans sobre
+el tracer global con `span()` / `traced()`:
+
+    POST /api/alerts → alert.analyze_payload → alert.analyze → pipeline.<etapa>
+      → agent.run <agente> → agent.attempt (un span por tier) → tool <nombre>
+      → clientes HTTP (Prometheus/Loki/Tempo), Postgres, Redis y Docker
+
+Atributos propios: `cache.*` (hit/miss de los caches de reportes, comandos y
+memo de tools), `retry.count` (reintentos de tenacity y de urllib3),
+`agent.fallbacks` (tiers descartados). Sin `setup_tracing` (tests, scripts)
+el tracer es no-op.
+"""
+
+import functools
+import inspect
+import json
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from opentelemetry import propagate, trace
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+
+from agent.config import AdminAgentConfig
+
+_config = AdminAgentConfig()
+
+_tracer = trace.get_tracer("observability-agent")
+_provider: Any = None
+
+# Largo máximo de los atributos string (queries, args de tools)
+_MAX_ATTRIBUTE_CHARS = 500
+
+
+def _attribute_value(value: Any) -> Any:
+    """Convierte un valor a un tipo de atributo OTel válido, truncando strings largos."""
+    if isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value):
+        return [v[:_MAX_ATTRIBUTE_CHARS] for v in value]
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    return text[:_MAX_ATTRIBUTE_CHARS]
+
+
+def _attributes(attributes: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {k: _attribute_value(v) for k, v in (attributes or {}).items() if v is not None}
+
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None, client: bool = False) -> Iterator[Span]:
+    """
+    Abre un span hijo del contexto actual.
+
+    Las excepciones que atraviesan el span se registran y lo marcan como error.
+
+    Args:
+        name: Nombre del span
+        attributes: Atributos iniciales (los None se omiten)
+        client: True para llamadas a un upstream (SpanKind.CLIENT)
+    """
+    kind = SpanKind.CLIENT if client else SpanKind.INTERNAL
+    with _tracer.start_as_current_span(name, kind=kind, attributes=_attributes(attributes)) as current:
+        yield current
+
+
+def traced(name: str, attributes: Optional[Dict[str, Any]] = None, client: bool = False) -> Callable:
+    """Decorador: ejecuta la función (sync o async) dentro de `span(name)`."""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name, attributes, client):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, attributes, client):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def set_attributes(attributes: Dict[str, Any]) -> None:
+    """Agrega atributos al span actual (no-op si no hay span)."""
+    trace.get_current_span().set_attributes(_attributes(attributes))
+
+
+def add_event(name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Registra un evento en el span actual."""
+    trace.get_current_span().add_event(name, _attributes(attributes))
+
+
+def set_error(message: str, current: Optional[Span] = None) -> None:
+    """Marca un span (por default el actual) como error sin excepción asociada."""
+    (current or trace.get_current_span()).set_status(Status(StatusCode.ERROR, message))
+
+
+def inject_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Headers con el contexto de trace (`traceparent`) para propagarlo al upstream."""
+    carrier = dict(headers or {})
+    propagate.inject(carrier)
+    return carrier
+
+
+def _record_tool_result(current: Span, result: Any) -> None:
+    if isinstance(result, dict):
+        if "error" in result:
+            set_error(str(result["error"])[:_MAX_ATTRIBUTE_CHARS], current)
+        compaction = result.get("compaction")
+        if isinstance(compaction, dict):
+            current.set_attributes({
+                "tool.compacted": True,
+                "tool.original_tokens": compaction.get("original_tokens", 0),
+                "tool.tokens": compaction.get("tokens", 0),
+            })
+
+
+async def _await_in_span(current: Span, awaitable: Any) -> Any:
+    with trace.use_span(current, end_on_exit=True):
+        result = await awaitable
+        _record_tool_result(current, result)
+        return result
+
+
+def tool_span_hook(function_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Any:
+    """
+    Tool hook de agno: un span `tool <nombre>` por tool call.
+
+    Es síncrono para funcionar tanto en `run` como en `arun`; en la cadena
+    async `function_call` devuelve una corrutina que se espera dentro del span.
+    """
+    current = _tracer.start_span(
+        f"tool {function_name}",
+        attributes=_attributes({"tool.name": function_name, "tool.arguments": arguments}),
+    )
+    try:
+        with trace.use_span(current, end_on_exit=False):
+            result = function_call(**arguments)
+    except BaseException:
+        current.end()
+        raise
+    if inspect.isawaitable(result):
+        return _await_in_span(current, result)
+    _record_tool_result(current, result)
+    current.end()
+    return result
+
+
+def _build_exporter(name: str) -> Any:
+    """Exporter de spans según `tracing.exporter`; None si no se exporta."""
+    try:
+        if name == "otlp":
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            return OTLPSpanExporter(endpoint=_config.tracing_endpoint)
+        if name == "otlp_http":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter as OTLPHttpSpanExporter
+            return OTLPHttpSpanExporter(endpoint=_config.tracing_endpoint)
+        if name in ("console", "file"):
+            from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+            if name == "console":
+                return ConsoleSpanExporter()
+            # Un span JSON por línea
+            return ConsoleSpanExporter(
+                out=open(_config.tracing_file_path, "a", encoding="utf-8"),
+                formatter=lambda s: s.to_json(indent=None) + "\n",
+            )
+    except ImportError as e:
+        print(f"Exporter de tracing '{name}' no disponible: {e}")
+        return None
+    if name != "none":
+        print(f"Exporter de tracing desconocido: {name}")
+    return None
+
+
+def _instrument(app: Any) -> None:
+    """Instrumentaciones automáticas; cada una es opcional."""
+    if app is not None:
+        try:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+            FastAPIInstrumentor.instrument_app(app, excluded_urls="metrics")
+        except Exception as e:
+            print(f"No se pudo instrumentar FastAPI: {e}")
+    try:
+        from opentelemetry.instrumentation.asyncio import AsyncioInstrumentor
+        AsyncioInstrumentor().instrument()
+    except Exception as e:
+        print(f"No se pudo instrumentar asyncio: {e}")
+    try:
+        from opentelemetry.instrumentation.logging import LoggingInstrumentor
+        # Solo agrega otelTraceID/otelSpanID a los LogRecord; no cambia el formato
+        LoggingInstrumentor().instrument(set_logging_format=False)
+    except Exception as e:
+        print(f"No se pudo instrumentar logging: {e}")
+
+
+def setup_tracing(app: Any = None, exporter: Any = None) -> Any:
+    """
+    Configura el TracerProvider global e instrumenta la app.
+
+    Args:
+        app: App FastAPI a instrumentar (opcional)
+        exporter: SpanExporter explícito (tests); por default el de `tracing.exporter`
+
+    Returns:
+        El TracerProvider configurado, o None si el tracing está deshabilitado
+    """
+    global _provider
+    if _provider is not None:
+        return _provider
+    if exporter is None and not _config.tracing_enabled:
+        return None
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError as e:
+        print(f"OpenTelemetry SDK no disponible; tracing deshabilitado: {e}")
+        return None
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": _config.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(_config.tracing_sample_ratio)),
+    )
+    exporter = exporter or _build_exporter(_config.tracing_exporter)
+    if exporter is not None:
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    _instrument(app)
+    return provider
+
+
+def shutdown_tracing() -> None:
+    """Exporta los spans pendientes y cierra el provider."""
+    if _provider is not None:
+        _provider.shutdown()
@@ -0,0 +1,227 @@
+"""
+Compactación de outputs de tools con presupuesto de tokens.
+
+Los resultados crudos de Prometheus/Loki/Tempo pueden ocupar decenas de miles
+de tokens. Antes de devolverlos al modelo se reducen por niveles hasta entrar
+en el presupuesto: matrices → resumen estadístico, logs → líneas deduplicadas
+por patrón, label sets truncados, arrays acotados. Todo lo omitido queda
+marcado explícitamente (`_elided_*`).
+"""
+
+import json
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from agent import metrics
+from agent.config import AdminAgentConfig
+from agent.utils.log_patterns import log_pattern
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - dependencia opcional
+    tiktoken = None
+
+_config = AdminAgentConfig()
+
+# Labels que se conservan primero al truncar un label set
+_PRIORITY_LABELS = (
+    "__name__", "service", "job", "instance", "status", "code", "method",
+    "route", "handler", "le", "level", "namespace", "pod", "container",
+)
+
+_encoding = None
+_encoding_loaded = False
+
+
+class _Level(NamedTuple):
+    max_items: int
+    max_labels: int
+    max_str: int
+
+
+# Niveles de compactación, de menos a más agresivo
+_LEVELS = (
+    _Level(max_items=50, max_labels=12, max_str=1000),
+    _Level(max_items=20, max_labels=8, max_str=400),
+    _Level(max_items=10, max_labels=5, max_str=200),
+    _Level(max_items=5, max_labels=3, max_str=120),
+    _Level(max_items=3, max_labels=2, max_str=80),
+)
+
+
+def load_encoding() -> Any:
+    """
+    Carga el tokenizer (bloqueante); se llama una vez al arrancar (main.py).
+
+    Con el cache de tiktoken vacío `get_encoding` descarga el BPE por red, por
+    eso no se hace en el camino de las tool calls. Si falla queda la heurística.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                print(f"tiktoken no disponible, usando estimación por caracteres: {e}")
+    return _encoding
+
+
+def _get_encoding():
+    """Tokenizer cargado por `load_encoding()`; None (heurística) si todavía no se cargó."""
+    return _encoding
+
+
+def estimate_tokens(data: Any) -> int:
+    """Estima tokens del JSON serializado (tiktoken si está disponible, sino ~4 chars/token)."""
+    text = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, default=str, separators=(",", ":"))
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def _truncate_labels(labels: Dict[str, Any], max_labels: int) -> Dict[str, Any]:
+    if len(labels) <= max_labels:
+        return labels
+    keep = [k for k in _PRIORITY_LABELS if k in labels][:max_labels]
+    keep += [k for k in sorted(labels) if k not in keep][: max_labels - len(keep)]
+    out = {k: labels[k] for k in keep}
+    out["_elided_labels"] = len(labels) - len(keep)
+    return out
+
+
+def _summarize_values(values: List[List[Any]]) -> Dict[str, Any]:
+    """Resume una serie [[ts, "valor"], ...] en first/last/min/max/avg."""
+    nums = []
+    for _, raw in values:
+        try:
+            num = float(raw)
+        except (TypeError, ValueError):
+            continue
+        if not math.isnan(num):
+            nums.append(num)
+    summary: Dict[str, Any] = {"points": len(values)}
+    if values:
+        summary["start_ts"] = values[0][0]
+        summary["end_ts"] = values[-1][0]
+    if nums:
+        summary.update({
+            "first": nums[0],
+            "last": nums[-1],
+            "min": min(nums),
+            "max": max(nums),
+            "avg": round(sum(nums) / len(nums), 6),
+        })
+    return summary
+
+
+def _is_series(item: Any) -> bool:
+    return isinstance(item, dict) and "metric" in item and ("value" in item or "values" in item)
+
+
+def _compact_series(item: Dict[str, Any], level: _Level) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"metric": _truncate_labels(item.get("metric") or {}, level.max_labels)}
+    if "values" in item:
+        out["summary"] = _summarize_values(item["values"] or [])
+    else:
+        out["value"] = item["value"]
+    return out
+
+
+def _compact_streams(streams: List[Dict[str, Any]], level: _Level) -> Dict[str, Any]:
+    """Deduplica líneas de Loki por patrón normalizado conservando una muestra y el conteo."""
+    patterns: Dict[str, Dict[str, Any]] = {}
+    total = 0
+    for stream in streams:
+        for ts, line in stream.get("values") or []:
+            total += 1
+            key = log_pattern(line)
+            entry = patterns.get(key)
+            if entry is None:
+                patterns[key] = {"line": line, "count": 1, "first_ts": ts, "last_ts": ts}
+            else:
+                entry["count"] += 1
+                entry["first_ts"] = min(entry["first_ts"], ts)
+                entry["last_ts"] = max(entry["last_ts"], ts)
+    lines = sorted(patterns.values(), key=lambda e: e["count"], reverse=True)
+    return {
+        "resultType": "streams",
+        "total_lines": total,
+        "unique_patterns": len(lines),
+        "streams": [_truncate_labels(s.get("stream") or {}, level.max_labels) for s in streams],
+        "lines": lines,
+    }
+
+
+def _cap(obj: Any, level: _Level, depth: int = 0) -> Any:
+    """Acota arrays y strings recursivamente marcando lo omitido."""
+    if isinstance(obj, str):
+        if len(obj) > level.max_str:
+            return f"{obj[:level.max_str]}…[+{len(obj) - level.max_str} chars]"
+        return obj
+    if depth > 8:
+        return "…[estructura anidada omitida]"
+    if isinstance(obj, list):
+        items = [_cap(i, level, depth + 1) for i in obj[: level.max_items]]
+        if len(obj) > level.max_items:
+            items.append({"_elided_items": len(obj) - level.max_items})
+        return items
+    if isinstance(obj, dict):
+        return {k: _cap(v, level, depth + 1) for k, v in obj.items()}
+    return obj
+
+
+def _compact(data: Any, level: _Level) -> Any:
+    if isinstance(data, list) and data and all(_is_series(i) for i in data):
+        return _cap([_compact_series(i, level) for i in data], level)
+    if isinstance(data, dict) and isinstance(data.get("data"), dict):
+        inner = data["data"]
+        result = inner.get("result")
+        if inner.get("resultType") == "streams" and isinstance(result, list):
+            return _cap(_compact_streams(result, level), level)
+        if inner.get("resultType") in ("matrix", "vector") and isinstance(result, list):
+            return _cap({
+                "resultType": inner["resultType"],
+                "result": [_compact_series(i, level) for i in result if _is_series(i)],
+            }, level)
+    return _cap(data, level)
+
+
+def _budget_for(tool: str) -> int:
+    return int(_config.tool_output_token_budgets.get(tool, _config.tool_output_token_budget))
+
+
+def compact_output(tool: str, data: Any, budget: Optional[int] = None) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """
+    Compacta el output de un tool hasta entrar en el presupuesto de tokens.
+
+    Args:
+        tool: Nombre del tool (para presupuesto por tool y métricas)
+        data: Output crudo
+        budget: Presupuesto en tokens (default: config por tool o global)
+
+    Returns:
+        Tupla (data_compactada, metadata). metadata es None si no hizo falta compactar.
+    """
+    budget = budget or _budget_for(tool)
+    original_tokens = estimate_tokens(data)
+    if original_tokens <= budget:
+        metrics.TOOL_OUTPUT_TOKENS.labels(tool=tool).observe(original_tokens)
+        return data, None
+
+    compacted, tokens = data, original_tokens
+    for level in _LEVELS:
+        compacted = _compact(data, level)
+        tokens = estimate_tokens(compacted)
+        if tokens <= budget:
+            break
+
+    metrics.TOOL_OUTPUT_TOKENS.labels(tool=tool).observe(tokens)
+    metrics.TOOL_OUTPUT_TOKENS_SAVED.labels(tool=tool).inc(max(original_tokens - tokens, 0))
+    return compacted, {
+        "elided": True,
+        "original_tokens": original_tokens,
+        "tokens": tokens,
+        "budget": budget,
+    }
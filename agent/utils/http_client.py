@@ -1,7 +1,26 @@
+from urllib.parse import urlsplit
+
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from agent import tracing
+from agent.config import AdminAgentConfig
+
+_config = AdminAgentConfig()
+
+
+def _peer_service(url: str) -> str:
+    """Upstream de una URL (prometheus | loki | tempo) para el span del request."""
+    for name, base in (
+        ("prometheus", _config.prometheus_url),
+        ("loki", _config.loki_url),
+        ("tempo", _config.tempo_url),
+    ):
+        if base and url.startswith(base):
+            return name
+    return urlsplit(url).hostname or "http"
+
 
 class TimeoutSession(requests.Session):
     def __init__(self, timeout=None):
@@ -11,15 +30,29 @@ class TimeoutSession(requests.Session):
     def request(self, method, url, *args, **kwargs):
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.timeout
-        return super().request(method, url, *args, **kwargs)
+        method = method.upper()
+        peer = _peer_service(url)
+        attributes = {"http.request.method": method, "url.full": url, "peer.service": peer}
+        with tracing.span(f"{method} {peer}", attributes, client=True) as current:
+            # Propaga el trace al upstream (traceparent)
+            kwargs["headers"] = tracing.inject_headers(kwargs.get("headers"))
+            response = super().request(method, url, *args, **kwargs)
+            # Reintentos del adapter (urllib3 Retry) antes de esta respuesta
+            retries = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+            current.set_attributes({"http.response.status_code": response.status_code, "retry.count": len(retries)})
+            if response.status_code >= 500:
+                tracing.set_error(f"HTTP {response.status_code}", current)
+            return response
 
 def get_shared_session(
     retries: int = 3,
     backoff_factor: float = 0.5,
     status_forcelist: tuple = (500, 502, 503, 504),
-    timeout: int = 10
+    timeout: int = 10,
+    pool_connections: int = 10,
+    pool_maxsize: int = 20,
 ) -> requests.Session:
-    """Configura y devuelve una sesión requests compartida con retries."""
+    """Configura y devuelve una sesión requests compartida con retries y pool de conexiones."""
     session = TimeoutSession(timeout=timeout)
     
     retry_strategy = Retry(
@@ -28,7 +61,13 @@ def get_shared_session(
         status_forcelist=status_forcelist,
     )
     
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    # pool_connections: hosts cacheados; pool_maxsize: conexiones keep-alive por host.
+    # Debe ser >= a la concurrencia máxima de fan-out (ej: tempo_tool.get_traces).
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     
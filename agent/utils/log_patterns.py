@@ -0,0 +1,25 @@
+"""
+Normalización de líneas de log en patrones.
+
+Reemplaza valores variables (uuids, IPs, hex, strings, números) por
+placeholders para agrupar líneas equivalentes. La usan la compactación de
+outputs de Loki y el resumen periódico del tail de logs.
+"""
+
+import re
+
+_PATTERN_RULES = [
+    (re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"), "<uuid>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<ip>"),
+    (re.compile(r"\b[0-9a-fA-F]{12,}\b"), "<hex>"),
+    (re.compile(r'"[^"]*"'), '"<str>"'),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+]
+
+
+def log_pattern(line: str) -> str:
+    """Normaliza una línea de log reemplazando valores variables por placeholders."""
+    pattern = line.strip()[:300]
+    for regex, placeholder in _PATTERN_RULES:
+        pattern = regex.sub(placeholder, pattern)
+    return pattern
@@ -0,0 +1,76 @@
+"""
+Memoización de tool calls dentro de un run de agente.
+
+Los agentes suelen repetir la misma consulta (mismo tool, mismos args) varias
+veces en un run para "re-verificar". Dentro de un `tool_memo_scope()` los
+tools de solo lectura decorados con `@memoized` devuelven el resultado ya
+obtenido en vez de volver a pegarle al upstream. El memo vive en un
+ContextVar (se propaga a los threads de `asyncio.to_thread`) y se descarta
+al cerrar el scope. Los resultados con error no se memorizan.
+"""
+
+import functools
+import inspect
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from agent import metrics, tracing
+
+_memo: ContextVar[Optional[Dict[str, Any]]] = ContextVar("tool_run_memo", default=None)
+
+
+def _normalize(value: Any) -> Any:
+    # Solo bordes: los espacios internos pueden ser parte del query (`|= "a  b"`)
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def memo_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Clave estable: nombre del tool + args normalizados (strings sin espacios en los bordes, orden de keys)."""
+    return json.dumps(
+        {"tool": tool_name, "args": _normalize(arguments)},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+@contextmanager
+def tool_memo_scope() -> Iterator[None]:
+    """Abre un memo vacío para el run actual; se invalida al salir."""
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def memoized(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorador para tools de solo lectura; sin scope activo es un pass-through."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        memo = _memo.get()
+        if memo is None:
+            return func(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = memo_key(func.__name__, dict(bound.arguments))
+        if key in memo:
+            metrics.TOOL_MEMO_HITS.labels(tool=func.__name__).inc()
+            tracing.set_attributes({"cache.tool_memo": "hit"})
+            return memo[key]
+        result = func(*args, **kwargs)
+        if not (isinstance(result, dict) and "error" in result):
+            memo[key] = result
+        return result
+
+    return wrapper
@@ -1,8 +1,9 @@
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 
+from agent import metrics
 from agent.agents.observability_team import analyze_payload
 from agent.models.alert import AlertmanagerWebhook
 from agent.storage import alert_storage
@@ -11,8 +12,10 @@ router = APIRouter()
 
 
 @router.post("/alerts")
-async def receive_alert(payload: AlertmanagerWebhook) -> Dict[str, Any]:
+async def receive_alert(payload: AlertmanagerWebhook, request: Request) -> Dict[str, Any]:
     """Recibe webhook de Grafana Alertmanager y dispara análisis."""
+    # El body ya fue leído para validar el payload (queda cacheado en el request)
+    metrics.WEBHOOK_PAYLOAD_BYTES.observe(len(await request.body()))
     result = await analyze_payload(payload.model_dump(mode='json'))
     return result
 
@@ -1,24 +1,149 @@
-"""API REST para Quick Commands de observabilidad."""
+"""API REST para Quick Commands de observabilidad.
 
-from typing import Optional
+Por defecto los endpoints ejecutan directamente las funciones de reporte
+(`agent/tools/quick_commands.py`) sin pasar por el LLM. El QueryAgent solo se
+usa con `analyze_with_ai=true` o cuando un slash command trae texto libre.
+`/quick/command` consulta primero el cache de resultados
+(`agent/storage/command_cache.py`) y coalesce comandos idénticos concurrentes.
+`/quick/commands` ejecuta un batch en paralelo compartiendo las lecturas.
+
+En modo directo los reportes salen de un resultado tipado
+(`agent/models/quick_results.py`); `format` elige markdown (default), json
+(el resultado tipado) o chat (texto compacto).
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from agent.agents.query_agent import query_agent
+from agent.config import AdminAgentConfig
+from agent.daily_digest import digest_scheduler
+from agent.model_router import model_router
+from agent.models.quick_results import QuickResult, parse_quick_result
 from agent.slash_commands import (
     parse_slash_command,
     can_execute_via_rest,
     build_query_agent_prompt,
+    build_direct_call,
+    build_command_cache_key,
+    command_time_bucket,
+    get_direct_function,
+    plan_command_data,
+    CANONICAL_PROMPTS,
     CANONICAL_TO_ALIASES,
 )
+from agent.storage.command_cache import command_cache
+from agent.storage.query_helpers import data_context_scope, prefetch
+from agent.tools import quick_commands
+from agent.tools.quick_render import (
+    OutputFormat,
+    render,
+    render_chat,
+    render_markdown,
+    render_recommendation_chat,
+)
 
 router = APIRouter()
+_config = AdminAgentConfig()
+
+
+def _use_ai(analyze_with_ai: Optional[bool]) -> bool:
+    """Resuelve analyze_with_ai; si no se especifica usa el default de config."""
+    if analyze_with_ai is None:
+        return _config.quick_commands_default_ai_analysis
+    return analyze_with_ai
+
+
+def _direct_response(result: QuickResult, output_format: OutputFormat) -> Dict[str, Any]:
+    """Respuesta en modo directo: `result` (json) o `report` (markdown | chat)."""
+    if output_format == "json":
+        return {"result": render(result, "json"), "execution": "direct"}
+    return {"report": render(result, output_format), "execution": "direct"}
+
+
+def _format_command_response(verification_result: Dict[str, Any], output_format: OutputFormat) -> Dict[str, Any]:
+    """
+    Aplica `format` a la respuesta de un slash command.
+    
+    El resultado cacheado guarda el markdown y el resultado tipado; el formato
+    se aplica después del cache. Comandos que pasaron por el QueryAgent no
+    tienen resultado tipado y devuelven siempre el markdown.
+    """
+    response = dict(verification_result)
+    result = response.pop("result", None)
+    if result is None or output_format == "markdown":
+        return response
+    if output_format == "json":
+        response.pop("report", None)
+        response["result"] = result
+    else:
+        response["report"] = (
+            render_chat(parse_quick_result(result)) + "\n" + render_recommendation_chat(response["recommendation"])
+        )
+    return response
 
 
 class CommandRequest(BaseModel):
     """Request body para ejecutar un slash command."""
     command: str
+    # Servir el resultado anterior mientras se recalcula (default: quick_commands.stale_while_revalidate)
+    stale_while_revalidate: Optional[bool] = None
+    format: OutputFormat = "markdown"
+
+
+class BatchCommandRequest(BaseModel):
+    """Request body para ejecutar varios slash commands juntos."""
+    commands: List[str]
+    stale_while_revalidate: Optional[bool] = None
+    format: OutputFormat = "markdown"
+
+
+async def _run_slash_command(canonical: str, params: Dict[str, str], args_text: str) -> Dict[str, Any]:
+    """Ejecuta comando base + verificación + dedupe (lo que cachea `command_cache`)."""
+    from agent.slash_commands import (
+        arun_verification_workflow,
+        check_dedupe,
+        apply_dedupe_recommendation,
+        dedupe_age_seconds,
+    )
+    
+    # Comando base y checks de evidencia comparten los datos leídos (una lectura por dataset)
+    with data_context_scope():
+        # Ejecutar comando base: directo si los params lo permiten, sino QueryAgent
+        direct_kwargs = build_direct_call(canonical, params, args_text)
+        result: Optional[QuickResult] = None
+        if direct_kwargs is not None and canonical == "daily-digest":
+            result, _ = await digest_scheduler.get_result(
+                direct_kwargs.get("date"), direct_kwargs.get("include_all_services", True)
+            )
+        elif direct_kwargs is not None:
+            result = await asyncio.to_thread(get_direct_function(canonical), **direct_kwargs)
+        
+        if result is not None:
+            base_report = render_markdown(result)
+            execution = "direct"
+        else:
+            prompt = build_query_agent_prompt(canonical, params, args_text)
+            response = await model_router.arun(query_agent, "query", input=prompt)
+            base_report = response.content if hasattr(response, 'content') else str(response)
+            execution = "agent"
+        
+        # Ejecutar workflow de verificación con evidencia (lee los campos del resultado tipado)
+        verification_result = await arun_verification_workflow(canonical, params, base_report, result)
+    
+    # Aplicar deduplicación (mismo contenido que una ejecución reciente en otra ventana)
+    is_duplicate, _ = await check_dedupe(canonical, params, verification_result["report"])
+    if is_duplicate:
+        time_since = await dedupe_age_seconds(canonical, params, verification_result["report"])
+        verification_result = apply_dedupe_recommendation(verification_result, True, time_since)
+    
+    verification_result["execution"] = execution
+    verification_result["result"] = result.model_dump(mode="json") if result is not None else None
+    return verification_result
 
 
 @router.get("/quick/recent-incidents")
@@ -27,7 +152,8 @@ async def recent_incidents(
     severity: Optional[str] = Query(default=None, description="Filtrar por severidad (critical, major, minor, info)"),
     service: Optional[str] = Query(default=None, description="Filtrar por servicio"),
     include_duplicates: bool = Query(default=False, description="Incluir alertas duplicadas"),
-    analyze_with_ai: bool = Query(default=False, description="Análisis enriquecido con IA"),
+    analyze_with_ai: Optional[bool] = Query(default=None, description="Análisis enriquecido con IA (default: quick_commands.ai_analysis)"),
+    output_format: OutputFormat = Query(default="markdown", alias="format", description="Formato: markdown | json | chat (modo directo)"),
 ):
     """
     Obtiene reporte de incidencias recientes del sistema.
@@ -38,6 +164,17 @@ async def recent_incidents(
     - `/api/quick/recent-incidents?service=auth-service&hours=12` - auth-service últimas 12h
     """
     try:
+        if not _use_ai(analyze_with_ai):
+            result = await asyncio.to_thread(
+                quick_commands._build_recent_incidents,
+                hours=hours,
+                severity=severity,
+                service=service,
+                include_duplicates=include_duplicates,
+                analyze_with_ai=False,
+            )
+            return _direct_response(result, output_format)
+        
         prompt = f"Dame las incidencias recientes de las últimas {hours} horas"
         if severity:
             prompt += f" con severidad {severity}"
@@ -45,11 +182,10 @@ async def recent_incidents(
             prompt += f" del servicio {service}"
         if include_duplicates:
             prompt += " incluyendo duplicadas"
-        if analyze_with_ai:
-            prompt += " con análisis detallado"
+        prompt += " con análisis detallado"
         
-        result = await query_agent.arun(input=prompt)
-        return {"report": result.content if hasattr(result, 'content') else str(result)}
+        result = await model_router.arun(query_agent, "query", input=prompt)
+        return {"report": result.content if hasattr(result, 'content') else str(result), "execution": "agent"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al obtener incidencias: {str(e)}")
 
@@ -58,7 +194,8 @@ async def recent_incidents(
 async def service_health(
     services: Optional[str] = Query(default=None, description="Servicios separados por coma (ej: auth-service,payment-service)"),
     include_metrics: bool = Query(default=True, description="Incluir métricas actuales"),
-    analyze_with_ai: bool = Query(default=False, description="Análisis con IA"),
+    analyze_with_ai: Optional[bool] = Query(default=None, description="Análisis con IA (default: quick_commands.ai_analysis)"),
+    output_format: OutputFormat = Query(default="markdown", alias="format", description="Formato: markdown | json | chat (modo directo)"),
 ):
     """
     Genera reporte del estado actual de salud de servicios.
@@ -69,16 +206,24 @@ async def service_health(
     - `/api/quick/health?include_metrics=false` - Sin métricas detalladas
     """
     try:
+        if not _use_ai(analyze_with_ai):
+            result = await asyncio.to_thread(
+                quick_commands._build_service_health_summary,
+                services=[s.strip() for s in services.split(",") if s.strip()] if services else None,
+                include_metrics=include_metrics,
+                analyze_with_ai=False,
+            )
+            return _direct_response(result, output_format)
+        
         prompt = "Dame el health summary de los servicios"
         if services:
             prompt += f" {services}"
         if not include_metrics:
             prompt += " sin métricas detalladas"
-        if analyze_with_ai:
-            prompt += " con análisis detallado"
+        prompt += " con análisis detallado"
         
-        result = await query_agent.arun(input=prompt)
-        return {"report": result.content if hasattr(result, 'content') else str(result)}
+        result = await model_router.arun(query_agent, "query", input=prompt)
+        return {"report": result.content if hasattr(result, 'content') else str(result), "execution": "agent"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al obtener health summary: {str(e)}")
 
@@ -88,7 +233,8 @@ async def post_deployment(
     service: str = Query(..., description="Nombre del servicio deployado"),
     deployment_time: str = Query(..., description="Timestamp del deployment (ISO 8601)"),
     monitoring_window_hours: int = Query(default=2, ge=1, le=24, description="Ventana de monitoreo (1-24h)"),
-    analyze_with_ai: bool = Query(default=True, description="Análisis con IA"),
+    analyze_with_ai: Optional[bool] = Query(default=None, description="Análisis con IA (default: quick_commands.ai_analysis)"),
+    output_format: OutputFormat = Query(default="markdown", alias="format", description="Formato: markdown | json | chat (modo directo)"),
 ):
     """
     Monitorea un servicio después de un deployment buscando anomalías.
@@ -98,12 +244,21 @@ async def post_deployment(
     - `/api/quick/post-deployment?service=payment-service&deployment_time=2025-12-10T16:30:00Z&monitoring_window_hours=4`
     """
     try:
+        if not _use_ai(analyze_with_ai):
+            result = await asyncio.to_thread(
+                quick_commands._build_post_deployment,
+                service=service,
+                deployment_time=deployment_time,
+                monitoring_window_hours=monitoring_window_hours,
+                analyze_with_ai=False,
+            )
+            return _direct_response(result, output_format)
+        
         prompt = f"Monitorear post-deployment de {service} deployado el {deployment_time} durante {monitoring_window_hours} horas"
-        if analyze_with_ai:
-            prompt += " con análisis detallado"
+        prompt += " con análisis detallado"
         
-        result = await query_agent.arun(input=prompt)
-        return {"report": result.content if hasattr(result, 'content') else str(result)}
+        result = await model_router.arun(query_agent, "query", input=prompt)
+        return {"report": result.content if hasattr(result, 'content') else str(result), "execution": "agent"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al monitorear post-deployment: {str(e)}")
 
@@ -114,7 +269,8 @@ async def analyze_trends_endpoint(
     service: Optional[str] = Query(default=None, description="Servicio a analizar (default: todos)"),
     period_hours: int = Query(default=24, ge=1, le=168, description="Período a analizar (1-168h)"),
     compare_with_previous: bool = Query(default=True, description="Comparar con período anterior"),
-    analyze_with_ai: bool = Query(default=True, description="Análisis con IA"),
+    analyze_with_ai: Optional[bool] = Query(default=None, description="Análisis con IA (default: quick_commands.ai_analysis)"),
+    output_format: OutputFormat = Query(default="markdown", alias="format", description="Formato: markdown | json | chat (modo directo)"),
 ):
     """
     Analiza tendencias de métricas comparando períodos.
@@ -124,17 +280,27 @@ async def analyze_trends_endpoint(
     - `/api/quick/trends?metric=error_rate&service=auth-service&period_hours=12` - Error rate últimas 12h
     """
     try:
+        if not _use_ai(analyze_with_ai):
+            result = await asyncio.to_thread(
+                quick_commands._build_trends,
+                metric=metric,
+                service=service,
+                period_hours=period_hours,
+                compare_with_previous=compare_with_previous,
+                analyze_with_ai=False,
+            )
+            return _direct_response(result, output_format)
+        
         prompt = f"Analizar tendencias de {metric}"
         if service:
             prompt += f" para el servicio {service}"
         prompt += f" en las últimas {period_hours} horas"
         if compare_with_previous:
             prompt += " comparando con el período anterior"
-        if analyze_with_ai:
-            prompt += " con análisis detallado"
+        prompt += " con análisis detallado"
         
-        result = await query_agent.arun(input=prompt)
-        return {"report": result.content if hasattr(result, 'content') else str(result)}
+        result = await model_router.arun(query_agent, "query", input=prompt)
+        return {"report": result.content if hasattr(result, 'content') else str(result), "execution": "agent"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al analizar tendencias: {str(e)}")
 
@@ -143,7 +309,8 @@ async def analyze_trends_endpoint(
 async def daily_digest(
     date: Optional[str] = Query(default=None, description="Fecha en formato YYYY-MM-DD (default: ayer)"),
     include_all_services: bool = Query(default=True, description="Incluir todos los servicios"),
-    analyze_with_ai: bool = Query(default=True, description="Resumen ejecutivo con IA"),
+    analyze_with_ai: Optional[bool] = Query(default=None, description="Resumen ejecutivo con IA (default: quick_commands.ai_analysis)"),
+    output_format: OutputFormat = Query(default="markdown", alias="format", description="Formato: markdown | json | chat (modo directo)"),
 ):
     """
     Genera resumen diario de actividad del sistema.
@@ -152,8 +319,15 @@ async def daily_digest(
     - `/api/quick/daily-digest` - Digest de ayer
     - `/api/quick/daily-digest?date=2025-12-09` - Digest de fecha específica
     - `/api/quick/daily-digest?include_all_services=false` - Solo servicios con incidencias
+    
+    El digest de ayer se precomputa a `quick_commands.daily_digest_time`.
     """
     try:
+        if not _use_ai(analyze_with_ai):
+            # Artefacto precomputado si existe; sino se genera (y se guarda si es un día completo)
+            result, source = await digest_scheduler.get_result(date, include_all_services)
+            return {**_direct_response(result, output_format), "source": source}
+        
         prompt = "Generar resumen diario"
         if date:
             prompt += f" para la fecha {date}"
@@ -161,23 +335,93 @@ async def daily_digest(
             prompt += " de ayer"
         if not include_all_services:
             prompt += " solo de servicios con incidencias"
-        if analyze_with_ai:
-            prompt += " con resumen ejecutivo detallado"
+        prompt += " con resumen ejecutivo detallado"
         
-        result = await query_agent.arun(input=prompt)
-        return {"report": result.content if hasattr(result, 'content') else str(result)}
+        result = await model_router.arun(query_agent, "query", input=prompt)
+        return {"report": result.content if hasattr(result, 'content') else str(result), "execution": "agent"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al generar daily digest: {str(e)}")
 
 
+async def _help_report() -> str:
+    """Ayuda de los quick commands formateada como markdown para el chat."""
+    help_data = await quick_commands_help()
+    report = "# Quick Commands - Ayuda\n\n"
+    report += "Los comandos rápidos incluyen **verificación automática** de evidencia y **recomendaciones** sobre si la situación es accionable.\n\n"
+    
+    for cmd, info in help_data["quick_commands"].items():
+        aliases = CANONICAL_TO_ALIASES.get(cmd, [])
+        report += f"## {cmd}\n"
+        report += f"**Aliases**: {', '.join([f'`/{a}`' for a in aliases])}\n\n"
+        report += f"{info['description']}\n\n"
+        report += f"**Ejemplo REST**: `{info['example']}`\n\n"
+        if info.get("slash_examples"):
+            report += f"**Ejemplos slash**: " + ", ".join([f"`{ex}`" for ex in info["slash_examples"][:2]]) + "\n\n"
+    
+    report += "\n---\n\n"
+    report += "## Interpretación de Recomendaciones\n\n"
+    report += "- 🔔 **NOTIFY** (Accionable): Situación que requiere atención o acción inmediata\n"
+    report += "- ℹ️ **FYI** (Informativo): Información útil pero sin acción requerida\n\n"
+    report += "Cada reporte incluye:\n"
+    report += "- **Evidencia**: Checks adicionales ejecutados para validar la situación\n"
+    report += "- **Recomendación**: Nivel (notify/fyi), razón y confianza\n"
+    return report
+
+
+async def _execute_command(
+    canonical: str,
+    params: Dict[str, str],
+    args_text: str,
+    stale_while_revalidate: Optional[bool],
+    output_format: OutputFormat = "markdown",
+    before_run: Optional[Callable[[], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Resultado de un comando parseado: cache de resultados o ejecución.
+    
+    `before_run` se espera solo si el comando realmente se ejecuta (miss del
+    cache); el batch lo usa para precargar los datos compartidos.
+    """
+    from agent.slash_commands import apply_dedupe_recommendation
+    
+    if canonical == "help":
+        return {"report": await _help_report()}
+    
+    async def produce() -> Dict[str, Any]:
+        if before_run is not None:
+            await before_run()
+        return await _run_slash_command(canonical, params, args_text)
+    
+    # Cache de resultados ANTES de ejecutar; comandos idénticos en curso se coalescen
+    bucket = command_time_bucket(command_cache.bucket_seconds)
+    if stale_while_revalidate is None:
+        stale_while_revalidate = _config.quick_commands_stale_while_revalidate
+    verification_result, cache_status = await command_cache.get_or_execute(
+        canonical,
+        build_command_cache_key(canonical, params, args_text, bucket),
+        produce,
+        stale_key=build_command_cache_key(canonical, params, args_text, bucket - 1) if stale_while_revalidate else None,
+    )
+    
+    if cache_status in ("hit", "stale"):
+        # Resultado reutilizado: mismo tratamiento que un duplicado (FYI)
+        cached_at = verification_result.pop("cached_at", None)
+        time_since = time.time() - cached_at if cached_at else None
+        verification_result = apply_dedupe_recommendation(verification_result, True, time_since)
+    
+    verification_result["cache"] = cache_status
+    return _format_command_response(verification_result, output_format)
+
+
 @router.post("/quick/command")
 async def execute_slash_command(request: CommandRequest):
     """
     Ejecuta un slash command con workflow de verificación, evidencia y dedupe.
     
     Este endpoint:
-    1. Parsea el comando y resuelve aliases
-    2. Ejecuta el comando base (vía QueryAgent o tool directo)
+    1. Parsea el comando y resuelve aliases; busca el resultado en el cache
+       (comando + params normalizados + ventana) o se suma a una ejecución en curso
+    2. Ejecuta el comando base (tool directo, o QueryAgent si hay analyze_with_ai o texto libre)
     3. Ejecuta workflow de verificación para obtener evidencia adicional
     4. Aplica deduplicación para evitar spam
     5. Devuelve reporte + evidencia + recomendación (notify/fyi)
@@ -187,79 +431,76 @@ async def execute_slash_command(request: CommandRequest):
     - `{"command": "/salud"}` - Health check con contexto de incidencias
     - `{"command": "/deploy service=auth-service deployment_time=2025-12-10T14:00:00Z"}` - Post-deployment con análisis
     """
-    from agent.slash_commands import (
-        run_verification_workflow,
-        check_dedupe,
-        apply_dedupe_recommendation,
-    )
+    parsed = parse_slash_command(request.command)
+    if not parsed:
+        raise HTTPException(status_code=400, detail=f"Comando inválido: {request.command}")
     
     try:
-        parsed = parse_slash_command(request.command)
-        
-        if not parsed:
-            raise HTTPException(status_code=400, detail=f"Comando inválido: {request.command}")
-        
         canonical, params, args_text = parsed
-        
-        # Si es help, devolver ayuda
-        if canonical == "help":
-            help_data = await quick_commands_help()
-            # Formatear como markdown para el chat
-            report = "# Quick Commands - Ayuda\n\n"
-            report += "Los comandos rápidos incluyen **verificación automática** de evidencia y **recomendaciones** sobre si la situación es accionable.\n\n"
-            
-            for cmd, info in help_data["quick_commands"].items():
-                aliases = CANONICAL_TO_ALIASES.get(cmd, [])
-                report += f"## {cmd}\n"
-                report += f"**Aliases**: {', '.join([f'`/{a}`' for a in aliases])}\n\n"
-                report += f"{info['description']}\n\n"
-                report += f"**Ejemplo REST**: `{info['example']}`\n\n"
-                if info.get("slash_examples"):
-                    report += f"**Ejemplos slash**: " + ", ".join([f"`{ex}`" for ex in info["slash_examples"][:2]]) + "\n\n"
-            
-            report += "\n---\n\n"
-            report += "## Interpretación de Recomendaciones\n\n"
-            report += "- 🔔 **NOTIFY** (Accionable): Situación que requiere atención o acción inmediata\n"
-            report += "- ℹ️ **FYI** (Informativo): Información útil pero sin acción requerida\n\n"
-            report += "Cada reporte incluye:\n"
-            report += "- **Evidencia**: Checks adicionales ejecutados para validar la situación\n"
-            report += "- **Recomendación**: Nivel (notify/fyi), razón y confianza\n"
-            
-            return {"report": report}
-        
-        # Construir prompt para QueryAgent
-        prompt = build_query_agent_prompt(canonical, params, args_text)
-        
-        # Ejecutar comando base con QueryAgent
-        result = await query_agent.arun(input=prompt)
-        base_report = result.content if hasattr(result, 'content') else str(result)
-        
-        # Ejecutar workflow de verificación con evidencia
-        verification_result = run_verification_workflow(canonical, params, base_report)
-        
-        # Aplicar deduplicación
-        is_duplicate, cached_report = check_dedupe(canonical, params, verification_result["report"])
-        
-        if is_duplicate:
-            # Devolver resultado cacheado con nota de dedupe
-            # Calcular tiempo transcurrido (aproximado)
-            from datetime import datetime, timezone
-            from agent.slash_commands import _dedupe_cache, _compute_fingerprint, _extract_keywords_from_report
-            
-            keywords = _extract_keywords_from_report(verification_result["report"])
-            fingerprint = _compute_fingerprint(canonical, params, keywords)
-            
-            if fingerprint in _dedupe_cache:
-                cached_entry = _dedupe_cache[fingerprint]
-                time_since = (datetime.now(timezone.utc) - cached_entry["timestamp"]).total_seconds()
-                verification_result = apply_dedupe_recommendation(verification_result, True, time_since)
-        
-        return verification_result
-        
+        return await _execute_command(canonical, params, args_text, request.stale_while_revalidate, request.format)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error ejecutando comando: {str(e)}")
 
 
+@router.post("/quick/commands")
+async def execute_slash_commands(request: BatchCommandRequest):
+    """
+    Ejecuta varios slash commands en un request, leyendo cada dataset una vez.
+    
+    Parsea todos los comandos, arma el plan con la unión de los datos que leen
+    (rango de alertas, alertas activas, métricas por servicio) y los precarga
+    en un contexto de datos compartido antes de ejecutar. Los comandos corren
+    en paralelo; cada uno pasa por el cache de resultados igual que en
+    `/quick/command`, y si todos son hits no se precarga nada.
+    
+    Un comando que falla devuelve `error` en su posición sin afectar al resto.
+    
+    **Ejemplo**:
+    - `{"commands": ["/salud", "/novedades hoy", "/tendencias"]}`
+    """
+    if not request.commands:
+        raise HTTPException(status_code=400, detail="La lista de comandos está vacía")
+    if len(request.commands) > _config.quick_commands_batch_max_commands:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo {_config.quick_commands_batch_max_commands} comandos por request",
+        )
+    
+    parsed_commands = [parse_slash_command(command) for command in request.commands]
+    invalid = [command for command, parsed in zip(request.commands, parsed_commands) if not parsed]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Comandos inválidos: {', '.join(invalid)}")
+    
+    with data_context_scope() as context:
+        plan = plan_command_data([parsed for parsed in parsed_commands if parsed[0] != "help"], context.now)
+        prefetch_task: Optional[asyncio.Future] = None
+        
+        async def prefetch_once() -> None:
+            nonlocal prefetch_task
+            if prefetch_task is None:
+                prefetch_task = asyncio.ensure_future(prefetch(plan))
+            await asyncio.shield(prefetch_task)
+        
+        results = await asyncio.gather(
+            *[
+                _execute_command(
+                    canonical, params, args_text, request.stale_while_revalidate, request.format, prefetch_once
+                )
+                for canonical, params, args_text in parsed_commands
+            ],
+            return_exceptions=True,
+        )
+    
+    return {
+        "results": [
+            {"command": command, "error": f"Error ejecutando comando: {str(result)}"}
+            if isinstance(result, Exception) else {"command": command, **result}
+            for command, result in zip(request.commands, results)
+        ],
+        "data_plan": {**plan.summary(), "prefetched": prefetch_task is not None},
+    }
+
+
 @router.get("/quick/help")
 async def quick_commands_help():
     """
@@ -281,11 +522,11 @@ async def quick_commands_help():
                     "severity": "Filtrar por severidad (critical, major, minor, info)",
                     "service": "Filtrar por servicio",
                     "include_duplicates": "Incluir duplicadas (default: false)",
-                    "analyze_with_ai": "Análisis IA (default: false)",
+                    "analyze_with_ai": "Análisis IA vía QueryAgent (default: quick_commands.ai_analysis)",
                 },
                 "example": "/api/quick/recent-incidents?hours=8&severity=critical",
                 "slash_examples": ["/novedades hoy", "/inc hours=8 severity=critical", "/ri 8h"],
-                "verification_checks": ["health", "trends"],
+                "verification_checks": CANONICAL_PROMPTS["recent-incidents"]["evidence_checks"],
             },
             "health": {
                 "description": "Estado actual de salud de servicios con contexto de incidencias recientes",
@@ -293,11 +534,11 @@ async def quick_commands_help():
                 "parameters": {
                     "services": "Servicios separados por coma (default: todos)",
                     "include_metrics": "Incluir métricas (default: true)",
-                    "analyze_with_ai": "Análisis IA (default: false)",
+                    "analyze_with_ai": "Análisis IA vía QueryAgent (default: quick_commands.ai_analysis)",
                 },
                 "example": "/api/quick/health?services=auth-service,payment-service",
                 "slash_examples": ["/salud", "/health services=auth-service,payment-service", "/estado"],
-                "verification_checks": ["recent-incidents"],
+                "verification_checks": CANONICAL_PROMPTS["health"]["evidence_checks"],
             },
             "post-deployment": {
                 "description": "Monitoreo post-deployment con comparación pre/post y análisis de anomalías",
@@ -306,11 +547,11 @@ async def quick_commands_help():
                     "service": "Nombre del servicio (required)",
                     "deployment_time": "Timestamp ISO 8601 (required)",
                     "monitoring_window_hours": "Ventana de monitoreo (1-24h, default: 2)",
-                    "analyze_with_ai": "Análisis IA (default: true)",
+                    "analyze_with_ai": "Análisis IA vía QueryAgent (default: quick_commands.ai_analysis)",
                 },
                 "example": "/api/quick/post-deployment?service=auth-service&deployment_time=2025-12-10T14:00:00Z",
                 "slash_examples": ["/deploy service=auth-service deployment_time=2025-12-10T14:00:00Z", "/pd service=auth deployment_time=2025-12-10T14:00:00Z"],
-                "verification_checks": ["trends", "recent-incidents"],
+                "verification_checks": CANONICAL_PROMPTS["post-deployment"]["evidence_checks"],
             },
             "trends": {
                 "description": "Análisis de tendencias con comparación de períodos y contexto de salud",
@@ -320,11 +561,11 @@ async def quick_commands_help():
                     "service": "Servicio a analizar (default: todos)",
                     "period_hours": "Período a analizar (1-168h, default: 24)",
                     "compare_with_previous": "Comparar con período anterior (default: true)",
-                    "analyze_with_ai": "Análisis IA (default: true)",
+                    "analyze_with_ai": "Análisis IA vía QueryAgent (default: quick_commands.ai_analysis)",
                 },
                 "example": "/api/quick/trends?metric=alert_count&period_hours=24",
                 "slash_examples": ["/tendencias period_hours=48", "/tr metric=alert_count", "/tend 24h"],
-                "verification_checks": ["health"],
+                "verification_checks": CANONICAL_PROMPTS["trends"]["evidence_checks"],
             },
             "daily-digest": {
                 "description": "Resumen diario con detección automática de incidentes críticos",
@@ -332,16 +573,18 @@ async def quick_commands_help():
                 "parameters": {
                     "date": "Fecha YYYY-MM-DD (default: ayer)",
                     "include_all_services": "Incluir todos los servicios (default: true)",
-                    "analyze_with_ai": "Resumen ejecutivo con IA (default: true)",
+                    "analyze_with_ai": "Resumen ejecutivo con IA vía QueryAgent (default: quick_commands.ai_analysis)",
                 },
                 "example": "/api/quick/daily-digest?date=2025-12-09",
                 "slash_examples": ["/digest ayer", "/diario date=2025-12-09", "/dd"],
-                "verification_checks": [],
+                "verification_checks": CANONICAL_PROMPTS["daily-digest"]["evidence_checks"],
             },
         },
         "features": {
-            "verification": "Cada comando ejecuta checks adicionales de evidencia para validar la situación",
+            "direct_execution": "Sin analyze_with_ai ni texto libre, los comandos se ejecutan directo sin LLM",
+            "verification": "Cada comando ejecuta checks adicionales de evidencia en paralelo (timeout por check: quick_commands.evidence_timeout_seconds)",
             "deduplication": "Sistema de dedupe (TTL 30 min) para evitar notificaciones repetitivas",
+            "result_cache": "Comandos idénticos dentro de la misma ventana (quick_commands.cache_bucket_seconds) reutilizan el resultado sin re-ejecutar; los concurrentes comparten una ejecución",
             "recommendations": "Cada reporte incluye recomendación: NOTIFY (accionable) o FYI (informativo)",
         },
         "recommendation_criteria": {
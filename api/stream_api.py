@@ -0,0 +1,122 @@
+"""API de streaming (SSE) para seguimiento en vivo."""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from agent.streams.health_watch import health_watch_hub
+from agent.streams.log_tail import log_tail_hub
+from tools import loki_tool
+
+router = APIRouter()
+
+# Comentario SSE periódico para mantener viva la conexión a través de proxies
+_HEARTBEAT_SECONDS = 15
+
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def _queue_to_sse(request: Request, queue: asyncio.Queue) -> AsyncIterator[str]:
+    """Reenvía eventos de una cola de suscripción como SSE hasta que el cliente se desconecte."""
+    while not await request.is_disconnected():
+        try:
+            event = await asyncio.wait_for(queue.get(), timeout=_HEARTBEAT_SECONDS)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        yield _format_sse(event.get("type", "message"), event)
+
+
+async def _log_tail_stream(request: Request, service: str, level: str) -> AsyncIterator[str]:
+    async with log_tail_hub.subscribe(service, level) as queue:
+        yield _format_sse("subscribed", {"service": service, "level": level})
+        async for chunk in _queue_to_sse(request, queue):
+            yield chunk
+
+
+@router.get("/logs/tail")
+async def tail_logs(
+    request: Request,
+    service: str = Query(..., description="Servicio a seguir"),
+    level: str = Query(default="error", description="Filtro de nivel (error, warn, all)"),
+):
+    """
+    Stream SSE de logs en vivo de un servicio.
+    
+    Todos los clientes con el mismo (service, level) comparten un único tail
+    upstream contra Loki. Eventos emitidos:
+    - `line`: línea de log (limitado a `tail_max_lines_per_second` por canal)
+    - `summary`: patrones agregados de la última ventana, incluyendo líneas suprimidas
+    - `error`: desconexión del upstream (se reintenta automáticamente)
+    
+    **Ejemplo**: `curl -N "/api/logs/tail?service=auth-service&level=error"`
+    """
+    if level not in loki_tool.TAIL_LEVEL_FILTERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Nivel inválido: {level}. Opciones: {', '.join(loki_tool.TAIL_LEVEL_FILTERS)}",
+        )
+    return StreamingResponse(
+        _log_tail_stream(request, service, level),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.get("/logs/tail/stats")
+async def tail_stats() -> Dict[str, Any]:
+    """Canales de tail activos y cantidad de suscriptores por canal."""
+    return {"channels": log_tail_hub.stats()}
+
+
+async def _health_watch_stream(request: Request, services: List[str], include_metrics: bool) -> AsyncIterator[str]:
+    async with health_watch_hub.subscribe(services, include_metrics) as queue:
+        yield _format_sse("subscribed", {
+            "services": services or "all",
+            "include_metrics": include_metrics,
+            "interval_seconds": health_watch_hub.interval_seconds,
+        })
+        async for chunk in _queue_to_sse(request, queue):
+            yield chunk
+
+
+@router.get("/health/watch")
+async def watch_health(
+    request: Request,
+    services: Optional[str] = Query(default=None, description="Servicios separados por coma (default: todos)"),
+    include_metrics: bool = Query(default=True, description="Incluir error rate y latencia P95"),
+):
+    """
+    Stream SSE de la salud de servicios con cambios empujados.
+    
+    Todos los clientes con los mismos (services, include_metrics) comparten una
+    única evaluación cada `streaming.health_watch_interval_seconds`. Eventos:
+    - `snapshot`: estado completo (al conectarse y en la primera evaluación)
+    - `changes`: solo los servicios cuyo estado cambió o cuyo error rate /
+      latencia cruzó el threshold desde el tick anterior (`changed` indica qué)
+    - `error`: falla de una evaluación (se reintenta en el próximo tick)
+    
+    **Ejemplo**: `curl -N "/api/health/watch?services=auth-service,payment-service"`
+    """
+    service_list = [s.strip() for s in services.split(",") if s.strip()] if services else []
+    return StreamingResponse(
+        _health_watch_stream(request, service_list, include_metrics),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.get("/health/watch/stats")
+async def health_watch_stats() -> Dict[str, Any]:
+    """Watches de salud activos con suscriptores y evaluaciones realizadas."""
+    return {"watches": health_watch_hub.stats()}
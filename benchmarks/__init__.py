@@ -0,0 +1 @@
+"""Benchmarks offline del servicio (ver benchmarks/run.py)."""
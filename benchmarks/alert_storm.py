@@ -0,0 +1,381 @@
+"""
+Generador de tormentas de alertas sintéticas para pruebas de carga y soak.
+
+Arma webhooks `AlertmanagerWebhook` realistas (grupos por alertname+service
+como el `group_by` de Alertmanager, fingerprints estables por instancia,
+re-notificaciones de grupos activos y resoluciones) y los reproduce contra
+`POST /api/alerts` a una tasa objetivo con un patrón de llegada:
+
+- steady: intervalo constante (1 / rate)
+- bursty: Poisson alternando ráfagas (3x durante el 20% de cada ciclo) y calma
+- diurnal: Poisson con tasa sinusoidal; un "día" dura `--period` segundos
+
+La reproducción es de lazo abierto: cada webhook sale en su instante
+programado aunque los anteriores no hayan respondido (hasta
+`--max-in-flight`), así que el retraso entre el instante programado y el
+envío real mide el encolamiento cuando el servicio no da abasto.
+
+    python -m benchmarks.alert_storm --rate 10 --duration 60 --pattern bursty
+    python -m benchmarks.alert_storm --url http://localhost:7777 --rate 5 --duration 3600 --pattern diurnal
+    python -m benchmarks.alert_storm --dump storm.jsonl --duration 60
+
+Sin `--url` corre offline con el mismo entorno que benchmarks/run.py
+(upstreams falsos, modelo fake, SQLite).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.run import _rss_bytes, distribution_ms, offline_environment, start_app
+
+PATTERNS = ("steady", "bursty", "diurnal")
+
+# Ráfagas: 3x la tasa durante el 20% de cada ciclo; el resto a 0.5x (promedio = rate)
+_BURST_FRACTION = 0.2
+_BURST_FACTOR = 3.0
+_CALM_FACTOR = (1 - _BURST_FRACTION * _BURST_FACTOR) / (1 - _BURST_FRACTION)
+# Diurno: la tasa oscila entre 0.2x y 1.8x
+_DIURNAL_AMPLITUDE = 0.8
+
+_ALERTS_BY_SEVERITY: Dict[str, List[Tuple[str, str]]] = {
+    "critical": [("HighErrorRate", "Error rate above 5%"), ("ServiceDown", "Service not responding")],
+    "major": [("HighLatency", "P95 latency above 1s"), ("PodCrashLooping", "Pod restarting repeatedly")],
+    "minor": [("HighMemoryUsage", "Memory usage above 85%"), ("DiskSpaceLow", "Disk usage above 90%")],
+    "warning": [("HighCPUUsage", "CPU usage above 80%"), ("CertificateExpiringSoon", "TLS certificate expires in 7 days")],
+}
+
+DEFAULT_SEVERITY_MIX = {"critical": 0.1, "major": 0.2, "minor": 0.3, "warning": 0.4}
+
+
+@dataclass
+class StormProfile:
+    """Forma de la tormenta: qué alertas, cuánto se repiten y cuánto se resuelven."""
+
+    services: List[str]
+    severity_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_SEVERITY_MIX))
+    # Probabilidad de que un webhook re-notifique un grupo activo (mismos fingerprints → dedup)
+    repeat_ratio: float = 0.3
+    # Probabilidad de que un webhook resuelva un grupo activo
+    resolved_ratio: float = 0.1
+    group_size: Tuple[int, int] = (1, 5)
+    seed: int = 42
+
+
+@dataclass
+class _Group:
+    key: str
+    alertname: str
+    severity: str
+    service: str
+    summary: str
+    alerts: List[Dict[str, Any]]
+
+
+class AlertStormGenerator:
+    """Genera webhooks sucesivos manteniendo los grupos activos (firing) entre llamadas."""
+
+    def __init__(self, profile: StormProfile):
+        self.profile = profile
+        self.rng = random.Random(profile.seed)
+        self.active: Dict[str, _Group] = {}
+        self.fingerprints: set = set()
+        self.stats: Dict[str, int] = defaultdict(int)
+        self._instances = 0
+
+    def _fingerprint(self, labels: Dict[str, str]) -> str:
+        # Alertmanager usa un hash de 64 bits del label set
+        canonical = ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+    def _fire(self, now: str) -> _Group:
+        """Alertas nuevas; si su grupo ya está activo se suman a él (como en Alertmanager)."""
+        severities = list(self.profile.severity_mix)
+        severity = self.rng.choices(severities, weights=[self.profile.severity_mix[s] for s in severities])[0]
+        alertname, summary = self.rng.choice(_ALERTS_BY_SEVERITY[severity])
+        service = self.rng.choice(self.profile.services)
+        key = f'{{}}:{{alertname="{alertname}", service="{service}"}}'
+        group = self.active.get(key)
+        if group is None:
+            group = self.active[key] = _Group(key, alertname, severity, service, summary, [])
+        for _ in range(self.rng.randint(*self.profile.group_size)):
+            self._instances += 1
+            labels = {
+                "alertname": alertname,
+                "severity": severity,
+                "service": service,
+                "instance": f"{service}-{self._instances:06d}",
+            }
+            fingerprint = self._fingerprint(labels)
+            self.fingerprints.add(fingerprint)
+            group.alerts.append({
+                "status": "firing",
+                "labels": labels,
+                "annotations": {"summary": summary, "description": f"{service}: {summary.lower()}"},
+                "startsAt": now,
+                "generatorURL": f"http://grafana/alerting/{alertname}",
+                "fingerprint": fingerprint,
+            })
+        return group
+
+    def next_payload(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Próximo webhook: alertas nuevas, re-notificación de un grupo activo o resolución."""
+        timestamp = (now or datetime.now(timezone.utc)).isoformat()
+        roll = self.rng.random()
+        group: Optional[_Group] = None
+        status = "firing"
+        if self.active and roll < self.profile.resolved_ratio:
+            group = self.active.pop(self.rng.choice(list(self.active)))
+            status = "resolved"
+        elif self.active and roll < self.profile.resolved_ratio + self.profile.repeat_ratio:
+            group = self.active[self.rng.choice(list(self.active))]
+            self.stats["repeated_webhooks"] += 1
+        if group is None:
+            group = self._fire(timestamp)
+
+        alerts = []
+        for alert in group.alerts:
+            alert = dict(alert, status=status)
+            if status == "resolved":
+                alert["endsAt"] = timestamp
+            alerts.append(alert)
+        self.stats["webhooks"] += 1
+        self.stats[f"{status}_alerts"] += len(alerts)
+        group_labels = {"alertname": group.alertname, "service": group.service}
+        return {
+            "receiver": "agno-webhook",
+            "status": status,
+            "alerts": alerts,
+            "groupLabels": group_labels,
+            "commonLabels": dict(group_labels, severity=group.severity),
+            "commonAnnotations": {"summary": group.summary},
+            "externalURL": "http://alertmanager:9093",
+            "version": "4",
+            "groupKey": group.key,
+            "truncatedAlerts": 0,
+        }
+
+    def summary(self) -> Dict[str, int]:
+        return dict(self.stats, unique_fingerprints=len(self.fingerprints), active_groups=len(self.active))
+
+
+def _rate_factor(pattern: str, t: float, period: float) -> float:
+    """Multiplicador de la tasa en el instante t (promedio 1 sobre un período)."""
+    if pattern == "bursty":
+        return _BURST_FACTOR if (t % period) < period * _BURST_FRACTION else _CALM_FACTOR
+    if pattern == "diurnal":
+        # Empieza en el valle (madrugada) y llega al pico a mitad del período
+        return 1 - _DIURNAL_AMPLITUDE * math.cos(2 * math.pi * t / period)
+    return 1.0
+
+
+def arrival_offsets(pattern: str, rate: float, duration: float, period: float, rng: random.Random) -> List[float]:
+    """
+    Instantes de llegada (segundos desde el inicio) para el patrón pedido.
+
+    steady es determinístico; bursty y diurnal son Poisson no homogéneos
+    generados por thinning sobre la tasa máxima del patrón.
+    """
+    if rate <= 0:
+        return []
+    if pattern == "steady":
+        return [i / rate for i in range(int(rate * duration))]
+    max_rate = rate * (_BURST_FACTOR if pattern == "bursty" else 1 + _DIURNAL_AMPLITUDE)
+    offsets, t = [], 0.0
+    while True:
+        t += rng.expovariate(max_rate)
+        if t >= duration:
+            return offsets
+        if rng.random() * max_rate <= rate * _rate_factor(pattern, t, period):
+            offsets.append(t)
+
+
+async def replay(
+    client: Any,
+    generator: AlertStormGenerator,
+    offsets: List[float],
+    max_in_flight: int,
+    path: str = "/api/alerts",
+) -> Dict[str, Any]:
+    """
+    Envía un webhook por instante de `offsets` (lazo abierto) y mide el resultado.
+
+    El retraso de encolamiento es el envío real menos el instante programado:
+    incluye el atraso del scheduler y la espera por `max_in_flight`.
+    """
+    semaphore = asyncio.Semaphore(max_in_flight)
+    latencies: List[float] = []
+    queue_delays: List[float] = []
+    status_codes: Dict[str, int] = defaultdict(int)
+    timeline: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    errors = 0
+    start = time.perf_counter()
+
+    async def send(offset: float, payload: Dict[str, Any]) -> None:
+        nonlocal errors
+        async with semaphore:
+            sent = time.perf_counter()
+            queue_delays.append(max(0.0, sent - start - offset))
+            try:
+                response = await client.post(path, json=payload)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            status_codes[status] += 1
+            bucket = timeline[int(offset)]
+            if status.isdigit() and int(status) < 400:
+                latencies.append(time.perf_counter() - sent)
+                bucket["completed"] += 1
+            else:
+                errors += 1
+                bucket["errors"] += 1
+
+    tasks = []
+    for offset in offsets:
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        timeline[int(offset)]["scheduled"] += 1
+        tasks.append(asyncio.create_task(send(offset, generator.next_payload())))
+    send_elapsed = time.perf_counter() - start
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    scheduled_span = offsets[-1] if offsets else 0.0
+    return {
+        "scheduled": len(offsets),
+        "completed": len(latencies),
+        "errors": errors,
+        "error_rate": round(errors / len(offsets), 4) if offsets else 0.0,
+        "status_codes": dict(status_codes),
+        "duration_seconds": round(elapsed, 2),
+        "offered_rate_rps": round(len(offsets) / scheduled_span, 2) if scheduled_span else 0.0,
+        "send_rate_rps": round(len(offsets) / send_elapsed, 2) if send_elapsed else 0.0,
+        "achieved_throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": distribution_ms(latencies),
+        "queue_delay_ms": distribution_ms(queue_delays),
+        "timeline": [dict(timeline[second], t=second) for second in sorted(timeline)],
+    }
+
+
+def _parse_severity_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        severity, _, weight = item.partition("=")
+        if severity not in _ALERTS_BY_SEVERITY:
+            raise argparse.ArgumentTypeError(f"Severidad desconocida: {severity}")
+        mix[severity] = float(weight)
+    return mix
+
+
+def _parse_group_size(value: str) -> Tuple[int, int]:
+    low, _, high = value.partition("-")
+    size = (int(low), int(high or low))
+    if size[0] < 1 or size[1] < size[0]:
+        raise argparse.ArgumentTypeError(f"Tamaño de grupo inválido: {value}")
+    return size
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tormenta de alertas sintéticas contra POST /api/alerts")
+    parser.add_argument("--rate", type=float, default=5, help="Webhooks por segundo (promedio)")
+    parser.add_argument("--duration", type=float, default=30, help="Segundos de tormenta")
+    parser.add_argument("--pattern", choices=PATTERNS, default="steady")
+    parser.add_argument("--period", type=float, help="Ciclo de bursty/diurnal en segundos (default: 10 / duration)")
+    parser.add_argument("--services", default="auth-service,payment-service,api-gateway,user-service,order-service")
+    parser.add_argument("--severity-mix", type=_parse_severity_mix, default=dict(DEFAULT_SEVERITY_MIX),
+                        help="Pesos por severidad, ej: critical=0.1,major=0.2,minor=0.3,warning=0.4")
+    parser.add_argument("--repeat-ratio", type=float, default=0.3, help="Fracción de webhooks que re-notifican un grupo activo")
+    parser.add_argument("--resolved-ratio", type=float, default=0.1, help="Fracción de webhooks que resuelven un grupo activo")
+    parser.add_argument("--group-size", type=_parse_group_size, default=(1, 5), help="Alertas por webhook, ej: 1-5")
+    parser.add_argument("--max-in-flight", type=int, default=16, help="Webhooks concurrentes como máximo")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", help="API a atacar (ej: http://localhost:7777); sin esto corre offline")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout por webhook con --url")
+    parser.add_argument("--llm-latency-ms", type=float, default=50, help="Offline: latencia del modelo fake")
+    parser.add_argument("--upstream-latency-ms", type=float, default=5, help="Offline: latencia de los upstreams falsos")
+    parser.add_argument("--dump", help="Solo escribe los webhooks (JSONL con offset y payload) sin enviarlos")
+    parser.add_argument("--output", default="alert_storm.json", help="Archivo JSON de resultados")
+    args = parser.parse_args(argv)
+    args.services = [s for s in args.services.split(",") if s]
+    if args.period is None:
+        args.period = 10.0 if args.pattern == "bursty" else args.duration
+    return args
+
+
+async def _run(args: argparse.Namespace, generator: AlertStormGenerator, offsets: List[float]) -> Dict[str, Any]:
+    import httpx
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            return await replay(client, generator, offsets, args.max_in_flight)
+
+    with offline_environment(args.services, args.llm_latency_ms, args.upstream_latency_ms) as (_, workdir):
+        app = await start_app(args.services, workdir, seed_alerts=0)
+        from agent.storage.redis import redis_store
+
+        rss_start = _rss_bytes()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://storm", timeout=None) as client:
+            result = await replay(client, generator, offsets, args.max_in_flight)
+        await redis_store.close()
+        result["memory"] = {
+            "rss_start_mb": round(rss_start / 2**20, 2),
+            "rss_end_mb": round(_rss_bytes() / 2**20, 2),
+        }
+        return result
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    profile = StormProfile(
+        services=args.services,
+        severity_mix=args.severity_mix,
+        repeat_ratio=args.repeat_ratio,
+        resolved_ratio=args.resolved_ratio,
+        group_size=args.group_size,
+        seed=args.seed,
+    )
+    generator = AlertStormGenerator(profile)
+    offsets = arrival_offsets(args.pattern, args.rate, args.duration, args.period, random.Random(args.seed))
+
+    if args.dump:
+        with open(args.dump, "w") as f:
+            for offset in offsets:
+                f.write(json.dumps({"offset": round(offset, 3), "payload": generator.next_payload()}) + "\n")
+        print(f"{len(offsets)} webhooks ({args.pattern}, {args.rate}/s) en {args.dump}")
+        return {"scheduled": len(offsets), "alerts": generator.summary()}
+
+    result = asyncio.run(_run(args, generator, offsets))
+    result = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "target": args.url or "offline",
+            "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "dump")},
+        },
+        "alerts": generator.summary(),
+        **result,
+    }
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(
+        f"\n[{args.pattern}] objetivo {args.rate}/s → enviado {result['send_rate_rps']}/s,"
+        f" completado {result['achieved_throughput_rps']}/s, errores {result['error_rate']:.1%}"
+    )
+    latency, queue = result["latency_ms"], result["queue_delay_ms"]
+    print(f"  latencia p50 {latency['p50']} ms  p95 {latency['p95']} ms  p99 {latency['p99']} ms")
+    print(f"  encolamiento p50 {queue['p50']} ms  p95 {queue['p95']} ms  max {queue['max']} ms")
+    print(f"\nResultados en {args.output}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Stand-ins locales de los upstreams para correr benchmarks sin red.
+
+- `FakeObservabilityServer`: HTTP con las rutas que usan prometheus_tool,
+  loki_tool y tempo_tool; respuestas determinísticas con el mismo shape que
+  los upstreams reales y latencia configurable.
+- `FakeRedisServer`: servidor RESP mínimo (HELLO, GET, MGET, SET [NX] [EX],
+  SETEX, PING) para ejercitar el cliente async real de agent/storage/redis.py.
+
+Todos corren en threads propios y escuchan en 127.0.0.1 con puerto efímero.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+_SERVICE_LABEL = re.compile(r'service="([^"]+)"')
+
+
+def _vector(services: List[str], value: float) -> List[Dict[str, Any]]:
+    now = time.time()
+    return [{"metric": {"service": s, "job": s}, "value": [now, str(value)]} for s in services]
+
+
+def _matrix(services: List[str], value: float, points: int = 30) -> List[Dict[str, Any]]:
+    now = time.time()
+    return [
+        {
+            "metric": {"service": s, "job": s},
+            "values": [[now - 30 * (points - i), str(value * (1 + (i % 5) / 10))] for i in range(points)],
+        }
+        for s in services
+    ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeObservabilityServer"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _reply(self, body: Dict[str, Any], status: int = 200) -> None:
+        self.server.count()
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _services(self, query: str) -> List[str]:
+        match = _SERVICE_LABEL.search(query)
+        return [match.group(1)] if match else self.server.services
+
+    def _prometheus(self, path: str, params: Dict[str, str]) -> Dict[str, Any]:
+        query = params.get("query", "")
+        if "http_requests_received_total" in query:
+            value = 0.002  # error rate
+        elif "histogram_quantile" in query or "duration" in query:
+            value = 0.180  # latencia P95 (s)
+        else:
+            value = 1
+        if path.endswith("/query_range"):
+            return {"status": "success", "data": {"resultType": "matrix", "result": _matrix(self._services(query), value)}}
+        return {"status": "success", "data": {"resultType": "vector", "result": _vector(self._services(query), value)}}
+
+    def _loki(self, params: Dict[str, str]) -> Dict[str, Any]:
+        service = (self._services(params.get("query", "")) or ["unknown"])[0]
+        now_ns = time.time_ns()
+        values = [
+            [str(now_ns - i * 1_000_000_000), f"level=error service={service} msg=\"upstream timeout\" request_id=r{i}"]
+            for i in range(self.server.log_lines)
+        ]
+        return {
+            "status": "success",
+            "data": {"resultType": "streams", "result": [{"stream": {"service": service, "level": "error"}, "values": values}]},
+        }
+
+    def _tempo_trace(self, trace_id: str) -> Dict[str, Any]:
+        start = time.time_ns()
+        spans = [
+            {
+                "traceId": trace_id,
+                "spanId": f"{i:016x}",
+                "parentSpanId": f"{i - 1:016x}" if i else "",
+                "name": f"op-{i}",
+                "startTimeUnixNano": str(start + i * 1_000_000),
+                "endTimeUnixNano": str(start + (i + 5) * 1_000_000),
+                "status": {},
+            }
+            for i in range(5)
+        ]
+        return {"batches": [{"resource": {"attributes": []}, "scopeSpans": [{"spans": spans}]}]}
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path.startswith("/api/v1/"):
+            self._reply(self._prometheus(url.path, params))
+        elif url.path.startswith("/loki/api/v1/"):
+            self._reply(self._loki(params))
+        elif url.path.startswith("/api/traces/"):
+            self._reply(self._tempo_trace(url.path.rsplit("/", 1)[-1]))
+        else:
+            self._reply({"status": "error", "error": f"ruta no soportada: {url.path}"}, status=404)
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if urlsplit(self.path).path == "/api/search":
+            self._reply({"traces": [{"traceID": f"{i:032x}", "durationMs": 1200 + i} for i in range(3)]})
+        else:
+            self._reply({"status": "error"}, status=404)
+
+
+class FakeObservabilityServer(ThreadingHTTPServer):
+    """Prometheus/Loki/Tempo falsos en un único servidor HTTP (una instancia por upstream)."""
+
+    daemon_threads = True
+
+    def __init__(self, services: List[str], latency_ms: float = 0, log_lines: int = 20):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.services = services
+        self.latency_ms = latency_ms
+        self.log_lines = log_lines
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> "FakeObservabilityServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-upstream", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class _RespError(str):
+    pass
+
+
+class FakeRedisServer:
+    """Servidor RESP en memoria con los comandos que usa RedisStore."""
+
+    def __init__(self) -> None:
+        self.data: Dict[bytes, Tuple[float, bytes]] = {}
+        self.commands = 0
+        self.port = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at and expires_at < time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def _set(self, key: bytes, value: bytes, ttl: Optional[float]) -> None:
+        self.data[key] = (time.time() + ttl if ttl else 0, value)
+
+    def _execute(self, args: List[bytes]) -> Any:
+        self.commands += 1
+        name = args[0].upper()
+        if name == b"GET":
+            return self._get(args[1])
+        if name == b"MGET":
+            return [self._get(key) for key in args[1:]]
+        if name == b"SETEX":
+            self._set(args[1], args[3], float(args[2]))
+            return "OK"
+        if name == b"SET":
+            options = [a.upper() for a in args[3:]]
+            if b"NX" in options and self._get(args[1]) is not None:
+                return None
+            ttl = float(args[3 + options.index(b"EX") + 1]) if b"EX" in options else None
+            self._set(args[1], args[2], ttl)
+            return "OK"
+        if name == b"PING":
+            return "PONG"
+        if name == b"HELLO":
+            return {"server": "fake-redis", "version": "7.2.0", "proto": 3, "id": 1, "mode": "standalone", "role": "master", "modules": []}
+        if name in (b"SELECT", b"CLIENT") and args[1:2] != [b"MAINT_NOTIFICATIONS"]:
+            return "OK"
+        return _RespError(f"ERR unknown command '{args[0].decode()}'")
+
+    @classmethod
+    def _encode(cls, value: Any, resp3: bool) -> bytes:
+        if value is None:
+            return b"_\r\n" if resp3 else b"$-1\r\n"
+        if isinstance(value, _RespError):
+            return f"-{value}\r\n".encode()
+        if isinstance(value, str):
+            return f"+{value}\r\n".encode()
+        if isinstance(value, int):
+            return f":{value}\r\n".encode()
+        if isinstance(value, dict):
+            items = b"".join(cls._encode(k, resp3) + cls._encode(v, resp3) for k, v in value.items())
+            return f"%{len(value)}\r\n".encode() + items
+        if isinstance(value, list):
+            return f"*{len(value)}\r\n".encode() + b"".join(cls._encode(v, resp3) for v in value)
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        resp3 = False
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                count = int(header[1:])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                # redis-py negocia RESP3 con HELLO 3 (cambia la codificación de null)
+                resp3 = resp3 or (args[0].upper() == b"HELLO" and args[1:2] == [b"3"])
+                writer.write(self._encode(self._execute(args), resp3))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def start(self) -> "FakeRedisServer":
+        self._thread = threading.Thread(target=self._serve, name="fake-redis", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        handlers = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
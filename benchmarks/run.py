@@ -0,0 +1,497 @@
+"""
+Benchmark offline de punta a punta.
+
+Corre los routers de la API en proceso (httpx + ASGITransport) contra
+stand-ins locales (benchmarks/fakes.py: Prometheus, Loki, Tempo y Redis),
+storage de alertas en SQLite, un agno.db temporal y el modelo fake
+(`llm.provider: fake`) con latencia configurable. Por escenario mide
+throughput y latencia p50/p95/p99 por endpoint (los slash commands se miden
+sin el cache de resultados, y cacheados aparte en `quick_command_cached`);
+una fase de carga sostenida
+mide el crecimiento de memoria (RSS). El resultado es un JSON comparable
+entre releases (`--baseline` agrega los deltas contra una corrida anterior).
+
+    python -m benchmarks.run --duration 20 --concurrency 8 --output bench.json
+    python -m benchmarks.run --baseline bench-v1.json --output bench-v2.json
+
+AdminAgentConfig se lee al importar `agent`, así que la configuración se pasa
+por variables de entorno y la app se importa recién en `_build_app()`.
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.fakes import FakeObservabilityServer, FakeRedisServer
+
+SCENARIOS = ("webhook", "quick_command", "quick_api")
+
+# (label, método, path, body json | None)
+RequestSpec = Tuple[str, str, str, Optional[Dict[str, Any]]]
+
+_SEVERITIES = ("critical", "major", "minor", "warning")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Percentil con interpolación lineal sobre valores ordenados."""
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def distribution_ms(seconds: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max en ms de una lista de duraciones en segundos."""
+    values = sorted(seconds)
+    return {
+        "p50": round(_percentile(values, 0.50) * 1000, 2),
+        "p95": round(_percentile(values, 0.95) * 1000, 2),
+        "p99": round(_percentile(values, 0.99) * 1000, 2),
+        "mean": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+        "max": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Throughput y percentiles (ms) de un conjunto de requests."""
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": distribution_ms(latencies),
+    }
+
+
+def _rss_bytes() -> int:
+    """RSS actual del proceso (Linux); en otros sistemas el pico de ru_maxrss."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _configure_env(llm_latency_ms: float, upstreams: Dict[str, Any], workdir: str) -> None:
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "LLM_FAKE_LATENCY_MS": str(llm_latency_ms),
+        "OBSERVABILITY_PROMETHEUS_URL": upstreams["prometheus"].url,
+        "OBSERVABILITY_LOKI_URL": upstreams["loki"].url,
+        "OBSERVABILITY_TEMPO_URL": upstreams["tempo"].url,
+        "DATABASE_REDIS_URL": upstreams["redis"].url,
+        "DATABASE_AGNO_DB_PATH": os.path.join(workdir, "agno.db"),
+        "DATABASE_ALERTS_DB_URL": f"sqlite+aiosqlite:///{os.path.join(workdir, 'alerts.db')}",
+        "REPORT_CACHE_BACKEND": "redis",
+        "AGNO_TELEMETRY": "false",
+    })
+
+
+def _seed_alerts(db_path: str, services: List[str], count: int) -> None:
+    """Historial de alertas en agno.db para los slash commands (últimas 48h)."""
+    now = datetime.now(timezone.utc)
+    rng = random.Random(7)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS alerts (id TEXT PRIMARY KEY, fingerprint TEXT, status TEXT, labels TEXT,"
+            " annotations TEXT, received_at TEXT, analysis_report TEXT, is_duplicate INTEGER)"
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO alerts VALUES (?, ?, 'firing', ?, '{}', ?, NULL, ?)",
+            [
+                (
+                    f"seed-{i}",
+                    f"seed-fp-{i % (count // 2 or 1)}",
+                    json.dumps({"alertname": "HighErrorRate", "severity": rng.choice(_SEVERITIES),
+                                "service": rng.choice(services)}),
+                    (now - timedelta(minutes=rng.randint(1, 48 * 60))).isoformat(),
+                    int(rng.random() < 0.2),
+                )
+                for i in range(count)
+            ],
+        )
+
+
+def _build_app() -> Any:
+    """Los mismos routers que main.py, sin AgentOS (sus rutas no se miden)."""
+    from fastapi import FastAPI
+
+    from api.alerts_api import router as alerts_router
+    from api.quick_commands_api import router as quick_commands_router
+    from api.stream_api import router as stream_router
+
+    app = FastAPI()
+    for router in (alerts_router, quick_commands_router, stream_router):
+        app.include_router(router, prefix="/api")
+    return app
+
+
+@contextmanager
+def offline_environment(
+    services: List[str], llm_latency_ms: float, upstream_latency_ms: float,
+) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """
+    Levanta los upstreams falsos y un directorio temporal, y apunta la config a ellos.
+
+    Debe usarse antes de importar `agent` (la config se lee al importar).
+
+    Yields:
+        (upstreams por nombre, directorio de trabajo)
+    """
+    upstreams: Dict[str, Any] = {
+        name: FakeObservabilityServer(services, latency_ms=upstream_latency_ms).start()
+        for name in ("prometheus", "loki", "tempo")
+    }
+    upstreams["redis"] = FakeRedisServer().start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="agent-bench-") as workdir:
+            _configure_env(llm_latency_ms, upstreams, workdir)
+            yield upstreams, workdir
+    finally:
+        for server in upstreams.values():
+            server.stop()
+
+
+async def start_app(services: List[str], workdir: str, seed_alerts: int) -> Any:
+    """Inicializa storage, historial y service registry; devuelve la app lista para ASGITransport."""
+    from agent.service_registry import service_registry
+    from agent.storage import alert_storage
+    from agent.utils.compaction import load_encoding
+
+    await asyncio.to_thread(load_encoding)
+    await alert_storage.init_db()
+    _seed_alerts(os.path.join(workdir, "agno.db"), services, seed_alerts)
+    await asyncio.to_thread(service_registry.refresh)
+    return _build_app()
+
+
+class WebhookPayloads:
+    """Webhooks de una alerta basados en test-alert.json; una fracción repite fingerprint (dedup)."""
+
+    def __init__(self, services: List[str], duplicate_ratio: float, seed: int = 42):
+        with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test-alert.json")) as f:
+            self.template = json.load(f)
+        self.services = services
+        self.duplicate_ratio = duplicate_ratio
+        self.rng = random.Random(seed)
+        self.fingerprints: List[str] = []
+
+    def __call__(self, index: int) -> RequestSpec:
+        if self.fingerprints and self.rng.random() < self.duplicate_ratio:
+            fingerprint = self.rng.choice(self.fingerprints[-50:])
+        else:
+            fingerprint = f"bench-{index}-{self.rng.getrandbits(32):08x}"
+            self.fingerprints.append(fingerprint)
+        payload = json.loads(json.dumps(self.template))
+        alert = payload["alerts"][0]
+        alert["fingerprint"] = fingerprint
+        alert["labels"]["service"] = self.services[index % len(self.services)]
+        alert["labels"]["severity"] = _SEVERITIES[index % len(_SEVERITIES)]
+        alert["startsAt"] = datetime.now(timezone.utc).isoformat()
+        return "POST /api/alerts", "POST", "/api/alerts", payload
+
+
+def _quick_command_requests(services: List[str], label_suffix: str = "") -> Callable[[int], RequestSpec]:
+    deployed_at = (datetime.now(timezone.utc) - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # (label, comando); /digest sin todos los servicios no usa el artefacto precomputado
+    commands = [
+        ("/novedades", "/novedades"),
+        ("/salud", "/salud"),
+        ("/tendencias", "/tendencias"),
+        ("/digest (materialized)", "/digest"),
+        ("/digest (generated)", "/digest include_all_services=false"),
+        ("/deploy", f"/deploy service={services[0]} deployment_time={deployed_at}"),
+    ]
+
+    def request(index: int) -> RequestSpec:
+        label, command = commands[index % len(commands)]
+        return f"POST /api/quick/command {label}{label_suffix}", "POST", "/api/quick/command", {"command": command}
+
+    return request
+
+
+def _quick_api_requests(services: List[str]) -> Callable[[int], RequestSpec]:
+    deployed_at = (datetime.now(timezone.utc) - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    paths = [
+        "/api/quick/recent-incidents?hours=24",
+        "/api/quick/health",
+        "/api/quick/trends?period_hours=24",
+        f"/api/quick/post-deployment?service={services[0]}&deployment_time={deployed_at}",
+    ]
+    # El digest de ayer se sirve del artefacto precomputado; sin todos los servicios se genera siempre
+    digests = [
+        ("GET /api/quick/daily-digest (materialized)", "/api/quick/daily-digest"),
+        ("GET /api/quick/daily-digest (generated)", "/api/quick/daily-digest?include_all_services=false"),
+    ]
+
+    def request(index: int) -> RequestSpec:
+        position = index % (len(paths) + len(digests))
+        if position >= len(paths):
+            label, path = digests[position - len(paths)]
+            return label, "GET", path, None
+        path = paths[position]
+        return f"GET {path.split('?')[0]}", "GET", path, None
+
+    return request
+
+
+async def drive(
+    client: Any,
+    next_request: Callable[[int], RequestSpec],
+    duration: float,
+    concurrency: int,
+    on_response: Optional[Callable[[], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Carga de lazo cerrado: `concurrency` workers enviando requests durante `duration` segundos.
+
+    Returns:
+        {"total": resumen, "endpoints": {label: resumen}, "status_codes": {...}}
+    """
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    status_codes: Dict[str, int] = defaultdict(int)
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            label, method, path, body = next_request(next(counter))
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - start
+            status_codes[status] += 1
+            if status.isdigit() and int(status) < 400:
+                latencies[label].append(elapsed)
+            else:
+                errors[label] += 1
+            if on_response is not None:
+                on_response()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    labels = sorted(set(latencies) | set(errors))
+    return {
+        "duration_seconds": round(elapsed, 2),
+        "concurrency": concurrency,
+        "total": summarize([v for l in labels for v in latencies[l]], sum(errors.values()), elapsed),
+        "endpoints": {label: summarize(latencies[label], errors[label], elapsed) for label in labels},
+        "status_codes": dict(status_codes),
+    }
+
+
+async def soak(client: Any, next_request: Callable[[int], RequestSpec], duration: float, concurrency: int) -> Dict[str, Any]:
+    """Carga sostenida muestreando RSS una vez por segundo."""
+    completed = 0
+
+    def count() -> None:
+        nonlocal completed
+        completed += 1
+
+    gc.collect()
+    objects_start = len(gc.get_objects())
+    rss_start = _rss_bytes()
+    samples: List[Dict[str, float]] = []
+    started = time.perf_counter()
+
+    async def sample() -> None:
+        while True:
+            samples.append({
+                "t": round(time.perf_counter() - started, 1),
+                "rss_mb": round(_rss_bytes() / 2**20, 2),
+                "requests": completed,
+            })
+            await asyncio.sleep(1)
+
+    sampler = asyncio.create_task(sample())
+    load = await drive(client, next_request, duration, concurrency, on_response=count)
+    sampler.cancel()
+    gc.collect()
+    rss_end = _rss_bytes()
+    growth = rss_end - rss_start
+    return {
+        "load": load["total"],
+        "status_codes": load["status_codes"],
+        "rss_start_mb": round(rss_start / 2**20, 2),
+        "rss_end_mb": round(rss_end / 2**20, 2),
+        "rss_peak_mb": max([s["rss_mb"] for s in samples] + [round(rss_end / 2**20, 2)]),
+        "rss_growth_mb": round(growth / 2**20, 2),
+        "rss_growth_kb_per_1k_requests": round(growth / 1024 / completed * 1000, 2) if completed else 0.0,
+        "python_objects_growth": len(gc.get_objects()) - objects_start,
+        "samples": samples,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Deltas (%) de throughput y p95/p99 por endpoint contra una corrida anterior."""
+
+    def delta(old: float, new: float) -> Optional[float]:
+        return round((new - old) / old * 100, 1) if old else None
+
+    result: Dict[str, Any] = {}
+    for scenario, data in current["scenarios"].items():
+        old_scenario = baseline.get("scenarios", {}).get(scenario)
+        if not old_scenario:
+            continue
+        for label, stats in data["endpoints"].items():
+            old = old_scenario["endpoints"].get(label)
+            if old:
+                result[f"{scenario} {label}"] = {
+                    "throughput_rps_pct": delta(old["throughput_rps"], stats["throughput_rps"]),
+                    "p95_ms_pct": delta(old["latency_ms"]["p95"], stats["latency_ms"]["p95"]),
+                    "p99_ms_pct": delta(old["latency_ms"]["p99"], stats["latency_ms"]["p99"]),
+                }
+    old_memory, memory = baseline.get("memory"), current.get("memory")
+    if old_memory and memory:
+        result["memory"] = {
+            "rss_growth_kb_per_1k_requests": {
+                "baseline": old_memory["rss_growth_kb_per_1k_requests"],
+                "current": memory["rss_growth_kb_per_1k_requests"],
+            }
+        }
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_summary(result: Dict[str, Any]) -> None:
+    for scenario, data in result["scenarios"].items():
+        print(f"\n[{scenario}] {data['total']['throughput_rps']} req/s, {data['total']['errors']} errores")
+        for label, stats in data["endpoints"].items():
+            latency = stats["latency_ms"]
+            print(f"  {label:<58} {stats['throughput_rps']:>8} req/s  p50 {latency['p50']:>8} ms"
+                  f"  p95 {latency['p95']:>8} ms  p99 {latency['p99']:>8} ms")
+    memory = result.get("memory")
+    if memory:
+        print(f"\n[soak] RSS {memory['rss_start_mb']} → {memory['rss_end_mb']} MB"
+              f" ({memory['rss_growth_kb_per_1k_requests']} KB / 1k requests)")
+
+
+async def run_benchmarks(args: argparse.Namespace, upstreams: Dict[str, Any], workdir: str) -> Dict[str, Any]:
+    import httpx
+
+    from agent.storage.command_cache import command_cache
+    from agent.storage.redis import redis_store
+
+    app = await start_app(args.services, workdir, args.seed_alerts)
+    builders: Dict[str, Callable[[int], RequestSpec]] = {
+        "webhook": WebhookPayloads(args.services, args.duplicate_ratio),
+        "quick_command": _quick_command_requests(args.services),
+        "quick_command_cached": _quick_command_requests(args.services, " (cache)"),
+        "quick_api": _quick_api_requests(args.services),
+    }
+    # Los comandos son pocos y fijos: con el cache de resultados todo request
+    # después del primero de cada ventana es un hit. Se mide la ejecución sin
+    # cache y, aparte, el camino cacheado.
+    runs: List[Tuple[str, bool]] = []
+    for name in args.scenarios:
+        runs.append((name, False))
+        if name == "quick_command":
+            runs.append(("quick_command_cached", True))
+
+    transport = httpx.ASGITransport(app=app)
+    scenarios: Dict[str, Any] = {}
+    memory: Optional[Dict[str, Any]] = None
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, cache_enabled in runs:
+            command_cache.enabled = cache_enabled
+            next_request = builders[name]
+            for index in range(args.warmup):
+                label, method, path, body = next_request(-1 - index)
+                await client.request(method, path, json=body)
+            scenarios[name] = await drive(client, next_request, args.duration, args.concurrency)
+        # La carga sostenida también ejecuta los comandos (sin cache)
+        command_cache.enabled = False
+        if args.soak_seconds > 0:
+            webhook, command = builders["webhook"], builders["quick_command"]
+            mixed = lambda index: (webhook if index % 2 else command)(index)
+            memory = await soak(client, mixed, args.soak_seconds, args.concurrency)
+    await redis_store.close()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                key: value for key, value in vars(args).items() if key not in ("output", "baseline")
+            },
+        },
+        "upstream_requests": {name: getattr(server, "requests", getattr(server, "commands", 0))
+                              for name, server in upstreams.items()},
+        "scenarios": scenarios,
+        "memory": memory,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark offline de la API de alertas y quick commands")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Escenarios separados por coma ({', '.join(SCENARIOS)})")
+    parser.add_argument("--duration", type=float, default=10, help="Segundos de carga por escenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Clientes concurrentes")
+    parser.add_argument("--warmup", type=int, default=5, help="Requests de calentamiento por escenario (no se miden)")
+    parser.add_argument("--soak-seconds", type=float, default=30, help="Carga sostenida para medir memoria (0 = omitir)")
+    parser.add_argument("--llm-latency-ms", type=float, default=50, help="Latencia del modelo fake por llamada")
+    parser.add_argument("--upstream-latency-ms", type=float, default=5, help="Latencia de Prometheus/Loki/Tempo falsos")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3, help="Fracción de webhooks con fingerprint repetido")
+    parser.add_argument("--services", default="auth-service,payment-service,api-gateway")
+    parser.add_argument("--seed-alerts", type=int, default=500, help="Alertas históricas en agno.db")
+    parser.add_argument("--output", default="benchmark.json", help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para calcular deltas")
+    args = parser.parse_args(argv)
+    args.scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Escenarios desconocidos: {', '.join(sorted(unknown))}")
+    args.services = [s for s in args.services.split(",") if s]
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    with offline_environment(args.services, args.llm_latency_ms, args.upstream_latency_ms) as (upstreams, workdir):
+        result = asyncio.run(run_benchmarks(args, upstreams, workdir))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            result["comparison"] = compare(json.load(f), result)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    _print_summary(result)
+    print(f"\nResultados en {args.output}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -6,8 +8,15 @@ from agno.db.sqlite import AsyncSqliteDb
 from agno.os import AgentOS
 
 from agent.storage import alert_storage
+from agent.service_registry import service_registry
+from agent.daily_digest import digest_scheduler
+from agent.storage.history import history_manager
+from agent.storage.redis import redis_store
+from agent.tracing import setup_tracing, shutdown_tracing
+from agent.utils.compaction import load_encoding
 from api.alerts_api import router as alerts_router
 from api.quick_commands_api import router as quick_commands_router
+from api.stream_api import router as stream_router
 from agent.agents.watchdog_agent import watchdog_agent
 from agent.agents.triage_agent import triage_agent
 from agent.agents.report_agent import report_agent
@@ -32,6 +41,9 @@ agent_os = AgentOS(
 # FastAPI app provista por AgentOS
 app: FastAPI = agent_os.get_app()
 
+# Tracing OpenTelemetry (no-op si tracing.enabled es false)
+setup_tracing(app)
+
 # Habilitar CORS abierto (ajustar en prod)
 app.add_middleware(
     CORSMiddleware,
@@ -44,6 +56,7 @@ app.add_middleware(
 # Webhooks y APIs custom
 app.include_router(alerts_router, prefix="/api")
 app.include_router(quick_commands_router, prefix="/api")
+app.include_router(stream_router, prefix="/api")
 
 # Prometheus Metrics
 from prometheus_client import make_asgi_app
@@ -53,7 +66,24 @@ app.mount("/metrics", metrics_app)
 
 @app.on_event("startup")
 async def startup_event() -> None:
+    # Tokenizer de compactación: puede descargar el BPE, fuera del camino de las tool calls
+    await asyncio.to_thread(load_encoding)
     await alert_storage.init_db()
+    # Primer descubrimiento antes de servir: get_services() no cae en el
+    # refresco sincrónico desde el event loop
+    await asyncio.to_thread(service_registry.refresh)
+    service_registry.start()
+    history_manager.start()
+    digest_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    await service_registry.stop()
+    await history_manager.stop()
+    await digest_scheduler.stop()
+    await redis_store.close()
+    shutdown_tracing()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+import asyncio
+from datetime import timedelta
+
+from api import quick_commands_api
+from api.quick_commands_api import BatchCommandRequest, execute_slash_commands
+from agent.service_registry import service_registry
+from agent.slash_commands import parse_slash_command, plan_command_data
+from agent.storage import query_helpers
+from agent.storage.command_cache import CommandResultCache
+from agent.storage.redis import RedisStore
+from test_data_context import _alerts_db
+
+
+def _count(monkeypatch, name, calls, result=None):
+    original = getattr(query_helpers, name)
+
+    def fetch(*args, **kwargs):
+        calls.append(name)
+        return result(*args) if result else original(*args, **kwargs)
+
+    monkeypatch.setattr(query_helpers, name, fetch)
+
+
+def _setup(tmp_path, monkeypatch):
+    now = query_helpers.utc_now()
+    db_path = str(tmp_path / "alerts.db")
+    _alerts_db(db_path, now)
+    monkeypatch.setattr(query_helpers._config, "agno_db_path", db_path)
+    monkeypatch.setattr(service_registry, "get_services", lambda: ["auth"])
+    store = RedisStore(url="", max_connections=1, timeout_seconds=0.1, retry_seconds=1)
+    monkeypatch.setattr(quick_commands_api, "command_cache", CommandResultCache(300, 10, store=store))
+
+    calls = []
+    _count(monkeypatch, "_fetch_alerts", calls)
+    _count(monkeypatch, "_fetch_active_alerts", calls)
+    _count(monkeypatch, "_fetch_service_metrics", calls,
+           lambda service: {"service": service, "error_rate": 0.0, "latency_p95": 100})
+    return calls
+
+
+def test_plan_is_union_of_command_datasets():
+    now = query_helpers.utc_now()
+    commands = [parse_slash_command(c) for c in ["/novedades 8h", "/tendencias period_hours=12", "/salud include_metrics=false"]]
+    plan = plan_command_data(commands, now)
+
+    # Tendencias compara con las 12h previas; salud revisa críticas de 24h
+    assert plan.alert_window == (now - timedelta(hours=24), now)
+    assert plan.active_alerts is True
+    assert plan.services == set()
+
+
+def test_batch_fetches_each_dataset_once(tmp_path, monkeypatch):
+    calls = _setup(tmp_path, monkeypatch)
+    request = BatchCommandRequest(commands=["/salud", "/novedades hoy", "/tendencias"])
+
+    response = asyncio.run(execute_slash_commands(request))
+
+    assert [r["command"] for r in response["results"]] == request.commands
+    assert all("error" not in r and r["cache"] == "miss" for r in response["results"])
+    assert sorted(calls) == ["_fetch_active_alerts", "_fetch_alerts", "_fetch_service_metrics"]
+    assert response["data_plan"]["prefetched"] is True
+    assert response["data_plan"]["service_metrics"] == ["auth"]
+
+
+def test_batch_of_cached_commands_skips_prefetch(tmp_path, monkeypatch):
+    calls = _setup(tmp_path, monkeypatch)
+    request = BatchCommandRequest(commands=["/novedades", "/inc hours=24"])
+
+    response = asyncio.run(execute_slash_commands(request))
+    calls.clear()
+    again = asyncio.run(execute_slash_commands(request))
+
+    assert [r["cache"] for r in response["results"]] == ["miss", "coalesced"]
+    assert [r["cache"] for r in again["results"]] == ["hit", "hit"]
+    assert again["data_plan"]["prefetched"] is False
+    assert calls == []
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import random
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import requests
+
+from agent.models.alert import AlertmanagerWebhook
+from benchmarks.alert_storm import AlertStormGenerator, StormProfile, arrival_offsets, replay
+from benchmarks.fakes import FakeObservabilityServer
+from benchmarks.run import compare, summarize
+
+
+def test_summarize_percentiles_and_throughput():
+    stats = summarize([i / 1000 for i in range(1, 101)], errors=2, elapsed=2.0)
+
+    assert stats["requests"] == 102 and stats["errors"] == 2
+    assert stats["throughput_rps"] == 50.0
+    assert stats["latency_ms"]["p50"] == 50.5
+    assert stats["latency_ms"]["p99"] == 99.01
+    assert stats["latency_ms"]["max"] == 100.0
+
+
+def test_compare_reports_deltas_per_endpoint():
+    def result(rps, p95):
+        endpoint = {"throughput_rps": rps, "latency_ms": {"p95": p95, "p99": p95}}
+        return {"scenarios": {"webhook": {"endpoints": {"POST /api/alerts": endpoint}}}}
+
+    deltas = compare(result(100, 200), result(120, 150))["webhook POST /api/alerts"]
+
+    assert deltas["throughput_rps_pct"] == 20.0
+    assert deltas["p95_ms_pct"] == -25.0
+
+
+def test_fake_prometheus_filters_by_service_label():
+    server = FakeObservabilityServer(["auth-service", "api-gateway"]).start()
+    try:
+        response = requests.get(
+            f"{server.url}/api/v1/query", params={"query": 'rate(http_requests_received_total{service="auth-service"}[5m])'},
+        )
+    finally:
+        server.stop()
+
+    result = response.json()["data"]["result"]
+    assert [r["metric"]["service"] for r in result] == ["auth-service"]
+    assert server.requests == 1
+
+
+def test_benchmark_runs_offline_end_to_end(tmp_path):
+    output = tmp_path / "bench.json"
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--scenarios", "webhook,quick_command", "--duration", "0.5",
+         "--warmup", "1", "--soak-seconds", "1", "--concurrency", "2", "--llm-latency-ms", "0",
+         "--output", str(output)],
+        check=True, capture_output=True, timeout=120,
+    )
+
+    result = json.loads(output.read_text())
+    assert set(result["scenarios"]) == {"webhook", "quick_command", "quick_command_cached"}
+    assert not any("(cache)" in label for label in result["scenarios"]["quick_command"]["endpoints"])
+    assert all("(cache)" in label for label in result["scenarios"]["quick_command_cached"]["endpoints"])
+    for scenario in result["scenarios"].values():
+        assert scenario["total"]["requests"] > 0
+        assert scenario["total"]["errors"] == 0
+    assert result["upstream_requests"]["prometheus"] > 0 and result["upstream_requests"]["redis"] > 0
+    assert result["memory"]["rss_end_mb"] > 0
+
+
+def test_storm_generator_repeats_and_resolves_active_groups():
+    generator = AlertStormGenerator(StormProfile(services=["auth-service"], repeat_ratio=0.5, resolved_ratio=0.2))
+    payloads = [generator.next_payload() for _ in range(200)]
+
+    for payload in payloads:
+        AlertmanagerWebhook(**payload)
+    fired = {a["fingerprint"] for p in payloads if p["status"] == "firing" for a in p["alerts"]}
+    resolved = [p for p in payloads if p["status"] == "resolved"]
+    assert resolved and all(a["endsAt"] and a["fingerprint"] in fired for p in resolved for a in p["alerts"])
+    assert generator.stats["repeated_webhooks"] > 50
+    assert len(fired) == generator.summary()["unique_fingerprints"]
+
+
+def test_arrival_patterns_keep_mean_rate_and_shape():
+    steady = arrival_offsets("steady", 10, 60, 60, random.Random(1))
+    bursty = arrival_offsets("bursty", 10, 600, 10, random.Random(1))
+    diurnal = arrival_offsets("diurnal", 10, 600, 600, random.Random(1))
+
+    assert len(steady) == 600
+    assert abs(len(bursty) / 600 - 10) < 1 and abs(len(diurnal) / 600 - 10) < 1
+    in_burst = sum(1 for t in bursty if t % 10 < 2)
+    assert in_burst / len(bursty) > 0.5  # 20% del tiempo, 60% del tráfico
+    peak = sum(1 for t in diurnal if 200 <= t < 400)
+    assert peak > 2 * sum(1 for t in diurnal if t < 100 or t >= 500)
+
+
+def test_replay_measures_queueing_when_service_saturates():
+    class SlowClient:
+        async def post(self, path, json):
+            await asyncio.sleep(0.05)
+            return SimpleNamespace(status_code=200)
+
+    generator = AlertStormGenerator(StormProfile(services=["auth-service"], repeat_ratio=0, resolved_ratio=0))
+    result = asyncio.run(replay(SlowClient(), generator, [i / 100 for i in range(20)], max_in_flight=1))
+
+    assert result["completed"] == 20 and result["errors"] == 0
+    assert result["queue_delay_ms"]["max"] > 500  # 20 × 50 ms en serie contra 200 ms programados
+    assert result["achieved_throughput_rps"] < 25
@@ -0,0 +1,76 @@
+import asyncio
+
+from agent.slash_commands import build_command_cache_key, parse_slash_command
+from agent.storage.command_cache import CommandResultCache
+from agent.storage.redis import RedisStore
+
+
+def _local_cache():
+    """Cache sin Redis (url vacía): solo el LRU local."""
+    store = RedisStore(url="", max_connections=1, timeout_seconds=0.1, retry_seconds=1)
+    return CommandResultCache(bucket_seconds=300, max_local_entries=10, store=store)
+
+
+def _producer(calls, delay=0.0):
+    async def produce():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return {"report": f"run {len(calls)}"}
+
+    return produce
+
+
+def _key(command, bucket=1):
+    canonical, params, args_text = parse_slash_command(command)
+    return build_command_cache_key(canonical, params, args_text, bucket)
+
+
+def test_cache_key_normalizes_equivalent_commands():
+    assert _key("/novedades") == _key("/novedades hoy") == _key("/inc hours=24") == _key("/nov 24h")
+    assert _key("/salud services=b,a") == _key("/sal services=a,b")
+    assert _key("/novedades 8h") != _key("/novedades")
+    assert _key("/novedades", bucket=2) != _key("/novedades", bucket=1)
+    assert _key("/novedades errores de auth") != _key("/novedades")
+
+
+def test_hit_after_miss_skips_execution():
+    cache, calls = _local_cache(), []
+
+    async def scenario():
+        first = await cache.get_or_execute("health", "k", _producer(calls))
+        second = await cache.get_or_execute("health", "k", _producer(calls))
+        return first, second
+
+    (first, first_status), (second, second_status) = asyncio.run(scenario())
+    assert (first_status, second_status) == ("miss", "hit")
+    assert second["report"] == first["report"] and "cached_at" in second
+    assert len(calls) == 1
+
+
+def test_concurrent_identical_commands_are_coalesced():
+    cache, calls = _local_cache(), []
+
+    async def scenario():
+        return await asyncio.gather(*[
+            cache.get_or_execute("health", "k", _producer(calls, delay=0.05)) for _ in range(5)
+        ])
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert sorted(status for _, status in results) == ["coalesced"] * 4 + ["miss"]
+    assert all(result == {"report": "run 1"} for result, _ in results)
+
+
+def test_stale_while_revalidate_serves_previous_bucket_and_refreshes():
+    cache, calls = _local_cache(), []
+
+    async def scenario():
+        await cache.get_or_execute("health", "previous", _producer(calls))
+        stale, status = await cache.get_or_execute("health", "current", _producer(calls), stale_key="previous")
+        assert status == "stale" and stale["report"] == "run 1"
+        await asyncio.sleep(0.01)  # refresh en background
+        return await cache.get_or_execute("health", "current", _producer(calls), stale_key="previous")
+
+    fresh, status = asyncio.run(scenario())
+    assert status == "hit" and fresh["report"] == "run 2"
+    assert len(calls) == 2
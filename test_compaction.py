@@ -0,0 +1,70 @@
+from agent.utils import compaction
+from agent.utils.compaction import compact_output, estimate_tokens
+
+
+def _matrix(series_count, points):
+    return [
+        {
+            "metric": {"service": f"svc-{i}", "instance": f"10.0.0.{i}:8080", "job": "api",
+                       **{f"extra_{j}": "x" * 20 for j in range(15)}},
+            "values": [[1700000000 + p * 30, str(p % 7)] for p in range(points)],
+        }
+        for i in range(series_count)
+    ]
+
+
+def test_small_output_untouched():
+    data = [{"metric": {"service": "auth"}, "value": [1, "0.5"]}]
+    out, meta = compact_output("query_instant", data, budget=1000)
+    assert out is data
+    assert meta is None
+
+
+def test_matrix_is_summarized_within_budget():
+    data = _matrix(series_count=10, points=200)
+    out, meta = compact_output("query_range", data, budget=1500)
+    
+    assert meta["elided"] is True
+    assert meta["tokens"] <= 1500 < meta["original_tokens"]
+    first = out[0]
+    assert first["summary"]["points"] == 200
+    assert first["summary"]["max"] == 6
+    assert "_elided_labels" in first["metric"]
+    assert first["metric"]["service"] == "svc-0"
+
+
+def test_loki_lines_deduplicated_by_pattern():
+    values = [[str(1700000000000000000 + i), f"ERROR timeout after {i}ms to 10.0.0.{i % 9}:5432"] for i in range(500)]
+    data = {"status": "success", "data": {"resultType": "streams", "result": [{"stream": {"service": "auth"}, "values": values}]}}
+    
+    out, meta = compact_output("get_error_logs", data, budget=800)
+    
+    assert meta is not None
+    assert out["total_lines"] == 500
+    assert out["unique_patterns"] == 1
+    assert out["lines"][0]["count"] == 500
+
+
+def test_generic_arrays_capped_with_marker():
+    data = {"traces": [{"traceID": str(i), "rootServiceName": "auth" * 20} for i in range(300)]}
+    out, meta = compact_output("search_traces", data, budget=600)
+    assert meta["tokens"] <= 600
+    assert out["traces"][-1]["_elided_items"] > 0
+
+
+def test_estimate_tokens_fallback(monkeypatch):
+    monkeypatch.setattr(compaction, "_encoding", None)
+    monkeypatch.setattr(compaction, "_encoding_loaded", True)
+    assert estimate_tokens("a" * 400) == 101
+
+
+def test_estimate_tokens_does_not_load_tokenizer_lazily(monkeypatch):
+    loads = []
+    monkeypatch.setattr(compaction, "_encoding", None)
+    monkeypatch.setattr(compaction, "_encoding_loaded", False)
+    monkeypatch.setattr(compaction, "tiktoken", type("T", (), {"get_encoding": staticmethod(loads.append)}))
+
+    assert estimate_tokens("a" * 400) == 101
+    assert loads == []
+    compaction.load_encoding()
+    assert loads == ["o200k_base"]
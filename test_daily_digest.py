@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from agent.daily_digest import DailyDigestScheduler, resolve_digest_date
+from agent.models.quick_results import DailyDigestResult
+from agent.storage.redis import RedisStore
+from agent.tools import quick_commands
+from agent.tools.quick_render import render_markdown
+
+
+def _scheduler(monkeypatch, calls):
+    def fake_digest(date=None, include_all_services=True, analyze_with_ai=False):
+        calls.append((date, include_all_services))
+        return DailyDigestResult(date=date or "ayer", total=0)
+
+    monkeypatch.setattr(quick_commands, "_build_daily_digest", fake_digest)
+    store = RedisStore(url="", max_connections=1, timeout_seconds=0.1, retry_seconds=1)
+    return DailyDigestScheduler("09:00", ai_summary=False, retention_days=7, store=store)
+
+
+def test_next_run_and_date_resolution():
+    scheduler = DailyDigestScheduler("09:00", ai_summary=False, retention_days=7,
+                                     store=RedisStore("", 1, 0.1, 1))
+    before = datetime(2025, 12, 10, 8, 30, tzinfo=timezone.utc)
+    after = datetime(2025, 12, 10, 9, 30, tzinfo=timezone.utc)
+    assert scheduler.next_run(before) == datetime(2025, 12, 10, 9, 0, tzinfo=timezone.utc)
+    assert scheduler.next_run(after) == datetime(2025, 12, 11, 9, 0, tzinfo=timezone.utc)
+    assert resolve_digest_date(None, after) == "2025-12-09"
+    assert resolve_digest_date("2025-12-01") == "2025-12-01"
+    assert resolve_digest_date("ayer") is None
+
+
+def test_materialized_digest_is_served_without_regenerating(monkeypatch):
+    calls = []
+    scheduler = _scheduler(monkeypatch, calls)
+
+    async def scenario():
+        await scheduler.run_once()
+        await scheduler.run_once()  # ya materializado: no regenera
+        return await scheduler.get_result(None), await scheduler.get_result(None)
+
+    (first, first_source), (_, second_source) = asyncio.run(scenario())
+    yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%d")
+    assert render_markdown(first).startswith(f"# Daily Digest: {yesterday}")
+    assert (first_source, second_source) == ("materialized", "materialized")
+    assert len(calls) == 1
+
+
+def test_on_demand_only_stores_complete_days(monkeypatch):
+    calls = []
+    scheduler = _scheduler(monkeypatch, calls)
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    async def scenario():
+        sources = [(await scheduler.get_result("2025-12-01"))[1], (await scheduler.get_result("2025-12-01"))[1]]
+        sources += [(await scheduler.get_result(today))[1], (await scheduler.get_result(today))[1]]
+        sources.append((await scheduler.get_result("2025-12-01", include_all_services=False))[1])
+        return sources
+
+    assert asyncio.run(scenario()) == ["generated", "materialized", "generated", "generated", "generated"]
+    assert len(calls) == 4
@@ -0,0 +1,67 @@
+import json
+import sqlite3
+from datetime import timedelta
+
+from agent.slash_commands import run_verification_workflow
+from agent.storage import query_helpers
+from agent.tools import quick_commands
+
+
+def _alerts_db(path, now):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE alerts (id TEXT PRIMARY KEY, fingerprint TEXT, status TEXT, labels TEXT,"
+        " annotations TEXT, received_at TEXT, analysis_report TEXT, is_duplicate INTEGER)"
+    )
+    for i, (hours_ago, severity, duplicate) in enumerate([(1, "critical", 0), (5, "minor", 1), (30, "major", 0)]):
+        conn.execute(
+            "INSERT INTO alerts VALUES (?, ?, 'firing', ?, '{}', ?, NULL, ?)",
+            (f"a{i}", f"fp{i}", json.dumps({"severity": severity, "service": "auth"}),
+             (now - timedelta(hours=hours_ago)).isoformat(), duplicate),
+        )
+    conn.commit()
+    conn.close()
+
+
+def _counting_fetch(monkeypatch):
+    calls = []
+    original = query_helpers._fetch_alerts
+
+    def fetch(start, end, include_duplicates):
+        calls.append((start, end))
+        return original(start, end, include_duplicates)
+
+    monkeypatch.setattr(query_helpers, "_fetch_alerts", fetch)
+    return calls
+
+
+def test_command_fetches_each_range_once(tmp_path, monkeypatch):
+    now = query_helpers.utc_now()
+    db_path = str(tmp_path / "alerts.db")
+    _alerts_db(db_path, now)
+    monkeypatch.setattr(query_helpers._config, "agno_db_path", db_path)
+    calls = _counting_fetch(monkeypatch)
+
+    with query_helpers.data_context_scope() as context:
+        report = quick_commands._get_recent_incidents_raw(hours=24)
+        result = run_verification_workflow("recent-incidents", {"hours": "24"}, report)
+
+    # Últimas 24h (reporte + resúmenes + check) y 24h previas (check de tendencias)
+    assert len(calls) == 2
+    assert "**Total de alertas**: 1" in report
+    assert any("actual: 1, anterior: 1" in e["result_summary"] for e in result["evidence"])
+    assert query_helpers.utc_now() != context.now
+
+
+def test_context_filters_match_direct_queries(tmp_path, monkeypatch):
+    now = query_helpers.utc_now()
+    db_path = str(tmp_path / "alerts.db")
+    _alerts_db(db_path, now)
+    monkeypatch.setattr(query_helpers._config, "agno_db_path", db_path)
+    ranges = [(now - timedelta(hours=48), now), (now - timedelta(hours=6), now - timedelta(hours=2))]
+    filters = [{}, {"include_duplicates": True}, {"severity": "MAJOR"}, {"service": "other"}]
+
+    direct = [query_helpers.get_alerts_in_timerange(s, e, **f) for s, e in ranges for f in filters]
+    with query_helpers.data_context_scope():
+        shared = [query_helpers.get_alerts_in_timerange(s, e, **f) for s, e in ranges for f in filters]
+    assert [[a["id"] for a in r] for r in shared] == [[a["id"] for a in r] for r in direct]
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from agent import evidence_checks
+from agent.evidence_checks import EvidenceCheck, combine_recommendations, run_evidence_checks
+from agent.slash_commands import CANONICAL_PROMPTS
+
+_DEFAULT = {"level": "fyi", "reason": "ok", "confidence": 0.5}
+
+
+def _sleeping_check(name, seconds, recommendation=None):
+    def func(args):
+        time.sleep(seconds)
+        return evidence_checks._evidence(name, "q", f"{name} listo", True), recommendation
+
+    return EvidenceCheck(name=name, source=name, query="q", func=func)
+
+
+def test_all_registered_checks_exist():
+    for template in CANONICAL_PROMPTS.values():
+        for name in template["evidence_checks"]:
+            assert name in evidence_checks.EVIDENCE_CHECKS
+
+
+def test_checks_run_concurrently_with_timeout(monkeypatch):
+    notify = {"level": "notify", "reason": "degradado", "confidence": 0.9}
+    monkeypatch.setitem(evidence_checks.EVIDENCE_CHECKS, "a", _sleeping_check("a", 0.2))
+    monkeypatch.setitem(evidence_checks.EVIDENCE_CHECKS, "b", _sleeping_check("b", 0.2, notify))
+    monkeypatch.setitem(evidence_checks.EVIDENCE_CHECKS, "slow", _sleeping_check("slow", 1, notify))
+
+    async def scenario():
+        start = time.perf_counter()
+        results = await run_evidence_checks(["a", "b", "slow"], {}, timeout_seconds=0.4)
+        return results, time.perf_counter() - start
+
+    # El thread del check lento sigue hasta terminar; la verificación no lo espera
+    results, elapsed = asyncio.run(scenario())
+
+    assert elapsed < 0.8
+    assert [evidence["source"] for evidence, _ in results] == ["a", "b", "slow"]
+    assert results[2][0]["pass"] is False and "Timeout" in results[2][0]["result_summary"]
+    assert combine_recommendations([r for _, r in results], _DEFAULT) == notify
+
+
+def test_combine_recommendations_prefers_highest_confidence_notify():
+    low = {"level": "notify", "reason": "tendencia", "confidence": 0.85}
+    high = {"level": "notify", "reason": "críticas", "confidence": 0.95}
+    assert combine_recommendations([None, low, high], _DEFAULT) == high
+    assert combine_recommendations([None, None], _DEFAULT) == _DEFAULT
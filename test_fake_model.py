@@ -0,0 +1,36 @@
+import asyncio
+
+from agno.agent import Agent
+from agno.tools import tool
+
+from agent.fake_model import FakeModel, FakeRule
+
+
+@tool
+def get_http_error_rate(service: str) -> dict:
+    """Error rate de un servicio."""
+    return {"service": service, "error_rate": 0.02}
+
+
+def _agent(**model_kwargs):
+    rules = [
+        FakeRule(
+            match=r"Correlacioná",
+            tool_calls=[("get_http_error_rate", {"service": "{service}"}), ("tool_inexistente", {})],
+            content="evidencia: {tool_results}",
+        ),
+    ]
+    return Agent(model=FakeModel(id="fake", rules=rules, **model_kwargs), tools=[get_http_error_rate])
+
+
+def test_fake_model_executes_tool_calls_and_answers():
+    response = asyncio.run(_agent().arun(input='Correlacioná métricas {"labels": {"service": "auth-service"}}'))
+    assert "auth-service" in response.content
+    assert "0.02" in response.content
+    assert response.metrics.input_tokens > 0
+
+
+def test_fake_model_fixed_output_tokens_and_default_content():
+    response = asyncio.run(_agent(output_tokens=123).arun(input="hola"))
+    assert response.content.startswith("Respuesta simulada (fake)")
+    assert response.metrics.output_tokens == 123
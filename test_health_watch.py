@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from agent.models.quick_results import HealthResult, ServiceHealth, ServiceMetrics
+from agent.streams import health_watch
+from agent.streams.health_watch import HealthWatchHub, health_changes
+
+
+def _health(error_rate=0.01, latency=100.0, auth_status="HEALTHY", extra=None):
+    services = [
+        ServiceHealth(service="auth", status=auth_status, active_alerts=0,
+                      metrics=ServiceMetrics(error_rate=error_rate, latency_p95=100.0)),
+        ServiceHealth(service="pay", status="HEALTHY", active_alerts=0,
+                      metrics=ServiceMetrics(error_rate=0.01, latency_p95=latency)),
+    ] + (extra or [])
+    return HealthResult(
+        timestamp=datetime.now(timezone.utc), overall_status="HEALTHY", active_alerts=0, critical=0, major=0,
+        services=services, error_rate_threshold=0.05, latency_threshold_ms=500,
+    )
+
+
+def test_changes_only_include_threshold_crossings():
+    base = _health()
+    # Variaciones que no cruzan el threshold no se empujan
+    assert health_changes(base, _health(error_rate=0.04, latency=450.0)) is None
+
+    event = health_changes(base, _health(error_rate=0.2, latency=450.0))
+    assert [(s["service"], s["changed"]) for s in event["services"]] == [("auth", ["error_rate"])]
+
+    event = health_changes(_health(extra=[ServiceHealth(service="old", status="HEALTHY", active_alerts=0)]),
+                           _health(auth_status="WARNING", latency=900.0))
+    assert [(s["service"], s["changed"]) for s in event["services"]] == [
+        ("auth", ["status"]), ("pay", ["latency_p95"]), ("old", ["removed"]),
+    ]
+
+
+def test_hub_shares_one_evaluation_per_watch():
+    results = iter([_health(), _health(), _health(error_rate=0.3)])
+    evaluations = []
+
+    async def fake_evaluate(self):
+        evaluations.append(self.services)
+        return next(results)
+
+    async def scenario():
+        hub = HealthWatchHub(interval_seconds=0.05)
+        async with hub.subscribe(["pay", "auth"]) as q1, hub.subscribe(["auth", "pay"]) as q2:
+            first = await asyncio.wait_for(q1.get(), 1)
+            await asyncio.wait_for(q2.get(), 1)
+            # Tick sin cambios: nada que empujar; luego cruce de error rate
+            change = await asyncio.wait_for(q1.get(), 1)
+            async with hub.subscribe(["auth", "pay"]) as late:
+                late_first = late.get_nowait()
+            assert list(hub.stats().values())[0]["subscribers"] == 2
+        assert hub.stats() == {}
+        return first, change, late_first
+
+    with patch.object(health_watch._WatchChannel, "evaluate", fake_evaluate):
+        first, change, late_first = asyncio.run(scenario())
+
+    assert first["type"] == late_first["type"] == "snapshot"
+    assert change["type"] == "changes" and change["services"][0]["changed"] == ["error_rate"]
+    assert late_first["services"][0]["metrics"]["error_rate"] == 0.3
+    assert evaluations == [("auth", "pay")] * 3
+
+
+def test_full_queue_resyncs_with_snapshot():
+    async def scenario():
+        channel = health_watch._WatchChannel(("auth", "pay"), True, 60)
+        queue = asyncio.Queue(maxsize=2)
+        channel.subscribers.add(queue)
+        states = iter([_health(), _health(error_rate=0.3), _health(error_rate=0.3, latency=900.0)])
+
+        async def fake_evaluate():
+            return next(states)
+
+        channel.evaluate = fake_evaluate
+        for _ in range(3):
+            await channel.tick()
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    events = asyncio.run(scenario())
+
+    # snapshot + changes llenan la cola; el tercer diff se reemplaza por el estado completo
+    assert [e["type"] for e in events] == ["snapshot"]
+    assert events[0]["services"][0]["metrics"]["error_rate"] == 0.3
+    assert events[0]["services"][1]["metrics"]["latency_p95"] == 900.0
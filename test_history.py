@@ -0,0 +1,93 @@
+import asyncio
+import copy
+from types import SimpleNamespace
+
+from agent.storage import history
+from agent.storage.history import HistoryManager, compact_runs, history_tokens
+
+
+def _run(run_id, content, parent=None, created_at=1765375200):
+    return SimpleNamespace(
+        run_id=run_id,
+        parent_run_id=parent,
+        created_at=created_at,
+        input=SimpleNamespace(input_content=f"input {run_id}"),
+        content=content,
+    )
+
+
+def test_compact_runs_keeps_last_runs_and_summarizes_rest():
+    runs = [_run(f"r{i}", f"respuesta {i}") for i in range(5)]
+    kept, summary, count = compact_runs(runs, max_runs=2, previous_summary="- resumen previo")
+    assert [r.run_id for r in kept] == ["r3", "r4"]
+    assert count == 3
+    assert summary.startswith("- resumen previo")
+    assert "input r0" in summary and "respuesta 2" in summary
+    assert "respuesta 3" not in summary
+
+
+def test_compact_runs_keeps_member_runs_with_parent():
+    runs = [_run("t1", "a"), _run("m1", "b", parent="t1"), _run("t2", "c"), _run("m2", "d", parent="t2")]
+    kept, _, count = compact_runs(runs, max_runs=1)
+    assert [r.run_id for r in kept] == ["t2", "m2"]
+    assert count == 1
+
+
+def test_compact_runs_noop_and_summary_bound():
+    runs = [_run("r0", "x")]
+    assert compact_runs(runs, max_runs=5) == (runs, None, 0)
+    runs = [_run(f"r{i}", "y" * 500) for i in range(20)]
+    _, summary, _ = compact_runs(runs, max_runs=1, max_summary_chars=300)
+    assert len(summary) == 300
+
+
+def test_history_tokens_only_counts_history_messages():
+    response = SimpleNamespace(messages=[
+        SimpleNamespace(from_history=True, content="x" * 400),
+        SimpleNamespace(from_history=False, content="y" * 4000),
+    ])
+    assert 0 < history_tokens(response) < 200
+    assert history_tokens(SimpleNamespace(messages=None)) == 0
+
+
+class _FakeSessionDb:
+    """Sesiones en memoria; `on_get_session` simula un run que llega entre lectura y escritura."""
+
+    def __init__(self, sessions, on_get_session=None):
+        self.sessions = {s.session_id: s for s in sessions}
+        self.on_get_session = on_get_session
+        self.upserted = []
+
+    async def get_sessions(self, session_type):
+        return [copy.deepcopy(s) for s in self.sessions.values()] if session_type == history.SessionType.AGENT else []
+
+    async def get_session(self, session_id, session_type):
+        if self.on_get_session:
+            self.on_get_session(self.sessions[session_id])
+        return copy.deepcopy(self.sessions[session_id])
+
+    async def upsert_session(self, session):
+        self.upserted.append(session.session_id)
+        self.sessions[session.session_id] = session
+
+
+def _session(session_id, runs):
+    return SimpleNamespace(session_id=session_id, runs=runs, summary=None, updated_at=100)
+
+
+def test_compact_sessions_skips_sessions_updated_after_read(monkeypatch, tmp_path):
+    monkeypatch.setattr(history._config, "history_max_runs_per_session", 2)
+    runs = [_run(f"r{i}", f"respuesta {i}") for i in range(4)]
+
+    def append_run(session):
+        if session.session_id == "busy":
+            session.runs = session.runs + [_run("nuevo", "run concurrente")]
+            session.updated_at = 101
+
+    manager = HistoryManager(str(tmp_path / "agno.db"), interval_seconds=60)
+    manager._db = _FakeSessionDb([_session("idle", list(runs)), _session("busy", list(runs))], append_run)
+    assert asyncio.run(manager.compact_sessions()) == 2
+
+    assert manager._db.upserted == ["idle"]
+    assert [r.run_id for r in manager._db.sessions["idle"].runs] == ["r2", "r3"]
+    assert [r.run_id for r in manager._db.sessions["busy"].runs][-1] == "nuevo"
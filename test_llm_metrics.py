@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from agent import llm_metrics
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_record_run_tokens_tools_and_cost(monkeypatch):
+    monkeypatch.setattr(
+        llm_metrics._config, "llm_pricing", {"m-test": {"input": 1.0, "cached_input": 0.1, "output": 10.0}}
+    )
+    run = SimpleNamespace(
+        model="m-test",
+        metadata=None,
+        tools=[object(), object()],
+        messages=[],
+        metrics=SimpleNamespace(
+            duration=1.5, time_to_first_token=0.3, input_tokens=1000, output_tokens=100,
+            cache_read_tokens=800, cost=None,
+        ),
+    )
+    llm_metrics.llm_metrics_hook("metrics-test")(run_output=run, metadata={"severity": "critical"})
+
+    labels = {"agent": "metrics-test", "model": "m-test", "severity": "critical"}
+    assert _sample("agent_run_tokens_sum", tier="none", kind="prompt_cached", **labels) == 800
+    assert _sample("agent_run_tokens_sum", tier="none", kind="prompt_uncached", **labels) == 200
+    assert _sample("agent_run_tool_calls_sum", **labels) == 2
+    # 200 * 1.0 + 800 * 0.1 + 100 * 10.0 = 1280 USD por millón
+    assert abs(_sample("agent_run_cost_usd_sum", **labels) - 0.00128) < 1e-9
+
+
+def test_records_cached_and_uncached_prompt_tokens_per_tier():
+    run = SimpleNamespace(
+        model="m-cache", metadata=None, tools=[], messages=[],
+        metrics=SimpleNamespace(input_tokens=1000, output_tokens=50, cache_read_tokens=768),
+    )
+    llm_metrics.llm_metrics_hook("cache-test")(run_output=run, metadata={"severity": "minor", "tier": "small"})
+
+    labels = {"agent": "cache-test", "model": "m-cache", "severity": "minor", "tier": "small"}
+    assert _sample("agent_run_tokens_sum", kind="prompt_cached", **labels) == 768
+    assert _sample("agent_run_tokens_sum", kind="prompt_uncached", **labels) == 232
+    assert _sample("agent_run_tokens_sum", kind="completion", **labels) == 50
+
+
+def test_estimate_cost_unknown_model():
+    assert llm_metrics.estimate_cost("modelo-sin-precio", 10, 0, 10) is None
@@ -0,0 +1,57 @@
+import asyncio
+from unittest.mock import patch
+
+from agent.streams import log_tail
+from agent.streams.log_tail import LogTailHub
+from agent.utils.log_patterns import log_pattern
+
+
+def test_log_pattern_normalizes_variables():
+    a = log_pattern('timeout after 3000ms connecting to 10.0.0.5:5432 user="bob"')
+    b = log_pattern('timeout after 120ms connecting to 10.0.0.9:5432 user="alice"')
+    assert a == b
+    assert "<ip>" in a and "<n>" in a
+
+
+def test_hub_multiplexes_one_upstream_per_channel():
+    connections = []
+    
+    async def fake_tail(query, delay_for=0, limit=100):
+        connections.append(query)
+        for i in range(3):
+            yield {"timestamp": str(i), "labels": {}, "line": f"error {i}"}
+        await asyncio.sleep(3600)
+    
+    async def scenario():
+        hub = LogTailHub()
+        async with hub.subscribe("auth", "error") as q1, hub.subscribe("auth", "error") as q2:
+            assert hub.stats() == {"auth:error": 2}
+            first = await asyncio.wait_for(q1.get(), 1)
+            second = await asyncio.wait_for(q2.get(), 1)
+            assert first["type"] == second["type"] == "line"
+        assert hub.stats() == {}
+    
+    with patch.object(log_tail.loki_tool, "tail_logs", fake_tail):
+        asyncio.run(scenario())
+    
+    assert len(connections) == 1
+
+
+def test_channel_rate_limits_and_summarizes():
+    channel = log_tail._TailChannel("auth", "error")
+    channel._rate = channel._tokens = 2
+    queue = asyncio.Queue()
+    channel.subscribers.add(queue)
+    
+    for i in range(10):
+        channel._handle_entry({"timestamp": str(i), "labels": {}, "line": f"db timeout {i}"})
+    channel._flush_summary()
+    
+    events = [queue.get_nowait() for _ in range(queue.qsize())]
+    lines = [e for e in events if e["type"] == "line"]
+    summary = events[-1]
+    assert len(lines) == 2
+    assert summary["type"] == "summary"
+    assert summary["lines"] == 10
+    assert summary["suppressed"] == 8
+    assert summary["patterns"][0]["count"] == 10
@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+
+from agent.model_router import ModelRouter
+
+
+class _FakeAgent:
+    """Agente mínimo: responde según el modelo, o se cuelga si está en `slow`."""
+
+    def __init__(self, model_id, slow=()):
+        self.model = SimpleNamespace(id=model_id)
+        self.slow = set(slow)
+
+    def deep_copy(self, update):
+        return _FakeAgent(update["model"].id, self.slow)
+
+    async def arun(self, input, **kwargs):
+        if self.model.id in self.slow:
+            await asyncio.sleep(10)
+        return SimpleNamespace(
+            content=f"{self.model.id}:{input}",
+            metadata=kwargs.get("metadata"),
+            metrics=SimpleNamespace(input_tokens=10, output_tokens=5),
+        )
+
+
+def _router(timeout=5):
+    return ModelRouter(
+        tiers={"small": "nano", "medium": "mini", "large": "big"},
+        fallback={"large": ["medium", "small"], "medium": ["small"]},
+        severity_tiers={"critical": "large", "minor": "small", "duplicate": "small"},
+        agent_tiers={"report": {"default": "medium", "info": "small"}, "query": {"default": "small"}},
+        timeout_seconds=timeout,
+    )
+
+
+def test_resolve_tier_priority():
+    router = _router()
+    assert router.resolve_tier("report", "critical") == "large"
+    assert router.resolve_tier("report", "info") == "small"
+    assert router.resolve_tier("report", "major") == "medium"
+    assert router.resolve_tier("report", "critical", is_duplicate=True) == "small"
+    assert router.resolve_tier("query") == "small"
+    # Agente sin config y severidad desconocida → primer tier
+    assert router.resolve_tier("watchdog", "unknown") == "small"
+
+
+def test_default_tier_without_routing_config():
+    router = ModelRouter({}, {}, {}, {}, timeout_seconds=5)
+    assert router.resolve_tier("report", "critical") == "default"
+    assert router.chain("default") == ["default"]
+
+
+def test_arun_uses_tier_model():
+    router = _router()
+    response = asyncio.run(router.arun(_FakeAgent("mini"), "report", "x", severity="critical"))
+    assert response.content == "big:x"
+
+
+def test_arun_falls_back_on_timeout():
+    router = _router(timeout=0.05)
+    agent = _FakeAgent("mini", slow={"big"})
+    response = asyncio.run(router.arun(agent, "report", "x", severity="critical"))
+    assert response.content == "mini:x"
+    # El tier del intento que completó llega a las métricas del run
+    assert response.metadata == {"severity": "critical", "tier": "medium"}
+
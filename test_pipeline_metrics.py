@@ -0,0 +1,108 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from agent.agents import observability_team
+from agent.tools import alert_tools
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def _fake_pipeline(monkeypatch, duplicate, persist_error=None, cached_report=None):
+    async def dedupe(fingerprint, window_minutes=None):
+        return duplicate
+
+    async def arun(agent, role, **kwargs):
+        return SimpleNamespace(content=f"{role} ok")
+
+    async def persist(alert, analysis_report, is_duplicate):
+        if persist_error:
+            raise persist_error
+        return "id-1"
+
+    async def cache_get(key):
+        return cached_report
+
+    async def cache_set(key, value):
+        return None
+
+    monkeypatch.setattr(alert_tools, "_deduplicate_alerts_raw", dedupe)
+    monkeypatch.setattr(alert_tools, "persist_alert", persist)
+    monkeypatch.setattr(observability_team.model_router, "arun", arun)
+    monkeypatch.setattr(observability_team.report_cache, "get", cache_get)
+    monkeypatch.setattr(observability_team.report_cache, "set", cache_set)
+
+
+_ALERT = {"status": "firing", "labels": {"severity": "P1", "service": "auth"}, "annotations": {}, "fingerprint": "fp"}
+
+
+def test_stages_and_counters_are_recorded(monkeypatch):
+    _fake_pipeline(monkeypatch, duplicate=True)
+    before = {
+        stage: _sample("agent_pipeline_stage_seconds_count", stage=stage, outcome="ok")
+        for stage in ["classify", "dedup", "enrich", "triage", "report_cache", "report", "persist"]
+    }
+    received = _sample("agent_alerts_total", result="received", severity="critical")
+    deduplicated = _sample("agent_alerts_total", result="deduplicated", severity="critical")
+    analyzed = _sample("agent_alerts_total", result="analyzed", severity="critical")
+
+    asyncio.run(observability_team.analyze_payload({"alerts": [_ALERT]}))
+
+    after = {stage: _sample("agent_pipeline_stage_seconds_count", stage=stage, outcome="ok") for stage in before}
+    # Duplicada: sin triage
+    assert {stage: after[stage] - before[stage] for stage in before} == {
+        "classify": 1, "dedup": 1, "enrich": 1, "triage": 0, "report_cache": 1, "report": 1, "persist": 1,
+    }
+    assert _sample("agent_alerts_total", result="received", severity="critical") == received + 1
+    assert _sample("agent_alerts_total", result="deduplicated", severity="critical") == deduplicated + 1
+    assert _sample("agent_alerts_total", result="analyzed", severity="critical") == analyzed + 1
+    assert _sample("agent_alerts_in_flight") == 0
+
+
+def test_failures_are_counted_by_stage(monkeypatch):
+    _fake_pipeline(monkeypatch, duplicate=False, persist_error=RuntimeError("db locked"))
+    failed = _sample("agent_alerts_total", result="failed", severity="critical")
+    persist_errors = _sample("agent_pipeline_stage_seconds_count", stage="persist", outcome="error")
+    triage_ok = _sample("agent_pipeline_stage_seconds_count", stage="triage", outcome="ok")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(observability_team.analyze_alert(_ALERT))
+
+    assert _sample("agent_alerts_total", result="failed", severity="critical") == failed + 1
+    assert _sample("agent_pipeline_stage_seconds_count", stage="persist", outcome="error") == persist_errors + 1
+    assert _sample("agent_pipeline_stage_seconds_count", stage="triage", outcome="ok") == triage_ok + 1
+    assert _sample("agent_alerts_in_flight") == 0
+
+
+def test_cached_report_is_not_timed_as_report_generation(monkeypatch):
+    _fake_pipeline(monkeypatch, duplicate=True, cached_report="reporte previo")
+    lookups = _sample("agent_pipeline_stage_seconds_count", stage="report_cache", outcome="ok")
+    reports = _sample("agent_pipeline_stage_seconds_count", stage="report", outcome="ok")
+
+    result = asyncio.run(observability_team.analyze_alert(_ALERT))
+
+    assert result["report_cached"] is True
+    assert _sample("agent_pipeline_stage_seconds_count", stage="report_cache", outcome="ok") == lookups + 1
+    assert _sample("agent_pipeline_stage_seconds_count", stage="report", outcome="ok") == reports
+
+
+def test_classify_failure_is_counted_as_received_and_failed(monkeypatch):
+    _fake_pipeline(monkeypatch, duplicate=False)
+
+    def broken_classify(labels, annotations):
+        raise ValueError("labels inválidos")
+
+    monkeypatch.setattr(alert_tools, "_classify_alert_severity_raw", broken_classify)
+    received = _sample("agent_alerts_total", result="received", severity="unknown")
+    failed = _sample("agent_alerts_total", result="failed", severity="unknown")
+
+    with pytest.raises(ValueError):
+        asyncio.run(observability_team.analyze_alert(_ALERT))
+
+    assert _sample("agent_alerts_total", result="received", severity="unknown") == received + 1
+    assert _sample("agent_alerts_total", result="failed", severity="unknown") == failed + 1
+    assert _sample("agent_alerts_in_flight") == 0
@@ -0,0 +1,51 @@
+import asyncio
+
+from agent.models.quick_results import DailyDigestResult, parse_quick_result
+from agent.slash_commands import run_verification_workflow
+from agent.storage import query_helpers
+from agent.tools import quick_commands
+from agent.tools.quick_render import render, render_chat, render_markdown
+from api.quick_commands_api import CommandRequest, execute_slash_command
+from test_batch_commands import _setup
+from test_data_context import _alerts_db
+
+
+def test_results_round_trip_and_render_formats(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "alerts.db")
+    _alerts_db(db_path, query_helpers.utc_now())
+    monkeypatch.setattr(query_helpers._config, "agno_db_path", db_path)
+
+    with query_helpers.data_context_scope():
+        result = quick_commands._build_recent_incidents(hours=48)
+        markdown = quick_commands._get_recent_incidents_raw(hours=48)
+
+    assert render_markdown(result) == markdown
+    assert result.total == 2 and result.severity_counts["critical"] == 1
+    assert parse_quick_result(render(result, "json")) == result
+    assert render_chat(result).splitlines()[0] == "📋 2 incidencias en 48h (1 critical, 1 major)"
+
+
+def test_digest_recommendation_reads_structured_fields():
+    digest = DailyDigestResult(date="2025-12-09", total=3, severity_counts={"critical": 2, "minor": 1})
+    structured = run_verification_workflow("daily-digest", {}, "# Daily Digest", digest)
+    # Sin resultado tipado (QueryAgent) no se scrapea el markdown
+    scraped = run_verification_workflow("daily-digest", {}, "Se registraron 5 incidentes críticos")
+
+    assert structured["recommendation"]["level"] == "notify"
+    assert structured["recommendation"]["reason"] == "Día con 2 incidentes críticos"
+    assert scraped["recommendation"]["level"] == "fyi"
+
+
+def test_command_format_is_applied_after_cache(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+
+    async def scenario():
+        as_json = await execute_slash_command(CommandRequest(command="/novedades", format="json"))
+        as_chat = await execute_slash_command(CommandRequest(command="/novedades", format="chat"))
+        return as_json, as_chat
+
+    as_json, as_chat = asyncio.run(scenario())
+
+    assert "report" not in as_json and as_json["result"]["command"] == "recent-incidents"
+    assert as_chat["cache"] == "hit"
+    assert as_chat["report"].startswith("📋 1 incidencias en 24h") and "FYI" in as_chat["report"]
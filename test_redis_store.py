@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+from agent.storage.redis import LocalLRU, RedisStore
+
+
+def _namespace(max_entries=2):
+    """Namespace sin Redis (url vacía): todas las operaciones van al LRU local."""
+    store = RedisStore(url="", max_connections=1, timeout_seconds=0.1, retry_seconds=1)
+    return store.namespace("test:", max_entries)
+
+
+def test_local_lru_bounds_entries_and_expires():
+    lru = LocalLRU(max_entries=2)
+    lru.set_value("a", "1", ttl_seconds=60)
+    lru.set_value("b", "2", ttl_seconds=60)
+    lru.get_value("a")  # "a" pasa a ser el más reciente
+    lru.set_value("c", "3", ttl_seconds=60)
+    assert lru.get_value("b") is None
+    assert (lru.get_value("a"), lru.get_value("c")) == ("1", "3")
+    lru["a"] = (time.time() - 1, "1")
+    assert lru.get_value("a") is None
+
+
+def test_namespace_falls_back_to_local_lru():
+    namespace = _namespace()
+
+    async def scenario():
+        first = await namespace.set_if_absent("fp", "original", 60)
+        second = await namespace.set_if_absent("fp", "otro", 60)
+        await namespace.set_many({"x": "1", "y": "2"}, 60)
+        return first, second, await namespace.mget(["fp", "x", "y"])
+
+    first, second, values = asyncio.run(scenario())
+    assert first == (True, None)
+    assert second == (False, "original")
+    # max_entries=2: "fp" fue desalojada por "x" e "y"
+    assert values == [None, "1", "2"]
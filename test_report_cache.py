@@ -0,0 +1,35 @@
+import asyncio
+
+from agent.storage import report_cache as rc
+
+
+def test_cache_key_ignores_volatile_fields():
+    alert_a = {"labels": {"alertname": "HighLatency"}, "startsAt": "2025-12-10T14:00:00Z",
+               "context": {"service": "auth", "starts_at": "2025-12-10T14:00:00Z"}}
+    alert_b = {"labels": {"alertname": "HighLatency"}, "startsAt": "2025-12-10T15:30:00Z",
+               "context": {"service": "auth", "starts_at": "2025-12-10T15:30:00Z"}}
+    assert rc.build_cache_key(alert_a, "triage", "m", "v1") == rc.build_cache_key(alert_b, "triage", "m", "v1")
+
+
+def test_cache_key_depends_on_triage_model_and_prompt():
+    alert = {"labels": {"alertname": "HighLatency"}}
+    base = rc.build_cache_key(alert, "triage", "m", "v1")
+    assert base != rc.build_cache_key(alert, "otro triage", "m", "v1")
+    assert base != rc.build_cache_key(alert, "triage", "m2", "v1")
+    assert base != rc.build_cache_key(alert, "triage", "m", "v2")
+
+
+def test_disk_backend_roundtrip_and_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr(rc._config, "report_cache_max_entries", 2)
+    cache = rc.ReportCache("none")
+    cache._backend = rc._DiskBackend(str(tmp_path))
+    
+    async def scenario():
+        assert await cache.get("a") is None
+        for key in ("a", "b", "c"):
+            await cache.set(key, f"# Report {key}")
+        return [await cache.get(k) for k in ("a", "b", "c")]
+    
+    values = asyncio.run(scenario())
+    assert values[2] == "# Report c"
+    assert sum(v is not None for v in values) == 2
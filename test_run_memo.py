@@ -0,0 +1,63 @@
+import asyncio
+
+from agent.utils.run_memo import memo_key, memoized, tool_memo_scope
+
+
+def _counting_tool():
+    calls = []
+
+    @memoized
+    def query(query: str, minutes: int = 15):
+        calls.append((query, minutes))
+        if query == "falla":
+            return {"error": "upstream"}
+        return {"data": len(calls)}
+
+    return query, calls
+
+
+def test_memo_within_scope_normalizes_args():
+    query, calls = _counting_tool()
+    with tool_memo_scope():
+        first = query("rate(http_requests_total[5m])")
+        again = query("rate(http_requests_total[5m])  ", minutes=15)
+        other = query("rate(http_requests_total[5m])", minutes=30)
+    assert first == again == {"data": 1}
+    assert other == {"data": 2}
+    assert len(calls) == 2
+
+
+def test_memo_keeps_inner_whitespace_distinct():
+    query, calls = _counting_tool()
+    with tool_memo_scope():
+        spaced = query('{service="auth"} |= "a  b"')
+        single = query('{service="auth"} |= "a b"')
+    assert spaced == {"data": 1} and single == {"data": 2}
+    assert memo_key("q", {"query": "a  b"}) != memo_key("q", {"query": "a b"})
+
+
+def test_memo_invalidated_after_scope_and_skips_errors():
+    query, calls = _counting_tool()
+    with tool_memo_scope():
+        query("up")
+        query("falla")
+        query("falla")
+    query("up")
+    query("up")
+    assert len(calls) == 5
+
+
+def test_memo_shared_with_to_thread_calls():
+    query, calls = _counting_tool()
+
+    async def run():
+        with tool_memo_scope():
+            await asyncio.to_thread(query, "up")
+            await asyncio.to_thread(query, "up")
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+
+def test_memo_key_ignores_dict_order():
+    assert memo_key("t", {"a": 1, "b": "x"}) == memo_key("t", {"b": "x", "a": 1})
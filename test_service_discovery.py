@@ -46,3 +46,71 @@ def test_get_service_health_dynamic(mock_prometheus):
     
     assert len(health) == 2
     mock_prometheus.custom_query.assert_called_with('up{service!=""}')
+
+def test_registry_emits_added_and_removed(mock_prometheus):
+    from agent.service_registry import ServiceRegistry
+    registry = ServiceRegistry(interval_seconds=60)
+    events = []
+    registry.subscribe(lambda event, svc: events.append((event, svc)))
+    
+    mock_prometheus.custom_query.return_value = [
+        {"metric": {"service": "auth-service"}, "value": [1234567890, "1"]},
+        {"metric": {"service": "payment-service"}, "value": [1234567890, "1"]}
+    ]
+    assert registry.refresh()
+    mock_prometheus.custom_query.return_value = [
+        {"metric": {"service": "auth-service"}, "value": [1234567890, "1"]},
+        {"metric": {"service": "user-service"}, "value": [1234567890, "1"]}
+    ]
+    assert registry.refresh()
+    
+    assert registry.get_services() == ["auth-service", "user-service"]
+    assert events == [
+        ("added", "auth-service"),
+        ("added", "payment-service"),
+        ("added", "user-service"),
+        ("removed", "payment-service"),
+    ]
+
+def test_registry_reads_from_memory(mock_prometheus):
+    from agent.service_registry import ServiceRegistry
+    registry = ServiceRegistry(interval_seconds=60)
+    mock_prometheus.custom_query.return_value = [
+        {"metric": {"service": "auth-service"}, "value": [1234567890, "1"]}
+    ]
+    
+    registry.get_services()
+    registry.get_services()
+    
+    assert mock_prometheus.custom_query.call_count == 1
+
+def test_registry_keeps_last_known_on_error(mock_prometheus):
+    from agent.service_registry import ServiceRegistry
+    registry = ServiceRegistry(interval_seconds=60)
+    mock_prometheus.custom_query.return_value = [
+        {"metric": {"service": "auth-service"}, "value": [1234567890, "1"]}
+    ]
+    registry.refresh()
+    mock_prometheus.custom_query.side_effect = Exception("Connection error")
+    
+    assert not registry.refresh()
+    assert registry.get_services() == ["auth-service"]
+    assert registry.status()["last_error"] == "Connection error"
+
+def test_registry_loop_skips_first_refresh_when_warmed(mock_prometheus):
+    import asyncio
+    from agent.service_registry import ServiceRegistry
+    registry = ServiceRegistry(interval_seconds=60)
+    mock_prometheus.custom_query.return_value = [
+        {"metric": {"service": "auth-service"}, "value": [1234567890, "1"]}
+    ]
+
+    async def scenario():
+        await asyncio.to_thread(registry.refresh)
+        registry.start()
+        await asyncio.sleep(0.05)
+        await registry.stop()
+
+    asyncio.run(scenario())
+    assert registry.get_services() == ["auth-service"]
+    assert mock_prometheus.custom_query.call_count == 1
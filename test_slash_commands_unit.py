@@ -8,6 +8,7 @@ Prueba:
 - Sistema de deduplicación
 """
 
+import asyncio
 import pytest
 from datetime import datetime, timedelta, timezone
 from agent.slash_commands import (
@@ -15,6 +16,8 @@ from agent.slash_commands import (
     can_execute_via_rest,
     build_query_agent_prompt,
     build_canonical_prompt,
+    build_direct_call,
+    extract_remaining_text,
     run_verification_workflow,
     check_dedupe,
     apply_dedupe_recommendation,
@@ -133,6 +136,42 @@ class TestRestExecution:
         assert can_execute_via_rest("help", {})
 
 
+class TestDirectExecution:
+    """Tests de la ejecución directa (sin QueryAgent)."""
+    
+    def test_direct_call_con_atajo(self):
+        """/novedades hoy se ejecuta directo con params tipados."""
+        canonical, params, args_text = parse_slash_command("/novedades hoy")
+        kwargs = build_direct_call(canonical, params, args_text)
+        assert kwargs == {"hours": 24, "analyze_with_ai": False}
+    
+    def test_direct_call_coerciona_tipos(self):
+        """Listas y booleanos se convierten al tipo de la función."""
+        canonical, params, args_text = parse_slash_command(
+            "/salud services=auth-service,payment-service include_metrics=false"
+        )
+        kwargs = build_direct_call(canonical, params, args_text)
+        assert kwargs["services"] == ["auth-service", "payment-service"]
+        assert kwargs["include_metrics"] is False
+    
+    def test_direct_call_fallback_con_texto_libre(self):
+        """Texto libre sin procesar requiere el QueryAgent."""
+        canonical, params, args_text = parse_slash_command("/novedades hoy del cluster de pagos")
+        assert extract_remaining_text(params, args_text) == "del cluster de pagos"
+        assert build_direct_call(canonical, params, args_text) is None
+    
+    def test_direct_call_fallback_con_ai_o_param_invalido(self):
+        """analyze_with_ai, params desconocidos o inválidos requieren el QueryAgent."""
+        for command in [
+            "/novedades hours=8 analyze_with_ai=true",
+            "/novedades hours=ocho",
+            "/salud cluster=prod",
+            "/deploy service=auth-service",
+        ]:
+            canonical, params, args_text = parse_slash_command(command)
+            assert build_direct_call(canonical, params, args_text) is None, command
+
+
 class TestPromptBuilding:
     """Tests de construcción de prompts."""
     
@@ -189,7 +228,7 @@ class TestDedupe:
         from agent.slash_commands import _dedupe_cache
         _dedupe_cache.clear()
         
-        is_dup, cached = check_dedupe("health", {}, "Reporte de salud OK")
+        is_dup, cached = asyncio.run(check_dedupe("health", {}, "Reporte de salud OK"))
         assert not is_dup
         assert cached is None
     
@@ -199,11 +238,11 @@ class TestDedupe:
         _dedupe_cache.clear()
         
         # Primera ejecución
-        is_dup1, _ = check_dedupe("health", {}, "Reporte de salud OK")
+        is_dup1, _ = asyncio.run(check_dedupe("health", {}, "Reporte de salud OK"))
         assert not is_dup1
         
         # Segunda ejecución (inmediata)
-        is_dup2, cached2 = check_dedupe("health", {}, "Reporte de salud OK")
+        is_dup2, cached2 = asyncio.run(check_dedupe("health", {}, "Reporte de salud OK"))
         assert is_dup2
         assert cached2 is not None
     
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+from tools import tempo_tool
+
+
+@pytest.fixture
+def mock_client():
+    with patch("tools.tempo_tool.shared_client") as mock_session:
+        yield mock_session
+
+
+def _response(payload):
+    resp = MagicMock()
+    resp.json.return_value = payload
+    return resp
+
+
+def test_get_traces_fetches_each_id_once(mock_client):
+    mock_client.get.side_effect = lambda url, params, timeout: _response({"url": url})
+    
+    result = tempo_tool.get_traces(["abc", "def", "abc"], timeout=3)
+    
+    assert set(result["traces"]) == {"abc", "def"}
+    assert result["errors"] == {}
+    assert mock_client.get.call_count == 2
+    for call in mock_client.get.call_args_list:
+        assert call.kwargs["timeout"] == 3
+
+def test_get_traces_isolates_failures(mock_client):
+    def fake_get(url, params, timeout):
+        if url.endswith("/bad"):
+            raise TimeoutError("read timed out")
+        return _response({"batches": []})
+    mock_client.get.side_effect = fake_get
+    
+    result = tempo_tool.get_traces(["ok", "bad"])
+    
+    assert result["traces"] == {"ok": {"batches": []}}
+    assert "read timed out" in result["errors"]["bad"]
+
+def test_get_traces_bounds_total_time(mock_client):
+    def fake_get(url, params, timeout):
+        if url.endswith("/slow"):
+            time.sleep(1)
+        return _response({"batches": []})
+    mock_client.get.side_effect = fake_get
+
+    started = time.monotonic()
+    result = tempo_tool.get_traces(["ok", "slow"], timeout=5, total_timeout=0.2)
+
+    assert time.monotonic() - started < 0.8
+    assert result["traces"] == {"ok": {"batches": []}}
+    assert "timeout" in result["errors"]["slow"]
+
+def test_get_traces_empty(mock_client):
+    assert tempo_tool.get_traces([]) == {"traces": {}, "errors": {}}
+    mock_client.get.assert_not_called()
@@ -0,0 +1,98 @@
+from tools import trace_analysis
+
+
+def _span(span_id, parent, name, start_ms, end_ms, error=False, statement=None):
+    span = {
+        "traceId": "t1",
+        "spanId": span_id,
+        "name": name,
+        "startTimeUnixNano": str(int(start_ms * 1e6)),
+        "endTimeUnixNano": str(int(end_ms * 1e6)),
+        "status": {"code": "STATUS_CODE_ERROR", "message": "boom"} if error else {},
+        "attributes": [],
+    }
+    if parent:
+        span["parentSpanId"] = parent
+    if statement:
+        span["attributes"].append({"key": "db.statement", "value": {"stringValue": statement}})
+    return span
+
+
+def _trace(service_spans):
+    return {
+        "batches": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": svc}}]},
+                "scopeSpans": [{"spans": spans}],
+            }
+            for svc, spans in service_spans.items()
+        ]
+    }
+
+
+def test_summary_critical_path_and_self_time():
+    trace = _trace({
+        "api-gateway": [_span("a", None, "GET /login", 0, 100)],
+        "auth-service": [
+            _span("b", "a", "authenticate", 10, 40),
+            _span("c", "a", "load_profile", 30, 90, error=True),
+        ],
+    })
+    
+    summary = trace_analysis.summarize_trace(trace)
+    
+    assert summary["trace_id"] == "t1"
+    assert summary["span_count"] == 3
+    assert summary["duration_ms"] == 100
+    assert summary["root"] == "api-gateway:GET /login"
+    assert [s["operation"] for s in summary["critical_path"]] == ["GET /login", "load_profile"]
+    # Hijos cubren 10-90 → self-time del root = 20ms
+    root_self = next(e for e in summary["self_time_top"] if e["operation"] == "GET /login")
+    assert root_self["self_ms"] == 20
+    assert summary["error_count"] == 1
+    assert summary["errors"][0]["operation"] == "load_profile"
+
+
+def test_detects_n_plus_one():
+    children = [
+        _span(f"q{i}", "root", "SELECT", i * 2, i * 2 + 1, statement="SELECT * FROM users WHERE id=?")
+        for i in range(8)
+    ]
+    trace = _trace({"user-service": [_span("root", None, "GET /users", 0, 20)] + children})
+    
+    summary = trace_analysis.summarize_trace(trace)
+    
+    assert len(summary["n_plus_one"]) == 1
+    pattern = summary["n_plus_one"][0]
+    assert pattern["count"] == 8
+    assert pattern["child"] == "user-service:SELECT"
+
+
+def test_orphan_spans_become_roots():
+    trace = _trace({"svc": [_span("x", "missing-parent", "op", 0, 5)]})
+    summary = trace_analysis.summarize_trace(trace, trace_id="given")
+    assert summary["trace_id"] == "given"
+    assert summary["root"] == "svc:op"
+
+
+def test_self_parented_span_is_a_root():
+    trace = _trace({"api": [_span("a", "a", "loop", 0, 50), _span("b", "a", "child", 5, 40)]})
+
+    summary = trace_analysis.summarize_trace(trace)
+
+    assert summary["root"] == "api:loop"
+    assert [s["operation"] for s in summary["critical_path"]] == ["loop", "child"]
+
+
+def test_parent_cycle_without_roots_falls_back_to_earliest_span():
+    trace = _trace({"api": [_span("a", "b", "first", 0, 50), _span("b", "a", "second", 10, 60)]})
+
+    summary = trace_analysis.summarize_trace(trace)
+
+    assert summary["root"] == "api:first"
+    assert [s["operation"] for s in summary["critical_path"]] == ["first", "second"]
+
+
+def test_empty_trace():
+    summary = trace_analysis.summarize_trace({}, trace_id="t")
+    assert summary["span_count"] == 0
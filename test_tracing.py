@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from agent import tracing
+from agent.agents import observability_team
+from agent.utils.http_client import get_shared_session
+from test_pipeline_metrics import _ALERT, _fake_pipeline
+
+_exporter = InMemorySpanExporter()
+
+
+@pytest.fixture
+def spans():
+    provider = tracing.setup_tracing(exporter=_exporter)
+    _exporter.clear()
+
+    def finished():
+        provider.force_flush()
+        return {span.name: span for span in _exporter.get_finished_spans()}
+
+    return finished
+
+
+def test_pipeline_spans_nest_under_payload(monkeypatch, spans):
+    _fake_pipeline(monkeypatch, duplicate=False)
+
+    asyncio.run(observability_team.analyze_payload({"alerts": [_ALERT], "groupKey": "g1"}))
+
+    by_name = spans()
+    payload, alert = by_name["alert.analyze_payload"], by_name["alert.analyze"]
+    assert payload.attributes["alert.count"] == 1
+    assert alert.parent.span_id == payload.context.span_id
+    assert alert.attributes["alert.severity"] == "critical"
+    assert alert.attributes["alert.duplicate"] is False
+    assert alert.attributes["cache.report"] == "miss"
+    for stage in ["classify", "dedup", "enrich", "triage", "report_cache", "report", "persist"]:
+        assert by_name[f"pipeline.{stage}"].parent.span_id == alert.context.span_id
+
+
+def test_async_tool_call_runs_inside_its_span(spans):
+    async def upstream(service):
+        with tracing.span("upstream"):
+            return {"data": service, "compaction": {"original_tokens": 900, "tokens": 200}}
+
+    result = asyncio.run(tracing.tool_span_hook("query_loki_logs", upstream, {"service": "auth"}))
+
+    by_name = spans()
+    tool = by_name["tool query_loki_logs"]
+    assert result["data"] == "auth"
+    assert by_name["upstream"].parent.span_id == tool.context.span_id
+    assert tool.attributes["tool.compacted"] is True and tool.attributes["tool.tokens"] == 200
+
+
+def test_http_client_span_counts_retries_and_propagates_context(spans):
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            received.append(self.headers.get("traceparent"))
+            self.send_response(503 if len(received) == 1 else 200)
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        response = get_shared_session(backoff_factor=0).get(f"http://127.0.0.1:{server.server_port}/api/v1/query")
+    finally:
+        server.shutdown()
+
+    span = spans()["GET 127.0.0.1"]
+    assert response.status_code == 200
+    assert span.attributes["http.response.status_code"] == 200
+    assert span.attributes["retry.count"] == 1
+    assert received[-1].split("-")[1] == format(span.context.trace_id, "032x")
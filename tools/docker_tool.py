@@ -6,12 +6,15 @@ from typing import Any, Dict, List, Optional
 import docker
 from docker.models.containers import Container
 
+from agent import tracing
 from agent.config import AdminAgentConfig
 
 _config = AdminAgentConfig()
 _client = docker.DockerClient(base_url=f"unix://{_config.docker_socket}")
+_SPAN_ATTRIBUTES = {"peer.service": "docker"}
 
 
+@tracing.traced("docker list_containers", _SPAN_ATTRIBUTES, client=True)
 def list_containers() -> List[Dict[str, Any]]:
     """Lista contenedores con estado básico."""
     containers = _client.containers.list(all=True)
@@ -33,6 +36,7 @@ def _get_container(name: str) -> Optional[Container]:
         return None
 
 
+@tracing.traced("docker get_container_stats", _SPAN_ATTRIBUTES, client=True)
 def get_container_stats(service: str) -> Dict[str, Any]:
     """Devuelve stats en vivo de un contenedor."""
     cont = _get_container(service)
@@ -42,6 +46,7 @@ def get_container_stats(service: str) -> Dict[str, Any]:
     return stats
 
 
+@tracing.traced("docker get_container_logs", _SPAN_ATTRIBUTES, client=True)
 def get_container_logs(service: str, tail: int = 100) -> Dict[str, Any]:
     """Obtiene logs recientes del contenedor."""
     cont = _get_container(service)
@@ -51,6 +56,7 @@ def get_container_logs(service: str, tail: int = 100) -> Dict[str, Any]:
     return {"logs": logs}
 
 
+@tracing.traced("docker check_container_health", _SPAN_ATTRIBUTES, client=True)
 def check_container_health(service: str) -> Dict[str, Any]:
     """Devuelve health status si existe."""
     cont = _get_container(service)
@@ -2,9 +2,12 @@
 Funciones para consultar Loki vía API HTTP.
 """
 import datetime
-from typing import Any, Dict, List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlencode
 
 import requests
+import websockets
 
 from agent.config import AdminAgentConfig
 from agent.utils.http_client import shared_client
@@ -58,6 +61,45 @@ def get_trace_logs(trace_id: str) -> Dict[str, Any]:
     return query_logs(query, limit=300)
 
 
+# Filtros de nivel soportados por el tail en vivo
+TAIL_LEVEL_FILTERS = {
+    "error": "error|ERROR|critical|CRITICAL",
+    "warn": "warn|WARN|warning|WARNING|error|ERROR|critical|CRITICAL",
+    "all": None,
+}
+
+
+def build_tail_query(service: str, level: str = "error") -> str:
+    """Construye el LogQL para tail de un servicio con filtro de nivel."""
+    level_regex = TAIL_LEVEL_FILTERS.get(level)
+    if level_regex:
+        return f'{{service="{service}", level=~"{level_regex}"}}'
+    return f'{{service="{service}"}}'
+
+
+async def tail_logs(query: str, delay_for: int = 0, limit: int = 100) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Suscribe al endpoint websocket /loki/api/v1/tail y produce entradas en vivo.
+
+    Yields:
+        {"timestamp": ns (str), "labels": {...}, "line": str} por cada línea recibida,
+        o {"dropped": n} si Loki informa entradas descartadas.
+    """
+    ws_base = _config.loki_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+    params = {"query": query, "delay_for": delay_for, "limit": limit, "start": _since_to_ns("1s")}
+    url = f"{ws_base}/loki/api/v1/tail?{urlencode(params)}"
+    async with websockets.connect(url, open_timeout=10) as ws:
+        async for message in ws:
+            payload = json.loads(message)
+            for stream in payload.get("streams") or []:
+                labels = stream.get("stream") or {}
+                for ts, line in stream.get("values") or []:
+                    yield {"timestamp": ts, "labels": labels, "line": line}
+            dropped = payload.get("dropped_entries") or []
+            if dropped:
+                yield {"dropped": len(dropped)}
+
+
 def _since_to_ns(since: str) -> int:
     """Convierte una ventana relativa (e.g., '5m', '1h') a nanosegundos timestamp."""
     now = datetime.datetime.utcnow()
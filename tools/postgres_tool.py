@@ -7,6 +7,7 @@ from typing import Any, Dict, List
 import psycopg2
 import psycopg2.extras
 
+from agent import tracing
 from agent.config import AdminAgentConfig
 
 _config = AdminAgentConfig()
@@ -32,10 +33,12 @@ def execute_safe_query(query: str) -> List[Dict[str, Any]]:
     normalized = query.strip().lower()
     if not normalized.startswith("select"):
         raise ValueError("Solo se permiten consultas SELECT de lectura")
-    with _get_conn() as conn:
+    attributes = {"db.system.name": "postgresql", "db.namespace": _config.postgres_db, "db.query.text": query.strip()}
+    with tracing.span("postgres query", attributes, client=True) as current, _get_conn() as conn:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             cur.execute(query)
             rows = cur.fetchall()
+            current.set_attribute("db.response.returned_rows", len(rows))
             return [dict(row) for row in rows]
 
 
@@ -31,19 +31,24 @@ def query_range(query: str, start: datetime, end: datetime, step: str) -> Any:
 
 
 
+def _discover_services_raw() -> List[str]:
+    """Helper interno: descubre servicios vía 'count(up) by (service)'; propaga errores."""
+    # Buscamos métricas 'up' que tengan etiqueta 'service' 
+    # (asumiendo convención de etiquetado estándar)
+    res = query_instant('count(up) by (service)')
+    services = []
+    if res and isinstance(res, list):
+        for serie in res:
+            svc = serie.get("metric", {}).get("service")
+            if svc:
+                services.append(svc)
+    return services
+
+
 def get_monitored_services() -> List[str]:
     """Dinámicamente descubre servicios monitoreados usando query 'up'."""
     try:
-        # Buscamos métricas 'up' que tengan etiqueta 'service' 
-        # (asumiendo convención de etiquetado estándar)
-        res = query_instant('count(up) by (service)')
-        services = []
-        if res and isinstance(res, list):
-            for serie in res:
-                svc = serie.get("metric", {}).get("service")
-                if svc:
-                    services.append(svc)
-        return services
+        return _discover_services_raw()
     except Exception as e:
         print(f"Error discovering services: {e}")
         return []
@@ -1,20 +1,25 @@
 """
 Funciones para consultar Tempo vía API HTTP.
 """
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Any, Dict, List
 
-import requests
-
 from agent.config import AdminAgentConfig
+from agent.utils.http_client import shared_client
 
 _config = AdminAgentConfig()
-_session = requests.Session()
-_session.headers.update({"Content-Type": "application/json"})
+
+# Máximo de traces consultados en paralelo (no superar pool_maxsize del shared_client)
+_MAX_PARALLEL_TRACES = 8
 
 
-def _tempo_get(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+def _tempo_get(path: str, params: Dict[str, Any], timeout: float | None = None) -> Dict[str, Any]:
     url = f"{_config.tempo_url}{path}"
-    resp = _session.get(url, params=params, timeout=10)
+    if timeout is not None:
+        resp = shared_client.get(url, params=params, timeout=timeout)
+    else:
+        resp = shared_client.get(url, params=params)
     resp.raise_for_status()
     return resp.json()
 
@@ -29,14 +34,64 @@ def search_traces(service: str, tags: Dict[str, str] | None = None, limit: int =
         "limit": limit,
     }
     url = f"{_config.tempo_url}/api/search"
-    resp = _session.post(url, json=search, timeout=10)
+    resp = shared_client.post(url, json=search)
     resp.raise_for_status()
     return resp.json()
 
 
-def get_trace(trace_id: str) -> Dict[str, Any]:
+def get_trace(trace_id: str, timeout: float | None = None) -> Dict[str, Any]:
     """Obtiene un trace completo por ID."""
-    return _tempo_get(f"/api/traces/{trace_id}", params={})
+    return _tempo_get(f"/api/traces/{trace_id}", params={}, timeout=timeout)
+
+
+def get_traces(
+    trace_ids: List[str],
+    max_parallel: int = _MAX_PARALLEL_TRACES,
+    timeout: float = 10,
+    total_timeout: float | None = None,
+) -> Dict[str, Any]:
+    """
+    Obtiene varios traces en paralelo con fan-out acotado.
+
+    `timeout` aplica a cada intento HTTP; los reintentos del shared_client
+    pueden estirar un trace a varias veces ese valor, así que el fan-out
+    completo se corta en `total_timeout` (default: 2 × timeout). Los traces
+    que no llegaron a tiempo, igual que los fallos individuales, van a
+    `errors` sin invalidar el resto.
+
+    Returns:
+        {"traces": {trace_id: trace}, "errors": {trace_id: mensaje}}
+    """
+    # Deduplicar preservando orden
+    unique_ids = list(dict.fromkeys(tid for tid in trace_ids if tid))
+    traces: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    if not unique_ids:
+        return {"traces": traces, "errors": errors}
+
+    if total_timeout is None:
+        total_timeout = 2 * timeout
+    workers = max(1, min(max_parallel, len(unique_ids)))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tempo")
+    try:
+        # Cada worker corre en una copia del contexto (los spans HTTP cuelgan del tool call)
+        futures = {
+            tid: pool.submit(contextvars.copy_context().run, get_trace, tid, timeout) for tid in unique_ids
+        }
+        wait(futures.values(), timeout=total_timeout)
+        for tid, future in futures.items():
+            if not future.done():
+                errors[tid] = f"timeout: el fan-out superó {total_timeout}s"
+                continue
+            try:
+                traces[tid] = future.result()
+            except Exception as exc:
+                errors[tid] = str(exc)
+    finally:
+        # Sin esperar a los requests colgados: terminan solos con su propio timeout
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return {"traces": traces, "errors": errors}
 
 
 def get_slow_traces(service: str, min_duration_ms: int = 1000, limit: int = 10) -> Dict[str, Any]:
@@ -49,5 +104,3 @@ def get_error_traces(service: str, limit: int = 10) -> Dict[str, Any]:
     """Traces con errores."""
     tags = {"status_code": "ERROR"}
     return search_traces(service=service, tags=tags, limit=limit)
-
-
@@ -0,0 +1,218 @@
+"""
+Análisis de traces de Tempo (formato OTLP JSON).
+
+Construye el árbol de spans en tiempo lineal y genera un resumen compacto:
+critical path, self-time por servicio/operación, spans con error y
+patrones N+1 (spans hijos idénticos repetidos bajo el mismo padre).
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Umbral de spans hijos idénticos para considerar un patrón N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+# Límites del resumen para no inflar el contexto del LLM
+_MAX_CRITICAL_PATH = 15
+_MAX_SELF_TIME_ENTRIES = 10
+_MAX_ERROR_SPANS = 10
+_MAX_N_PLUS_ONE = 5
+
+_ERROR_STATUS_CODES = {2, "2", "STATUS_CODE_ERROR", "ERROR"}
+
+
+def _attr_value(value: Dict[str, Any]) -> Any:
+    """Extrae el valor de un AnyValue OTLP ({"stringValue": "x"}, {"intValue": "1"}, ...)."""
+    for key in ("stringValue", "intValue", "doubleValue", "boolValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+def _attrs_to_dict(attributes: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    return {a.get("key"): _attr_value(a.get("value") or {}) for a in attributes or []}
+
+
+def _iter_raw_spans(trace: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Itera (service, span) soportando 'batches' (Tempo) y 'resourceSpans' (OTLP)."""
+    resources = trace.get("batches") or trace.get("resourceSpans") or []
+    for resource in resources:
+        resource_attrs = _attrs_to_dict((resource.get("resource") or {}).get("attributes"))
+        service = resource_attrs.get("service.name") or "unknown"
+        scopes = resource.get("scopeSpans") or resource.get("instrumentationLibrarySpans") or []
+        for scope in scopes:
+            for span in scope.get("spans") or []:
+                yield service, span
+
+
+def _parse_spans(trace: Dict[str, Any]) -> List[Dict[str, Any]]:
+    spans = []
+    for service, raw in _iter_raw_spans(trace):
+        start = int(raw.get("startTimeUnixNano") or 0)
+        end = int(raw.get("endTimeUnixNano") or start)
+        status = raw.get("status") or {}
+        attrs = _attrs_to_dict(raw.get("attributes"))
+        spans.append({
+            "span_id": raw.get("spanId"),
+            "parent_id": raw.get("parentSpanId") or None,
+            "trace_id": raw.get("traceId"),
+            "service": service,
+            "operation": raw.get("name") or "unknown",
+            "start": start,
+            "end": max(end, start),
+            "error": status.get("code") in _ERROR_STATUS_CODES,
+            "status_message": status.get("message"),
+            "db_statement": attrs.get("db.statement"),
+        })
+    return spans
+
+
+def build_span_tree(spans: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Indexa spans por padre en una sola pasada.
+
+    Returns:
+        Tupla (roots, children_by_parent_id). Spans cuyo padre no está en el
+        trace (traces truncados) o que son su propio padre (datos corruptos)
+        se consideran raíces.
+    """
+    by_id = {s["span_id"]: s for s in spans if s["span_id"]}
+    children: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    roots = []
+    for span in spans:
+        parent_id = span["parent_id"]
+        if parent_id and parent_id in by_id and parent_id != span["span_id"]:
+            children[parent_id].append(span)
+        else:
+            roots.append(span)
+    return roots, children
+
+
+def _self_time_ns(span: Dict[str, Any], children: List[Dict[str, Any]]) -> int:
+    """Duración del span menos la unión de intervalos de sus hijos (recortados al padre)."""
+    duration = span["end"] - span["start"]
+    if not children:
+        return duration
+    intervals = sorted(
+        (max(c["start"], span["start"]), min(c["end"], span["end"])) for c in children
+    )
+    covered = 0
+    cur_start, cur_end = None, None
+    for start, end in intervals:
+        if end <= start:
+            continue
+        if cur_end is None or start > cur_end:
+            if cur_end is not None:
+                covered += cur_end - cur_start
+            cur_start, cur_end = start, end
+        else:
+            cur_end = max(cur_end, end)
+    if cur_end is not None:
+        covered += cur_end - cur_start
+    return max(duration - covered, 0)
+
+
+def _critical_path(root: Dict[str, Any], children: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Sigue iterativamente el hijo que termina último (el que bloquea al padre).
+
+    Los spans ya visitados se saltean: un ciclo de padres (trace corrupto) corta el camino.
+    """
+    path = [root]
+    visited = {root["span_id"]}
+    current = root
+    while True:
+        pending = [c for c in children.get(current["span_id"], []) if c["span_id"] not in visited]
+        if not pending:
+            return path
+        current = max(pending, key=lambda c: c["end"])
+        visited.add(current["span_id"])
+        path.append(current)
+
+
+def _find_n_plus_one(spans: List[Dict[str, Any]], children: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    by_id = {s["span_id"]: s for s in spans if s["span_id"]}
+    patterns = []
+    for parent_id, kids in children.items():
+        if len(kids) < N_PLUS_ONE_THRESHOLD:
+            continue
+        groups: Dict[Tuple[str, str, Optional[str]], List[Dict[str, Any]]] = defaultdict(list)
+        for kid in kids:
+            groups[(kid["service"], kid["operation"], kid["db_statement"])].append(kid)
+        parent = by_id[parent_id]
+        for (service, operation, statement), group in groups.items():
+            if len(group) < N_PLUS_ONE_THRESHOLD:
+                continue
+            patterns.append({
+                "parent": f"{parent['service']}:{parent['operation']}",
+                "child": f"{service}:{operation}",
+                "db_statement": statement,
+                "count": len(group),
+                "total_ms": round(sum(k["end"] - k["start"] for k in group) / 1e6, 2),
+            })
+    patterns.sort(key=lambda p: p["total_ms"], reverse=True)
+    return patterns[:_MAX_N_PLUS_ONE]
+
+
+def summarize_trace(trace: Dict[str, Any], trace_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Genera un resumen compacto de un trace OTLP.
+
+    Args:
+        trace: JSON devuelto por Tempo en /api/traces/{id}
+        trace_id: ID del trace (si no se informa se toma de los spans)
+
+    Returns:
+        Dict con duración total, servicios, critical path, self-time agregado,
+        spans con error y patrones N+1 detectados.
+    """
+    spans = _parse_spans(trace)
+    if not spans:
+        return {"trace_id": trace_id, "span_count": 0, "error": "trace vacío o formato no reconocido"}
+
+    roots, children = build_span_tree(spans)
+    trace_start = min(s["start"] for s in spans)
+    trace_end = max(s["end"] for s in spans)
+
+    self_time: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(lambda: {"self_ms": 0.0, "count": 0})
+    span_self_ms: Dict[str, float] = {}
+    for span in spans:
+        ms = _self_time_ns(span, children.get(span["span_id"], [])) / 1e6
+        span_self_ms[span["span_id"]] = ms
+        entry = self_time[(span["service"], span["operation"])]
+        entry["self_ms"] += ms
+        entry["count"] += 1
+
+    # Sin raíces solo si todos los spans están en ciclos de padres: se parte del más temprano
+    main_root = max(roots, key=lambda r: r["end"] - r["start"]) if roots else min(spans, key=lambda s: s["start"])
+    critical = _critical_path(main_root, children)
+
+    error_spans = [s for s in spans if s["error"]]
+
+    return {
+        "trace_id": trace_id or main_root["trace_id"],
+        "span_count": len(spans),
+        "duration_ms": round((trace_end - trace_start) / 1e6, 2),
+        "root": f"{main_root['service']}:{main_root['operation']}",
+        "services": sorted({s["service"] for s in spans}),
+        "critical_path": [
+            {
+                "service": s["service"],
+                "operation": s["operation"],
+                "duration_ms": round((s["end"] - s["start"]) / 1e6, 2),
+                "self_ms": round(span_self_ms.get(s["span_id"], 0.0), 2),
+                "error": s["error"],
+            }
+            for s in critical[:_MAX_CRITICAL_PATH]
+        ],
+        "critical_path_truncated": len(critical) > _MAX_CRITICAL_PATH,
+        "self_time_top": [
+            {"service": svc, "operation": op, "self_ms": round(v["self_ms"], 2), "count": v["count"]}
+            for (svc, op), v in sorted(self_time.items(), key=lambda kv: kv[1]["self_ms"], reverse=True)[:_MAX_SELF_TIME_ENTRIES]
+        ],
+        "error_count": len(error_spans),
+        "errors": [
+            {"service": s["service"], "operation": s["operation"], "message": s["status_message"]}
+            for s in error_spans[:_MAX_ERROR_SPANS]
+        ],
+        "n_plus_one": _find_n_plus_one(spans, children),
+    }